@@ -1,11 +1,20 @@
 import logging
-from components.crawler.types.crawler_types import FetchResponse
+import uuid
+
 from components.crawler.monitoring.metrics import PUBLISHED_MESSAGES_TOTAL
-from shared.rabbitmq.enums.queue_names import CrawlerQueueChannels
+from components.crawler.types.crawler_types import FetchResponse
 from shared.rabbitmq.enums.crawl_status import CrawlStatus
-from shared.rabbitmq.schemas.save_to_db import SavePageMetadataTask
-from shared.rabbitmq.schemas.parsing import ParsingTask
+from shared.rabbitmq.enums.queue_names import CrawlerQueueChannels
 from shared.rabbitmq.queue_service import QueueService
+from shared.rabbitmq.schemas.parsing import ParsingTask
+from shared.rabbitmq.schemas.save_to_db import SavePageMetadataTask
+
+
+def new_crawl_attempt_id() -> str:
+    """
+    Returns a unique id for one crawl attempt, used as its metadata message's idempotency key
+    """
+    return uuid.uuid4().hex
 
 
 class PublishingService:
@@ -88,6 +97,7 @@ class PublishingService:
             url_hash=url_hash,
             html_content_hash=html_content_hash,
             compressed_filepath=compressed_filepath,
+            idempotency_key=new_crawl_attempt_id(),
         )
         self._publish_page_metadata(page_metadata)
 
@@ -114,7 +124,8 @@ class PublishingService:
             status=status,
             fetched_at=fetched_at,
             error_type=error_type,
-            error_message=error_message
+            error_message=error_message,
+            idempotency_key=new_crawl_attempt_id(),
         )
         self._publish_page_metadata(page_metadata)
 
@@ -1,63 +1,235 @@
-from fastapi import APIRouter
-from fastapi.responses import JSONResponse
-from fastapi.encoders import jsonable_encoder
+from typing import Literal
+
+import orjson
+from fastapi import APIRouter, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.exc import SQLAlchemyError
-from components.db_reader.monitoring.metrics import DB_READER_REQUESTS_FAILURES_TOTAL, DB_READER_REQUESTS_RECEIVED_TOTAL
-from shared.logging_utils import get_logger
-from components.db_reader.core.db_reader import get_due_pages, pop_links_from_schedule, are_tables_empty
 
+from components.db_reader.core.db_reader import (
+    are_tables_empty,
+    get_due_pages,
+    get_url_id,
+    get_urls_by_id,
+    iter_due_pages,
+    pop_links_from_schedule,
+    search_pages,
+)
+from components.db_reader.core.link_graph import LinkGraphUnavailable
+from components.db_reader.monitoring.metrics import (
+    DB_READER_REQUESTS_FAILURES_TOTAL,
+    DB_READER_REQUESTS_RECEIVED_TOTAL,
+)
+from shared.logging_utils import get_logger
 
 database_router = APIRouter()
 logger = get_logger("db_reader")
 
 
 @database_router.get("/get_scheduled_links", response_model=list[dict], status_code=200)
-def pop_links(count: int):
+async def pop_links(count: int):
     try:
-        links = pop_links_from_schedule(count=count, logger=logger)
+        links = await pop_links_from_schedule(count=count, logger=logger)
         DB_READER_REQUESTS_RECEIVED_TOTAL.labels(status="valid", operation="pop_links_from_schedule").inc()
-        return JSONResponse(content=jsonable_encoder(links))
+        return ORJSONResponse(content=links)
     except Exception as e:
         logger.error("Exception in pop_links_from_schedule: %s", e, exc_info=True)
         DB_READER_REQUESTS_FAILURES_TOTAL.labels(error_type="UnexpectedError").inc()
         DB_READER_REQUESTS_RECEIVED_TOTAL.labels(status="error", operation="pop_links_from_schedule").inc()
-        return JSONResponse(content=[], status_code=500)
+        return ORJSONResponse(content=[], status_code=500)
 
 
 
 @database_router.get("/get_need_rescheduling", response_model=list[str], status_code=200)
-def get_pages_need_recrawling():
+async def get_pages_need_recrawling(limit: int | None = Query(default=None, ge=1)):
     """
     Get a list of URLs that are due for recrawling (rescheduling)
+
+    Builds the whole response in memory, prefer `/due_pages` for large backlogs
     """
     try:
-        pages = get_due_pages(logger=logger)
+        pages = await get_due_pages(logger=logger, limit=limit)
         DB_READER_REQUESTS_RECEIVED_TOTAL.labels(status="valid", operation="get_due_pages").inc()
-        return JSONResponse(content=jsonable_encoder(pages))
+        return ORJSONResponse(content=pages)
     except Exception as e:
         logger.error("Exception in get_due_pages: %s", e, exc_info=True)
         DB_READER_REQUESTS_FAILURES_TOTAL.labels(error_type="UnexpectedError").inc()
         DB_READER_REQUESTS_RECEIVED_TOTAL.labels(status="error", operation="get_due_pages").inc()
-        return JSONResponse(content={"error": "Internal Server Error"}, status_code=500)
+        return ORJSONResponse(content={"error": "Internal Server Error"}, status_code=500)
+
+
+
+@database_router.get("/due_pages", status_code=200)
+async def stream_due_pages(limit: int | None = Query(default=None, ge=1)):
+    """
+    Stream the pages due for recrawling as NDJSON, one `{"url", "depth"}` object per line
+
+    Pages are read from the database in keyset-paginated batches as the client consumes
+    the stream, so neither side holds the whole backlog in memory
+    """
+    async def lines():
+        try:
+            async for page in iter_due_pages(logger=logger, limit=limit):
+                yield orjson.dumps(page) + b"\n"
+            DB_READER_REQUESTS_RECEIVED_TOTAL.labels(status="valid", operation="stream_due_pages").inc()
+        except Exception:
+            # Headers are already sent, so the error can only end the stream early
+            logger.exception("Exception in stream_due_pages")
+            DB_READER_REQUESTS_FAILURES_TOTAL.labels(error_type="UnexpectedError").inc()
+            DB_READER_REQUESTS_RECEIVED_TOTAL.labels(status="error", operation="stream_due_pages").inc()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 
 
 @database_router.get("/tables/empty", status_code=200)
-def verify_empty_tables():
+async def verify_empty_tables():
     """
     Check if the Pages and Links tables are empty (used for seeding logic).
     """
     try:
-        is_empty = are_tables_empty(logger=logger)
+        is_empty = await are_tables_empty(logger=logger)
         DB_READER_REQUESTS_RECEIVED_TOTAL.labels(status="valid", operation="are_tables_empty").inc()
         return {"are_tables_empty": is_empty}
     except SQLAlchemyError as e:
         logger.error("Database error in verify_empty_tables: %s", e, exc_info=True)
         DB_READER_REQUESTS_FAILURES_TOTAL.labels(error_type="SQLAlchemyError").inc()
         DB_READER_REQUESTS_RECEIVED_TOTAL.labels(status="error", operation="are_tables_empty").inc()
-        return JSONResponse(content={"detail": "Database error occurred"}, status_code=500)
+        return ORJSONResponse(content={"detail": "Database error occurred"}, status_code=500)
     except Exception as e:
         logger.error("Unexpected error in verify_empty_tables: %s", e, exc_info=True)
         DB_READER_REQUESTS_FAILURES_TOTAL.labels(error_type="UnexpectedError").inc()
         DB_READER_REQUESTS_RECEIVED_TOTAL.labels(status="error", operation="are_tables_empty").inc()
-        return JSONResponse(content={"detail": "Unexpected error occurred"}, status_code=500)
+        return ORJSONResponse(content={"detail": "Unexpected error occurred"}, status_code=500)
+
+
+
+@database_router.get("/stats", status_code=200)
+async def get_stats(request: Request):
+    """
+    Approximate row counts, crawl status breakdown and frontier size, for dashboards
+
+    Served from a cache refreshed at most every `stats.cache_ttl_seconds`, so polling
+    this endpoint doesn't add queries on the large tables
+    """
+    try:
+        stats = await request.app.state.stats_cache.get()
+        DB_READER_REQUESTS_RECEIVED_TOTAL.labels(status="valid", operation="get_table_stats").inc()
+        return ORJSONResponse(content=stats)
+    except SQLAlchemyError:
+        logger.exception("Database error in get_stats")
+        DB_READER_REQUESTS_FAILURES_TOTAL.labels(error_type="SQLAlchemyError").inc()
+        DB_READER_REQUESTS_RECEIVED_TOTAL.labels(status="error", operation="get_table_stats").inc()
+        return ORJSONResponse(content={"detail": "Database error occurred"}, status_code=500)
+    except Exception:
+        logger.exception("Unexpected error in get_stats")
+        DB_READER_REQUESTS_FAILURES_TOTAL.labels(error_type="UnexpectedError").inc()
+        DB_READER_REQUESTS_RECEIVED_TOTAL.labels(status="error", operation="get_table_stats").inc()
+        return ORJSONResponse(content={"detail": "Unexpected error occurred"}, status_code=500)
+
+
+
+@database_router.get("/search", status_code=200)
+async def search(
+    q: str = Query(min_length=1, max_length=512),
+    limit: int = Query(default=10, ge=1, le=100),
+    offset: int = Query(default=0, ge=0, le=1000),
+):
+    """
+    Full-text search over parsed pages, with ranked results and a text snippet per result
+
+    `q` uses web search syntax: quoted phrases, `or`, and `-word` to exclude a word.
+    `truncated` is true when the query matched too many pages for all of them to be
+    ranked, in which case only the most recently parsed matches were
+    """
+    try:
+        found = await search_pages(q, logger=logger, limit=limit, offset=offset)
+        DB_READER_REQUESTS_RECEIVED_TOTAL.labels(status="valid", operation="search_pages").inc()
+        return ORJSONResponse(content={"query": q, "limit": limit, "offset": offset, **found})
+    except SQLAlchemyError:
+        logger.exception("Database error in search")
+        DB_READER_REQUESTS_FAILURES_TOTAL.labels(error_type="SQLAlchemyError").inc()
+        DB_READER_REQUESTS_RECEIVED_TOTAL.labels(status="error", operation="search_pages").inc()
+        return ORJSONResponse(content={"detail": "Database error occurred"}, status_code=500)
+    except Exception:
+        logger.exception("Unexpected error in search")
+        DB_READER_REQUESTS_FAILURES_TOTAL.labels(error_type="UnexpectedError").inc()
+        DB_READER_REQUESTS_RECEIVED_TOTAL.labels(status="error", operation="search_pages").inc()
+        return ORJSONResponse(content={"detail": "Unexpected error occurred"}, status_code=500)
+
+
+
+@database_router.get("/graph/out_links", status_code=200)
+async def get_out_links(request: Request, url: str, limit: int = Query(default=100, ge=1, le=10_000)):
+    """
+    URLs the page links to, from the link graph snapshot
+    """
+    return await _graph_query(
+        request, url, "graph_out_links",
+        lambda graph, node: {neighbour: 1 for neighbour in graph.out_links(node, limit)}
+    )
+
+
+@database_router.get("/graph/in_links", status_code=200)
+async def get_in_links(request: Request, url: str, limit: int = Query(default=100, ge=1, le=10_000)):
+    """
+    URLs of the pages linking to the page, from the link graph snapshot
+    """
+    return await _graph_query(
+        request, url, "graph_in_links",
+        lambda graph, node: {neighbour: 1 for neighbour in graph.in_links(node, limit)}
+    )
+
+
+@database_router.get("/graph/neighbourhood", status_code=200)
+async def get_neighbourhood(
+    request: Request,
+    url: str,
+    hops: int = Query(default=2, ge=1, le=5),
+    direction: Literal["out", "in", "both"] = "out",
+    max_nodes: int = Query(default=1_000, ge=1, le=10_000),
+):
+    """
+    Pages within `hops` links of the page, with their distance, from the link graph snapshot
+    """
+    def neighbourhood(graph, node):
+        distances = graph.neighbourhood(node, hops, max_nodes, direction)
+        distances.pop(node)
+        return distances
+
+    return await _graph_query(request, url, "graph_neighbourhood", neighbourhood)
+
+
+async def _graph_query(request: Request, url: str, operation: str, query) -> ORJSONResponse:
+    """
+    Resolves `url` to its node, runs `query(graph, node)` -> {node: distance} off the
+    event loop and maps the nodes back to URLs
+    """
+    try:
+        node = await get_url_id(url)
+        if node is None:
+            DB_READER_REQUESTS_RECEIVED_TOTAL.labels(status="not_found", operation=operation).inc()
+            return ORJSONResponse(content={"detail": "Unknown URL"}, status_code=404)
+
+        distances = await run_in_threadpool(query, request.app.state.link_graph, node)
+        urls = await get_urls_by_id(list(distances))
+
+        DB_READER_REQUESTS_RECEIVED_TOTAL.labels(status="valid", operation=operation).inc()
+        return ORJSONResponse(content={
+            "url": url,
+            "links": [{"url": urls[n], "distance": d} for n, d in distances.items() if n in urls],
+        })
+    except LinkGraphUnavailable as e:
+        logger.warning("Link graph query before the first snapshot: %s", e)
+        DB_READER_REQUESTS_RECEIVED_TOTAL.labels(status="error", operation=operation).inc()
+        return ORJSONResponse(content={"detail": "Link graph not built yet"}, status_code=503)
+    except SQLAlchemyError:
+        logger.exception("Database error in %s", operation)
+        DB_READER_REQUESTS_FAILURES_TOTAL.labels(error_type="SQLAlchemyError").inc()
+        DB_READER_REQUESTS_RECEIVED_TOTAL.labels(status="error", operation=operation).inc()
+        return ORJSONResponse(content={"detail": "Database error occurred"}, status_code=500)
+    except Exception:
+        logger.exception("Unexpected error in %s", operation)
+        DB_READER_REQUESTS_FAILURES_TOTAL.labels(error_type="UnexpectedError").inc()
+        DB_READER_REQUESTS_RECEIVED_TOTAL.labels(status="error", operation=operation).inc()
+        return ORJSONResponse(content={"detail": "Unexpected error occurred"}, status_code=500)
@@ -1,44 +1,66 @@
+import asyncio
 import logging
-from contextlib import contextmanager
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
 
-from sqlalchemy.orm import aliased
-
-from database.engine import SessionLocal
-from database.db_models.models import Link, Page, PageContent, ScheduledLinks
-from shared.utils import get_timestamp_eastern_time
+from sqlalchemy import text
 
 from components.db_reader.monitoring.metrics import (
-    DB_READER_LINKS_POPPED_TOTAL,
     DB_READER_DUE_PAGES_FOUND_TOTAL,
     DB_READER_EMPTY_CHECKS_TOTAL,
+    DB_READER_LINKS_POPPED_TOTAL,
     DB_READER_QUERY_LATENCY_SECONDS,
 )
+from database.async_engine import AsyncSessionLocal
+from database.content_store import decompress_text
+from database.search import TEXT_SEARCH_CONFIG, make_snippet, query_terms
+from shared.utils import create_hash, get_timestamp_eastern_time
 
-@contextmanager
-def get_db(session_factory=None):
+
+@asynccontextmanager
+async def get_db(session_factory=None):
     """
-    Provides a transactional DB session with commit/rollback logic
+    Provides a transactional async DB session with commit/rollback logic
     """
-    session_factory = session_factory or SessionLocal
-    db = session_factory()
-    try:
-        yield db
-        db.commit()
-    except Exception:
-        db.rollback()
-        raise
-    finally:
-        db.close()
+    session_factory = session_factory or AsyncSessionLocal
+    async with session_factory() as db:
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+# Picks and deletes the top `count` links in one round trip. Matching on
+# (id, scheduled_at) lets a partitioned table prune to the picked rows' partitions
+_POP_SCHEDULED_LINKS_SQL = text("""
+    WITH picked AS (
+        SELECT id, scheduled_at
+        FROM scheduled_links
+        ORDER BY priority DESC, id
+        LIMIT :count
+        FOR UPDATE SKIP LOCKED
+    )
+    DELETE FROM scheduled_links s
+    USING picked
+    WHERE s.id = picked.id AND s.scheduled_at = picked.scheduled_at
+    RETURNING s.id, s.url, s.scheduled_at, s.depth, s.priority
+""")
 
-def pop_links_from_schedule(count: int, logger: logging.Logger, session_factory=None) -> list[dict]:
+
+async def pop_links_from_schedule(count: int, logger: logging.Logger, session_factory=None) -> list[dict]:
     """
-    Fetches a batch of scheduled links for crawling and removes them from the schedule
+    Fetches the highest-priority batch of scheduled links for crawling and removes them from the schedule
 
     This function:
-    - Retrieves scheduled links while skipping any that are currently locked by other workers (using skip-locked)
+    - Selects the top `count` links by priority (ties broken by insertion order) while skipping
+      any that are currently locked by other workers (using skip-locked), and deletes them
+      in the same statement, so the pop is atomic and takes one round trip
     - Logs the number of fetched links
-    - Deletes the fetched links from the `ScheduledLinks` table to avoid reprocessing
-    - Returns a list of dicts with `url`, `scheduled_at`, and `depth` for each link
+    - Returns a list of dicts with `url`, `scheduled_at`, `depth` and `priority` for each link,
+      highest priority first
 
     Args:
         count (int): The number of links to retrieve
@@ -48,37 +70,37 @@ def pop_links_from_schedule(count: int, logger: logging.Logger, session_factory=
     Returns:
         list[dict]: A list of scheduled link metadata dictionaries
     """
-    with get_db(session_factory) as db:
+    async with get_db(session_factory) as db:
         with DB_READER_QUERY_LATENCY_SECONDS.labels(operation="pop_links_from_schedule").time():
-            scheduled_links = (
-                db.query(ScheduledLinks)
-                .order_by(ScheduledLinks.id)
-                .limit(count)
-                .with_for_update(skip_locked=True)
-                .all()
-            )
+            rows = (await db.execute(_POP_SCHEDULED_LINKS_SQL, {'count': count})).all()
 
-            if not scheduled_links:
-                return []
+        if not rows:
+            return []
 
-            logger.info("Fetched %d links from scheduled queue", len(scheduled_links))
-            DB_READER_LINKS_POPPED_TOTAL.inc(len(scheduled_links))
+        logger.info("Fetched %d links from scheduled queue", len(rows))
+        DB_READER_LINKS_POPPED_TOTAL.inc(len(rows))
 
-            links = [
-                {
-                    'url': link.url,
-                    'scheduled_at': link.scheduled_at,
-                    'depth': link.depth
-                }
-                for link in scheduled_links
-            ]
+        # RETURNING has no defined order
+        rows.sort(key=lambda row: (-row.priority, row.id))
+        return [
+            {
+                'url': row.url,
+                'scheduled_at': row.scheduled_at,
+                'depth': row.depth,
+                'priority': row.priority
+            }
+            for row in rows
+        ]
 
-            ids = [link.id for link in scheduled_links]
-            db.query(ScheduledLinks).filter(ScheduledLinks.id.in_(ids)).delete(synchronize_session=False)
+# One round trip, and each EXISTS stops at the first row instead of counting the table
+_ARE_TABLES_EMPTY_SQL = text("""
+    SELECT NOT EXISTS (SELECT 1 FROM pages)
+       AND NOT EXISTS (SELECT 1 FROM page_content)
+       AND NOT EXISTS (SELECT 1 FROM scheduled_links)
+""")
 
-            return links
 
-def are_tables_empty(logger: logging.Logger, session_factory=None) -> bool:
+async def are_tables_empty(logger: logging.Logger, session_factory=None) -> bool:
     """
     Checks if the core database tables (Page, PageContent, ScheduledLinks) are empty
 
@@ -92,13 +114,10 @@ def are_tables_empty(logger: logging.Logger, session_factory=None) -> bool:
     Returns:
         bool: True if all relevant tables are empty, False otherwise.
     """
-    with get_db(session_factory=session_factory) as db:
+    async with get_db(session_factory=session_factory) as db:
         with DB_READER_QUERY_LATENCY_SECONDS.labels(operation="are_tables_empty").time():
-            page_count = db.query(Page).count()
-            page_content_count = db.query(PageContent).count()
-            scheduled_links_count = db.query(ScheduledLinks).count()
+            is_empty = bool(await db.scalar(_ARE_TABLES_EMPTY_SQL))
 
-        is_empty = not page_count and not page_content_count and not scheduled_links_count
         DB_READER_EMPTY_CHECKS_TOTAL.labels(empty=str(is_empty).lower()).inc()
 
         if is_empty:
@@ -106,46 +125,302 @@ def are_tables_empty(logger: logging.Logger, session_factory=None) -> bool:
 
         return is_empty
 
-def get_due_pages(logger: logging.Logger, session_factory=None) -> list[dict]:
+# Planner estimates from the last VACUUM/ANALYZE, read from the catalog instead of
+# scanning the tables. A partitioned table has no estimate of its own, so its
+# partitions' estimates are summed. Tables never analyzed (-1) count as 0
+_APPROXIMATE_ROW_COUNTS_SQL = text("""
+    SELECT t.name, COALESCE(SUM(GREATEST(c.reltuples, 0)), 0)::BIGINT AS row_count
+    FROM unnest(CAST(:tables AS TEXT[])) AS t(name)
+    JOIN pg_class p ON p.oid = to_regclass(t.name)
+    LEFT JOIN pg_inherits i ON i.inhparent = p.oid
+    JOIN pg_class c ON c.oid = COALESCE(i.inhrelid, p.oid)
+    GROUP BY t.name
+""")
+
+# Served by idx_last_crawl_status
+_CRAWL_STATUS_COUNTS_SQL = text("""
+    SELECT last_crawl_status, count(*) AS page_count
+    FROM pages
+    GROUP BY last_crawl_status
+""")
+
+STATS_TABLES = ["pages", "page_content", "links", "scheduled_links", "urls", "text_contents"]
+
+
+async def get_table_stats(logger: logging.Logger, session_factory=None) -> dict:
     """
-    Retrieves a list of pages that are scheduled to be recrawled
+    Collects the crawl statistics served by `/stats`
+
+    Row counts are approximate (planner statistics), the crawl status breakdown is exact
+    and the frontier size is the approximate number of scheduled links. Callers should
+    cache the result, see `TableStatsCache`.
+
+    Args:
+        logger (logging.Logger): Logger instance
+        session_factory (optional): Custom SQLAlchemy session factory (used for testing or override)
+
+    Returns:
+        dict: 'approximate_row_counts', 'crawl_status', 'frontier_size' and 'refreshed_at'
+    """
+    async with get_db(session_factory) as db:
+        with DB_READER_QUERY_LATENCY_SECONDS.labels(operation="get_table_stats").time():
+            row_counts = (await db.execute(_APPROXIMATE_ROW_COUNTS_SQL, {'tables': STATS_TABLES})).all()
+            status_counts = (await db.execute(_CRAWL_STATUS_COUNTS_SQL)).all()
+
+    approximate_row_counts = {table: 0 for table in STATS_TABLES}
+    approximate_row_counts.update({row.name: row.row_count for row in row_counts})
+
+    logger.debug("Refreshed table statistics")
+    return {
+        'approximate_row_counts': approximate_row_counts,
+        'crawl_status': {str(row.last_crawl_status): row.page_count for row in status_counts},
+        'frontier_size': approximate_row_counts['scheduled_links'],
+        'refreshed_at': datetime.now(UTC).isoformat(),
+    }
+
+
+class TableStatsCache:
+    """
+    Serves `get_table_stats` from memory, refreshing it at most once every `ttl_seconds`
+
+    Concurrent requests for expired stats wait for a single refresh instead of each
+    querying the database. Each db_reader worker process keeps its own cache.
+    """
+
+    def __init__(self, ttl_seconds: float, logger: logging.Logger, session_factory=None):
+        self._ttl_seconds = ttl_seconds
+        self._logger = logger
+        self._session_factory = session_factory
+        self._stats: dict | None = None
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get(self) -> dict:
+        if self._stats is not None and time.monotonic() < self._expires_at:
+            return self._stats
+
+        async with self._lock:
+            # Another request may have refreshed the stats while this one waited
+            if self._stats is None or time.monotonic() >= self._expires_at:
+                self._stats = await get_table_stats(self._logger, self._session_factory)
+                self._expires_at = time.monotonic() + self._ttl_seconds
+            return self._stats
+
+# Distinct due pages in (next_crawl_at, id) order, read through idx_pages_next_crawl.
+# The depth is the page's shallowest inbound link (0 for seeds), looked up per page
+# through idx_links_target_url_id instead of joining every inbound link. Pages whose
+# url_id isn't filled yet (see `backfill_url_ids`) are matched on the URL string, as
+# before URL interning; only the branch taken is evaluated
+_DUE_PAGES_SELECT = """
+    SELECT p.id, p.url, p.next_crawl_at,
+           COALESCE(
+               CASE WHEN p.url_id IS NOT NULL
+                    THEN (SELECT min(l.depth) FROM links l WHERE l.target_url_id = p.url_id)
+                    ELSE (SELECT min(l.depth) FROM links l WHERE l.url = p.url)
+               END, 0
+           ) AS depth
+    FROM pages p
+    WHERE p.next_crawl_at IS NOT NULL
+      AND p.next_crawl_at < :now
+      {keyset}
+    ORDER BY p.next_crawl_at, p.id
+    LIMIT :batch_size
+"""
+_FIRST_DUE_PAGES_SQL = text(_DUE_PAGES_SELECT.format(keyset=""))
+_NEXT_DUE_PAGES_SQL = text(_DUE_PAGES_SELECT.format(
+    keyset="AND (p.next_crawl_at, p.id) > (:after_next_crawl_at, :after_id)"
+))
+
+DUE_PAGES_BATCH_SIZE = 1000
+
+
+async def iter_due_pages(
+    logger: logging.Logger,
+    limit: int | None = None,
+    batch_size: int = DUE_PAGES_BATCH_SIZE,
+    session_factory=None
+) -> AsyncIterator[dict]:
+    """
+    Yields the pages that are due to be recrawled, most overdue first
 
     A page is considered due for recrawl if:
     - Its `next_crawl_at` timestamp is set
     - The `next_crawl_at` timestamp is earlier than the current time (America/New_York)
 
-    The result includes the URL and its associated crawl depth, which is obtained
-    via an outer join with the Link table.
+    Pages are read with keyset pagination, `batch_size` at a time and each batch in its
+    own short transaction, so memory stays bounded and no transaction is held open
+    while the caller consumes the results. Each page is yielded once, with the minimum
+    depth of the links pointing to it.
 
     Args:
-        logger (logging.Logger): Logger instance 
+        logger (logging.Logger): Logger instance
+        limit (int, optional): Maximum number of pages to yield, all due pages if None
+        batch_size (int): Pages read per query
+        session_factory (optional): Custom SQLAlchemy session factory (used for testing or override)
+
+    Yields:
+        dict: 'url' and 'depth' of a due page
+    """
+    now_est = get_timestamp_eastern_time()
+    logger.info("Searching for pages due for recrawl")
+
+    found = 0
+    after = None
+    while limit is None or found < limit:
+        size = batch_size if limit is None else min(batch_size, limit - found)
+
+        async with get_db(session_factory) as db:
+            with DB_READER_QUERY_LATENCY_SECONDS.labels(operation="get_due_pages").time():
+                if after is None:
+                    result = await db.execute(_FIRST_DUE_PAGES_SQL, {'now': now_est, 'batch_size': size})
+                else:
+                    result = await db.execute(_NEXT_DUE_PAGES_SQL, {
+                        'now': now_est,
+                        'batch_size': size,
+                        'after_next_crawl_at': after[0],
+                        'after_id': after[1],
+                    })
+                rows = result.all()
+
+        DB_READER_DUE_PAGES_FOUND_TOTAL.inc(len(rows))
+        found += len(rows)
+        for row in rows:
+            yield {"url": row.url, "depth": row.depth}
+
+        if len(rows) < size:
+            break
+        after = (rows[-1].next_crawl_at, rows[-1].id)
+
+    logger.info("Found %d pages due for recrawl", found)
+
+
+async def get_due_pages(logger: logging.Logger, limit: int | None = None, session_factory=None) -> list[dict]:
+    """
+    Retrieves a list of pages that are scheduled to be recrawled
+
+    Loads every result in memory, prefer `iter_due_pages` for large backlogs.
+
+    Args:
+        logger (logging.Logger): Logger instance
+        limit (int, optional): Maximum number of pages to return, all due pages if None
         session_factory (optional): Custom SQLAlchemy session factory (used for testing or override)
 
     Returns:
         list[dict]: A list of dictionaries with 'url' and 'depth' keys for each due page.
     """
-    with get_db(session_factory) as db:
-        now_est = get_timestamp_eastern_time()
-        logger.info("Searching for pages due for recrawl")
+    return [page async for page in iter_due_pages(logger, limit=limit, session_factory=session_factory)]
 
-        with DB_READER_QUERY_LATENCY_SECONDS.labels(operation="get_due_pages").time():
-            LinkAlias = aliased(Link)
 
-            results = (
-                db.query(Page.url, LinkAlias.depth)
-                .outerjoin(LinkAlias, LinkAlias.url == Page.url)
-                .filter(
-                    Page.next_crawl_at is not None,
-                    Page.next_crawl_at < now_est
-                )
-                .order_by(Page.next_crawl_at.asc())
-                .all()
-            )
+# Matches are found through idx_page_content_search_vector. Only the :max_candidates
+# most recently parsed matches (highest page_content.id, the primary key) are ranked,
+# which bounds the cost of very common terms. For those the ranking is over a
+# deterministic subset, and one extra candidate is read to tell the caller the
+# results are truncated. Texts are joined for the returned page only
+_SEARCH_SQL = text("""
+    WITH q AS (
+        SELECT websearch_to_tsquery(CAST(:config AS REGCONFIG), :query) AS query
+    ),
+    candidates AS (
+        SELECT pc.id, pc.source_page_url, pc.title, pc.text_content, pc.text_content_hash, pc.search_vector
+        FROM page_content pc, q
+        WHERE pc.search_vector @@ q.query
+        ORDER BY pc.id DESC
+        LIMIT :max_candidates + 1
+    ),
+    ranked AS (
+        SELECT c.*, ts_rank_cd(c.search_vector, q.query) AS rank
+        FROM (SELECT * FROM candidates ORDER BY id DESC LIMIT :max_candidates) c, q
+        ORDER BY rank DESC, c.id
+        LIMIT :limit OFFSET :offset
+    )
+    SELECT r.id, r.source_page_url AS url, r.title, r.rank, r.text_content,
+           t.compressed_text, t.compression,
+           (SELECT count(*) FROM candidates) > :max_candidates AS truncated
+    FROM ranked r
+    LEFT JOIN text_contents t ON t.content_hash = r.text_content_hash
+    ORDER BY r.rank DESC, r.id
+""")
 
-        logger.info("Found %d pages due for recrawl", len(results))
-        DB_READER_DUE_PAGES_FOUND_TOTAL.inc(len(results))
+SEARCH_MAX_CANDIDATES = 10_000
 
-        return [
-            {"url": url, "depth": depth or 0}
-            for url, depth in results
-        ]
+
+async def search_pages(
+    query: str,
+    logger: logging.Logger,
+    limit: int = 10,
+    offset: int = 0,
+    max_candidates: int = SEARCH_MAX_CANDIDATES,
+    session_factory=None
+) -> dict:
+    """
+    Full-text search over the titles and texts of parsed pages, best matches first
+
+    The query uses web search syntax (quoted phrases, `or`, `-word`). Title matches
+    rank above text matches. See database.search. A query matching more than
+    `max_candidates` pages only ranks the most recently parsed ones, and the result
+    says it was truncated.
+
+    Args:
+        query (str): Search query
+        logger (logging.Logger): Logger instance
+        limit (int): Maximum number of results
+        offset (int): Results to skip, for pagination
+        max_candidates (int): Maximum number of matches ranked
+        session_factory (optional): Custom SQLAlchemy session factory (used for testing or override)
+
+    Returns:
+        dict: 'results' ('url', 'title', 'rank' and 'snippet' of each result) and
+              'truncated' (whether matches beyond `max_candidates` were left unranked)
+    """
+    async with get_db(session_factory) as db:
+        with DB_READER_QUERY_LATENCY_SECONDS.labels(operation="search_pages").time():
+            rows = (await db.execute(_SEARCH_SQL, {
+                'config': TEXT_SEARCH_CONFIG,
+                'query': query,
+                'max_candidates': max_candidates,
+                'limit': limit,
+                'offset': offset,
+            })).all()
+
+    terms = query_terms(query)
+    results = []
+    for row in rows:
+        body = row.text_content
+        if body is None and row.compressed_text is not None:
+            body = decompress_text(row.compressed_text, row.compression)
+        results.append({
+            'url': row.url,
+            'title': row.title,
+            'rank': row.rank,
+            'snippet': make_snippet(body, terms),
+        })
+
+    truncated = bool(rows) and bool(rows[0].truncated)
+    logger.debug("Search for %r returned %d results (truncated: %s)", query, len(results), truncated)
+    return {'results': results, 'truncated': truncated}
+
+
+# Both served by unique indexes of urls, so graph queries never touch links
+_URL_ID_SQL = text("SELECT id FROM urls WHERE url_hash = :url_hash")
+_URLS_BY_ID_SQL = text("SELECT id, url FROM urls WHERE id = ANY(CAST(:ids AS BIGINT[]))")
+
+
+async def get_url_id(url: str, session_factory=None) -> int | None:
+    """
+    Returns the interned ID of a URL (the node ID of the link graph), None if it was never stored
+    """
+    async with get_db(session_factory) as db:
+        with DB_READER_QUERY_LATENCY_SECONDS.labels(operation="get_url_id").time():
+            return await db.scalar(_URL_ID_SQL, {'url_hash': create_hash(url)})
+
+
+async def get_urls_by_id(ids: list[int], session_factory=None) -> dict[int, str]:
+    """
+    Returns the URLs of interned URL IDs, by ID
+    """
+    if not ids:
+        return {}
+    async with get_db(session_factory) as db:
+        with DB_READER_QUERY_LATENCY_SECONDS.labels(operation="get_urls_by_id").time():
+            rows = (await db.execute(_URLS_BY_ID_SQL, {'ids': list(ids)})).all()
+    return {row.id: row.url for row in rows}
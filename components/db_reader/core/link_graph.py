@@ -0,0 +1,402 @@
+"""
+Precomputed adjacency of the link graph, served from memory-mapped NumPy arrays
+
+The graph is stored as two CSR (compressed sparse row) structures over interned URL
+IDs (`urls.id`): for out-links, `out_offsets[n]:out_offsets[n + 1]` is the slice of
+`out_targets` holding the targets of node n, and likewise `in_offsets`/`in_sources`
+for in-links. A query is a slice of a memory-mapped array, so it never touches the
+`links` table, and every db_reader worker shares the same pages of the OS page cache.
+
+Snapshots are built by a separate process:
+
+    python -m components.db_reader.core.link_graph [--full] [--loop-seconds N] [--full-every N]
+
+Each run reads only the links created since the previous snapshot (through
+idx_links_created_at), drops those already in it, and inserts the rest into copies of
+its sorted arrays, so the existing edges are never re-sorted. Links are never
+deleted by the writers except when a page is deleted, so a full rebuild every
+`--full-every` runs is enough to drop them. A snapshot is written to its own
+directory and published by atomically replacing the CURRENT file, which readers
+check every `reload_seconds`.
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+CURRENT_FILE = "CURRENT"
+META_FILE = "meta.json"
+ARRAY_NAMES = ("out_offsets", "out_targets", "in_offsets", "in_sources")
+
+# Snapshots kept on disk: the current one and the one readers may still have mapped
+SNAPSHOTS_KEPT = 2
+
+# Rows fetched per round trip while streaming links
+EDGE_CHUNK_ROWS = 100_000
+
+# Links are read from this long before the previous run started, so rows committed
+# late by transactions that began before it aren't missed. Re-read links are deduplicated
+DELTA_OVERLAP = timedelta(minutes=10)
+
+_EDGES_SQL = """
+    SELECT source_url_id, target_url_id
+    FROM links
+    WHERE source_url_id IS NOT NULL AND target_url_id IS NOT NULL
+    {since}
+"""
+_ALL_EDGES_SQL = text(_EDGES_SQL.format(since=""))
+_NEW_EDGES_SQL = text(_EDGES_SQL.format(since="AND created_at >= :since"))
+
+
+class LinkGraphUnavailable(RuntimeError):
+    """
+    Raised when no link graph snapshot has been built yet
+    """
+
+
+def build_csr(keys: np.ndarray, values: np.ndarray, num_nodes: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Groups `values` by `keys` into CSR arrays, each node's values in ascending order
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: offsets (num_nodes + 1 entries) and the grouped values
+    """
+    order = np.lexsort((values, keys))
+    offsets = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=num_nodes), out=offsets[1:])
+    return offsets, values[order]
+
+
+def find_in_csr(
+    offsets: np.ndarray, values: np.ndarray, keys: np.ndarray, new_values: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Looks up (key, value) pairs in CSR arrays whose rows are sorted, all pairs at once
+
+    Keys must be below the number of nodes of the CSR.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Whether each pair is present, and the index of
+        `values` where it is or would be inserted to keep its row sorted
+    """
+    lo, end = offsets[keys], offsets[keys + 1]
+    if not len(values):
+        return np.zeros(len(keys), dtype=bool), lo
+
+    # Binary search within each pair's row, vectorised over the pairs
+    hi = end.copy()
+    while True:
+        searching = lo < hi
+        if not searching.any():
+            break
+        mid = (lo + hi) // 2
+        below = searching & (values[np.minimum(mid, len(values) - 1)] < new_values)
+        lo = np.where(below, mid + 1, lo)
+        hi = np.where(searching & ~below, mid, hi)
+    found = (lo < end) & (values[np.minimum(lo, len(values) - 1)] == new_values)
+    return found, lo
+
+
+def merge_into_csr(
+    offsets: np.ndarray, values: np.ndarray, keys: np.ndarray, new_values: np.ndarray, num_nodes: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Inserts (key, value) pairs missing from CSR arrays, keeping every row sorted
+
+    Only the new pairs are sorted; the existing values are copied around them.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: offsets (num_nodes + 1 entries) and values
+    """
+    order = np.lexsort((new_values, keys))
+    keys, new_values = keys[order], new_values[order]
+
+    offsets = np.concatenate([offsets, np.full(num_nodes + 1 - len(offsets), offsets[-1], dtype=np.int64)])
+    _, positions = find_in_csr(offsets, values, keys, new_values)
+    merged_values = np.insert(values, positions, new_values)
+
+    merged_offsets = offsets.copy()
+    merged_offsets[1:] += np.cumsum(np.bincount(keys, minlength=num_nodes))
+    return merged_offsets, merged_values
+
+
+class LinkGraph:
+    """
+    Read side of the link graph snapshots in `directory`
+
+    The current snapshot is memory-mapped on first use and swapped for a newer one at
+    most every `reload_seconds`. Node IDs are URL IDs (`urls.id`).
+    """
+
+    def __init__(self, directory: str, reload_seconds: float = 30):
+        self._directory = Path(directory)
+        self._reload_seconds = reload_seconds
+        self._checked_at = None
+        self._version = None
+        self._arrays: dict[str, np.ndarray] | None = None
+        self.meta: dict | None = None
+
+    def out_links(self, node: int, limit: int | None = None) -> list[int]:
+        """
+        URL IDs the page links to
+        """
+        arrays = self._snapshot()
+        return _neighbours(arrays['out_offsets'], arrays['out_targets'], node, limit).tolist()
+
+    def in_links(self, node: int, limit: int | None = None) -> list[int]:
+        """
+        URL IDs of the pages linking to the page
+        """
+        arrays = self._snapshot()
+        return _neighbours(arrays['in_offsets'], arrays['in_sources'], node, limit).tolist()
+
+    def neighbourhood(self, node: int, hops: int, max_nodes: int, direction: str = "out") -> dict[int, int]:
+        """
+        Breadth-first k-hop neighbourhood of a node
+
+        Args:
+            node (int): URL ID to start from
+            hops (int): Maximum distance
+            max_nodes (int): Stop once this many nodes (including `node`) were reached
+            direction (str): "out" follows links, "in" follows them backwards, "both" does both
+
+        Returns:
+            Dict[int, int]: Distance of every node reached, by URL ID
+        """
+        arrays = self._snapshot()
+        csrs = {
+            "out": [(arrays['out_offsets'], arrays['out_targets'])],
+            "in": [(arrays['in_offsets'], arrays['in_sources'])],
+        }
+        csrs["both"] = csrs["out"] + csrs["in"]
+        if direction not in csrs:
+            raise ValueError(f"Unknown direction: {direction}")
+
+        distances = {node: 0}
+        frontier = [node]
+        for hop in range(1, hops + 1):
+            next_frontier = []
+            for current in frontier:
+                for offsets, neighbours in csrs[direction]:
+                    for neighbour in _neighbours(offsets, neighbours, current).tolist():
+                        if neighbour in distances:
+                            continue
+                        distances[neighbour] = hop
+                        next_frontier.append(neighbour)
+                        if len(distances) >= max_nodes:
+                            return distances
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        return distances
+
+    def _snapshot(self) -> dict[str, np.ndarray]:
+        now = time.monotonic()
+        if self._checked_at is None or now - self._checked_at >= self._reload_seconds:
+            self._checked_at = now
+            version = read_current_version(self._directory)
+            if version is not None and version != self._version:
+                self._arrays, self.meta = load_snapshot(self._directory / version)
+                self._version = version
+
+        if self._arrays is None:
+            raise LinkGraphUnavailable(f"No link graph snapshot in {self._directory}")
+        return self._arrays
+
+
+def _neighbours(offsets: np.ndarray, neighbours: np.ndarray, node: int, limit: int | None = None) -> np.ndarray:
+    if node < 0 or node + 1 >= len(offsets):
+        return neighbours[:0]
+    start, end = int(offsets[node]), int(offsets[node + 1])
+    if limit is not None:
+        end = min(end, start + limit)
+    return neighbours[start:end]
+
+
+def read_current_version(directory: Path) -> str | None:
+    try:
+        return (directory / CURRENT_FILE).read_text().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def load_snapshot(path: Path, mmap_mode: str | None = "r") -> tuple[dict[str, np.ndarray], dict]:
+    """
+    Opens the arrays of a snapshot, memory-mapped unless `mmap_mode` is None
+    """
+    arrays = {name: np.load(path / f"{name}.npy", mmap_mode=mmap_mode) for name in ARRAY_NAMES}
+    meta = json.loads((path / META_FILE).read_text())
+    return arrays, meta
+
+
+def write_snapshot(directory: Path, sources: np.ndarray, targets: np.ndarray, meta: dict) -> str:
+    """
+    Writes the CSR arrays of a deduplicated edge list as a new snapshot and publishes it
+
+    Returns:
+        str: Name of the new snapshot
+    """
+    return publish_snapshot(directory, snapshot_arrays(sources, targets), meta)
+
+
+def snapshot_arrays(sources: np.ndarray, targets: np.ndarray) -> tuple[np.ndarray, ...]:
+    """
+    CSR arrays of a deduplicated edge list, in ARRAY_NAMES order
+    """
+    num_nodes = int(max(sources.max(initial=-1), targets.max(initial=-1))) + 1
+    return (*build_csr(sources, targets, num_nodes), *build_csr(targets, sources, num_nodes))
+
+
+def publish_snapshot(directory: Path, arrays: tuple[np.ndarray, ...], meta: dict) -> str:
+    """
+    Writes CSR arrays, in ARRAY_NAMES order, as a new snapshot and publishes it
+
+    Returns:
+        str: Name of the new snapshot
+    """
+    out_offsets = arrays[0]
+    num_nodes = len(out_offsets) - 1
+
+    version = f"snapshot-{time.time_ns()}"
+    path = directory / version
+    path.mkdir(parents=True)
+    for name, array in zip(ARRAY_NAMES, arrays):
+        np.save(path / f"{name}.npy", array)
+    (path / META_FILE).write_text(json.dumps({**meta, 'nodes': num_nodes, 'edges': int(out_offsets[-1])}))
+
+    # Readers only ever see a complete snapshot
+    pending = directory / f"{CURRENT_FILE}.tmp"
+    pending.write_text(version)
+    os.replace(pending, directory / CURRENT_FILE)
+
+    snapshots = sorted(p for p in directory.iterdir() if p.is_dir() and p.name.startswith("snapshot-"))
+    for stale in snapshots[:-SNAPSHOTS_KEPT]:
+        shutil.rmtree(stale, ignore_errors=True)
+
+    return version
+
+
+def read_edges(conn: Connection, since: datetime | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Streams (source_url_id, target_url_id) pairs from links, all of them or those created since `since`
+    """
+    statement, params = (_ALL_EDGES_SQL, {}) if since is None else (_NEW_EDGES_SQL, {'since': since})
+    result = conn.execution_options(stream_results=True, max_row_buffer=EDGE_CHUNK_ROWS).execute(statement, params)
+
+    chunks = [np.asarray(rows, dtype=np.int64) for rows in result.partitions(EDGE_CHUNK_ROWS)]
+    if not chunks:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    edges = np.concatenate(chunks)
+    return edges[:, 0], edges[:, 1]
+
+
+def merge_snapshot(arrays: dict[str, np.ndarray], sources: np.ndarray, targets: np.ndarray) -> tuple[np.ndarray, ...]:
+    """
+    CSR arrays of a snapshot with the given edges added, in ARRAY_NAMES order
+
+    Edges already in the snapshot are skipped, so `sources`/`targets` may overlap it
+    but must not hold duplicates themselves.
+    """
+    out_offsets, out_targets = np.asarray(arrays['out_offsets']), arrays['out_targets']
+    in_offsets, in_sources = np.asarray(arrays['in_offsets']), arrays['in_sources']
+    num_nodes = max(len(out_offsets) - 1, int(max(sources.max(initial=-1), targets.max(initial=-1))) + 1)
+
+    known = sources < len(out_offsets) - 1
+    found, _ = find_in_csr(out_offsets, out_targets, sources[known], targets[known])
+    new = np.ones(len(sources), dtype=bool)
+    new[np.flatnonzero(known)[found]] = False
+    sources, targets = sources[new], targets[new]
+
+    return (
+        *merge_into_csr(out_offsets, out_targets, sources, targets, num_nodes),
+        *merge_into_csr(in_offsets, in_sources, targets, sources, num_nodes),
+    )
+
+
+def refresh_link_graph(engine: Engine, directory: str, full: bool = False, logger: logging.Logger | None = None) -> str:
+    """
+    Builds a new snapshot, merging the links created since the current one into it
+    unless `full` (or there is no snapshot yet), in which case every link is read
+
+    Returns:
+        str: Name of the new snapshot
+    """
+    logger = logger or logging.getLogger(__name__)
+    directory = Path(directory)
+    version = read_current_version(directory)
+
+    base = None
+    if version is not None and not full:
+        arrays, meta = load_snapshot(directory / version)
+        base = (arrays, datetime.fromisoformat(meta['watermark']))
+
+    with engine.connect() as conn:
+        started_at = conn.execute(text("SELECT now()")).scalar()
+        sources, targets = read_edges(conn, since=base[1] if base else None)
+    read_count = len(sources)
+
+    # Only the links read are deduplicated and sorted; the snapshot's are already
+    if len(sources):
+        edges = np.unique(np.stack([sources, targets], axis=1), axis=0)
+        sources, targets = edges[:, 0], edges[:, 1]
+
+    meta = {
+        'watermark': (started_at - DELTA_OVERLAP).isoformat(),
+        'built_at': datetime.now(UTC).isoformat(),
+        'full': base is None,
+    }
+    arrays = merge_snapshot(base[0], sources, targets) if base else snapshot_arrays(sources, targets)
+    new_version = publish_snapshot(directory, arrays, meta)
+    logger.info(
+        "Built link graph %s with %d edges (%s, %d links read)",
+        new_version, int(arrays[0][-1]), "full" if base is None else "incremental", read_count
+    )
+    return new_version
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build link graph snapshots for the db_reader")
+    parser.add_argument("--directory", help="Snapshot directory (default: graph.directory of the db_reader config)")
+    parser.add_argument("--full", action="store_true", help="Rebuild from every link instead of merging new ones")
+    parser.add_argument(
+        "--loop-seconds", type=int, default=0,
+        help="Keep running, once every N seconds (default: run once and exit)"
+    )
+    parser.add_argument("--full-every", type=int, default=24, help="When looping, rebuild fully every N runs")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    logger = logging.getLogger("link_graph")
+
+    # Imported here so the module can be imported without DATABASE_URL set
+    from database.engine import engine
+    from shared.configs.config_loader import component_config_loader
+
+    directory = args.directory or component_config_loader("db_reader")['graph']['directory']
+
+    run = 0
+    while True:
+        try:
+            full = args.full or (args.loop_seconds and run % args.full_every == 0)
+            refresh_link_graph(engine, directory, full=bool(full), logger=logger)
+        except Exception:
+            if not args.loop_seconds:
+                raise
+            logger.exception("Link graph build failed, retrying next run")
+
+        if not args.loop_seconds:
+            return
+        run += 1
+        time.sleep(args.loop_seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -38,3 +38,11 @@ DB_READER_QUERY_LATENCY_SECONDS = Histogram(
     "Latency for DB reader queries in seconds",
     ["operation"]
 )
+
+
+# Connection pool
+DB_READER_POOL_CHECKOUT_WAIT_SECONDS = Histogram(
+    "db_reader_pool_checkout_wait_seconds",
+    "Time spent waiting for a database connection from the pool",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
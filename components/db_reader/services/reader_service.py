@@ -1,26 +1,54 @@
-
+import os
+import tempfile
+from contextlib import asynccontextmanager
 from typing import Any
-from fastapi import FastAPI
+
 import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from prometheus_client import CollectorRegistry, start_http_server
+from prometheus_client.multiprocess import MultiProcessCollector
+
 from components.db_reader.api.database_routes import database_router
 from components.db_reader.api.monitoring_routes import monitor_router
+from components.db_reader.core.db_reader import TableStatsCache
+from components.db_reader.core.link_graph import LinkGraph
+from components.db_reader.monitoring.metrics import DB_READER_POOL_CHECKOUT_WAIT_SECONDS
+from database.async_engine import configure_async_engine, warm_up_pool
+from database.engine import load_engine_profile
 from shared.logging_utils import get_logger
 
+# Import string of the app, uvicorn needs it to start several worker processes
+APP_IMPORT_PATH = "components.db_reader.main:app"
+PROMETHEUS_PORT = 8000
+
 
 class DbReaderService:
     """
     Service responsible for configuring and running the db_reader FastAPI application
+
+    Handlers are async and share one asyncpg pool per worker process. Each worker builds
+    its engine and warms up `database.engine.warmup_connections` connections on startup,
+    so the connection budget is `server.workers` times the pool size.
     """
 
-    def __init__(self, app: FastAPI, configs: dict[str, Any]):
+    def __init__(self, configs: dict[str, Any]):
+        self._configs = configs
         self._host = configs['network']['host']
         self._port = configs['network']['port']
+        self._workers = int(configs.get('server', {}).get('workers', 1))
 
         self._logger = get_logger(
             configs['logging']['logger_name'], configs['logging']['log_level']
         )
-        
-        self.app = app
+
+        self.app = FastAPI(lifespan=self._lifespan, default_response_class=ORJSONResponse)
+        self.app.state.stats_cache = TableStatsCache(
+            configs.get('stats', {}).get('cache_ttl_seconds', 60), self._logger
+        )
+        self.app.state.link_graph = LinkGraph(
+            configs['graph']['directory'], configs['graph'].get('reload_seconds', 30)
+        )
         self._setup_routes()
 
     def _setup_routes(self):
@@ -31,9 +59,38 @@ class DbReaderService:
         self.app.include_router(database_router)
         self.app.include_router(monitor_router)
 
+    @asynccontextmanager
+    async def _lifespan(self, app: FastAPI):
+        """
+        Creates this worker's engine and warms up its pool, then disposes of it on shutdown
+        """
+        engine = configure_async_engine(self._configs, DB_READER_POOL_CHECKOUT_WAIT_SECONDS.observe)
+
+        warmup = load_engine_profile(self._configs)['warmup_connections']
+        if warmup:
+            await warm_up_pool(engine, warmup)
+            self._logger.info("Warmed up %d database connections", warmup)
+
+        yield
+        await engine.dispose()
+
     def run(self):
         """
-        Start the FastAPI server using uvicorn
+        Start the metrics server and the FastAPI server using uvicorn
         """
-        self._logger.info("Running Db_Reader Component...")
-        uvicorn.run(self.app, host=self._host, port=self._port)
+        self._logger.info("Running Db_Reader Component with %d worker(s)...", self._workers)
+
+        if self._workers == 1:
+            start_http_server(PROMETHEUS_PORT)
+            uvicorn.run(self.app, host=self._host, port=self._port)
+            return
+
+        # Workers are separate processes, so their metrics are aggregated through
+        # prometheus_client's multiprocess mode. The variable must be set before the
+        # workers start, and they inherit it
+        os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", tempfile.mkdtemp(prefix="db_reader_metrics_"))
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry)
+        start_http_server(PROMETHEUS_PORT, registry=registry)
+
+        uvicorn.run(APP_IMPORT_PATH, host=self._host, port=self._port, workers=self._workers)
@@ -1,26 +1,45 @@
+import io
 import logging
+from collections import Counter
+from collections.abc import Iterable
 from contextlib import contextmanager
-from datetime import datetime
-from typing import List
+from datetime import datetime, timedelta
+from typing import Any
 
-from components.db_writer.monitoring.metrics import DB_WRITER_INSERT_FAILURE_TOTAL, DB_WRITER_INSERT_LATENCY_SECONDS, DB_WRITER_INSERT_SUCCESS_TOTAL
+from sqlalchemy import case, func, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from components.db_writer.core.id_cache import IdCache
+from components.db_writer.core.recrawl_policy import ChangeHistory, RecrawlPolicy
+from components.db_writer.monitoring.metrics import (
+    DB_WRITER_DUPLICATES_SKIPPED_TOTAL,
+    DB_WRITER_INSERT_FAILURE_TOTAL,
+    DB_WRITER_INSERT_LATENCY_SECONDS,
+    DB_WRITER_INSERT_SUCCESS_TOTAL,
+    DB_WRITER_PAGE_CHANGE_CHECKS_TOTAL,
+    DB_WRITER_RECRAWL_INTERVAL_SECONDS,
+)
+from database.content_store import COMPRESSION_ZSTD, compress_text
 from database.db_models.models import (
-    Category,
     Link,
     Page,
     PageContent,
-    ScheduledLinks
+    ScheduledLinks,
+    TextContent,
 )
 from database.engine import SessionLocal
+from database.idempotency import claim_keys
+from database.partitioning import PARTITIONING_ENABLED
+from database.search import UPDATE_SEARCH_VECTORS_SQL, search_vector_params
 from shared.rabbitmq.enums.crawl_status import CrawlStatus
 from shared.rabbitmq.schemas.save_to_db import (
     SaveLinksToSchedule,
     SavePageMetadataTask,
     SaveParsedContent,
-    SaveProcessedLinks)
-from sqlalchemy import case
-from sqlalchemy.dialects.postgresql import insert
-from sqlalchemy.orm import Session
+    SaveProcessedLinks,
+)
+from shared.utils import create_hash
 
 
 @contextmanager
@@ -45,53 +64,29 @@ def save_page_metadata(page_metadata: SavePageMetadataTask, logger: logging.Logg
 
     Performs an upsert on the Page table using the page's URL as the unique identifier.
     Increments crawl attempt counters and handles failed crawl tracking based on status.
+    A message whose idempotency key was already applied is skipped, so a redelivery
+    doesn't count the crawl attempt twice. With a recrawl policy configured, the next
+    crawl time comes from the page's change history (see `_recrawl_schedule`).
 
     Args:
         page_metadata (SavePageMetadataTask): Structured data representing crawl metadata for a page
         logger (logging.Logger): Logger instance
         session_factory (optional): Optional custom SQLAlchemy session factory for testing or injection
     """
+    new_url_ids = {}
     with get_db(session_factory=session_factory) as db:
 
         try:
             with DB_WRITER_INSERT_LATENCY_SECONDS.labels(operation="save_page_metadata").time():
-                stmt = insert(Page).values(
-                    url=page_metadata.url,
-                    last_crawl_status=page_metadata.status.value,
-                    http_status_code=page_metadata.http_status_code,
-                    url_hash=page_metadata.url_hash,
-                    html_content_hash=page_metadata.html_content_hash,
-                    compressed_filepath=page_metadata.compressed_filepath,
-                    last_crawled_at=page_metadata.fetched_at,
-                    next_crawl_at=page_metadata.next_crawl,
-                    total_crawl_attempts=1,
-                    failed_crawl_attempts=0,
-                    last_error_seen=page_metadata.error_message
-                )
-
-                # INSERT or UPDATE (aka Upsert)
-                stmt = stmt.on_conflict_do_update(
-                    # Assumes `url` has a UNIQUE constraint
-                    index_elements=['url'],
-                    set_={
-                        'last_crawl_status': stmt.excluded.last_crawl_status,
-                        'http_status_code': stmt.excluded.http_status_code,
-                        'html_content_hash': stmt.excluded.html_content_hash,
-                        'last_crawled_at': stmt.excluded.last_crawled_at,
-                        'next_crawl_at': stmt.excluded.next_crawl_at,
-                        'last_error_seen': stmt.excluded.last_error_seen,
-                        'total_crawl_attempts': Page.total_crawl_attempts + 1,
-                        'failed_crawl_attempts': case(
-                            (
-                                stmt.excluded.last_crawl_status.in_(
-                                    [CrawlStatus.FAILED.value, CrawlStatus.SKIPPED.value]),
-                                Page.failed_crawl_attempts + 1
-                            ),
-                            else_=Page.failed_crawl_attempts
-                        )
-                    }
-                )
-                db.execute(stmt)
+                if not _claim_new_tasks(db, [page_metadata], "save_page_metadata"):
+                    logger.info("Skipped already applied page metadata: %s", page_metadata.url)
+                    return
+
+                url_ids, fetched = _resolve_url_ids(db, [page_metadata.url])
+                schedule = _recrawl_schedule(db, [page_metadata], RECRAWL_POLICY) if RECRAWL_POLICY else {}
+                db.execute(_page_metadata_upsert(
+                    page_metadata, url_ids[page_metadata.url], schedule.get(page_metadata.url)))
+                new_url_ids = fetched
 
             DB_WRITER_INSERT_SUCCESS_TOTAL.labels(operation="save_page_metadata").inc()
             logger.info("Succesfully inserted/updated into DB page: %s", page_metadata.url)
@@ -101,6 +96,8 @@ def save_page_metadata(page_metadata: SavePageMetadataTask, logger: logging.Logg
             logger.error(
                 "Unexpected error while fetching page metadata: %s, %s", page_metadata.url, e)
 
+    URL_ID_CACHE.put_many(new_url_ids)
+
 
 def save_processed_links(processed_links: SaveProcessedLinks, logger: logging.Logger, session_factory=None) -> None:
     """
@@ -114,6 +111,7 @@ def save_processed_links(processed_links: SaveProcessedLinks, logger: logging.Lo
         logger (logging.Logger): Logger instance
         session_factory (optional): Optional custom SQLAlchemy session factory for testing or injection
     """
+    new_url_ids = {}
     with get_db(session_factory=session_factory) as db:
         try:
             if not processed_links.links:
@@ -121,37 +119,12 @@ def save_processed_links(processed_links: SaveProcessedLinks, logger: logging.Lo
                 return
 
             with DB_WRITER_INSERT_LATENCY_SECONDS.labels(operation="save_processed_links").time():
-                values = []
-                for link in processed_links.links:
-                    discovered_at_dt = datetime.fromisoformat(link.discovered_at)
-                    values.append({
-                        'source_page_url': link.source_page_url,
-                        'url': link.url,
-                        'depth': link.depth,
-                        'discovered_at': discovered_at_dt,
-                        'is_internal': link.is_internal,
-                        'anchor_text': link.anchor_text,
-                        'title_attribute': link.title_attribute,
-                        'rel_attribute': link.rel_attribute,
-                        'id_attribute': link.id_attribute,
-                        'link_type': link.link_type,
-                    })
+                values = [_processed_link_row(link) for link in processed_links.links]
+                fetched = _attach_url_ids(db, values, LINK_URL_ID_COLUMNS)
 
                 # Single bulk INSERT ... ON CONFLICT UPDATE
-                stmt = insert(Link).values(values)
-
-                stmt = stmt.on_conflict_do_update(
-                    index_elements=['source_page_url', 'url'],
-                    set_={
-                        'anchor_text': stmt.excluded.anchor_text,
-                        'title_attribute': stmt.excluded.title_attribute,
-                        'rel_attribute': stmt.excluded.rel_attribute,
-                        'id_attribute': stmt.excluded.id_attribute,
-                        'link_type': stmt.excluded.link_type,
-                    }
-                )
-
-                db.execute(stmt)
+                db.execute(_processed_links_upsert(values))
+                new_url_ids = fetched
 
             DB_WRITER_INSERT_SUCCESS_TOTAL.labels(operation="save_processed_links").inc()
             logger.info("Bulk upserted %d links into the Link table", len(values))
@@ -160,13 +133,16 @@ def save_processed_links(processed_links: SaveProcessedLinks, logger: logging.Lo
             DB_WRITER_INSERT_FAILURE_TOTAL.labels(operation="save_processed_links").inc()
             logger.exception("Unexpected error while bulk saving processed links")
 
+    URL_ID_CACHE.put_many(new_url_ids)
+
 
 def save_parsed_data(page_data: SaveParsedContent, logger: logging.Logger, session_factory=None) -> bool:
     """
     Save or update parsed textual content and categories for a crawled page
 
-    If content already exists for the given source URL, it is updated. Otherwise,
-    a new PageContent record is created. Also ensures all referenced categories exist.
+    Upserts the PageContent row on its source URL, resolves category names to IDs
+    (creating missing categories) and syncs the page's category associations.
+    See `_write_parsed_data`.
 
     Args:
         page_data (SaveParsedContent): Structured data including title, text content,
@@ -177,52 +153,33 @@ def save_parsed_data(page_data: SaveParsedContent, logger: logging.Logger, sessi
     Returns:
         bool: True if the operation succeeded, False if an error occurred
     """
-    with get_db(session_factory=session_factory) as db:
-        try:
-            with DB_WRITER_INSERT_LATENCY_SECONDS.labels(operation="save_parsed_data").time():
-                # Get or create categories
-                category_objs = _get_or_create_categories(db, page_data.categories)
-
-                # Insert or update PageContent
-                existing_page = db.query(PageContent).filter_by(
-                    source_page_url=page_data.source_page_url).first()
-
-                if existing_page:
-                    # Update existing fields
-                    existing_page.title = page_data.title
-                    existing_page.text_content = page_data.text_content
-                    existing_page.text_content_hash = page_data.text_content_hash
-                    existing_page.parsed_at = page_data.parsed_at
-                    existing_page.categories = category_objs  # update associations
-                else:
-                    # Create new PageContent
-                    page = PageContent(
-                        source_page_url=page_data.source_page_url,
-                        title=page_data.title,
-                        text_content=page_data.text_content,
-                        text_content_hash=page_data.text_content_hash,
-                        parsed_at=page_data.parsed_at,
-                        categories=category_objs  # set relationship
-                    )
-                    db.add(page)
-
-            DB_WRITER_INSERT_SUCCESS_TOTAL.labels(operation="save_parsed_data").inc()
-            logger.info("Parsed content saved for: %s", page_data.source_page_url)
-            return True
+    try:
+        with (
+            DB_WRITER_INSERT_LATENCY_SECONDS.labels(operation="save_parsed_data").time(),
+            get_db(session_factory=session_factory) as db,
+        ):
+            new_category_ids = _write_parsed_data(db, [page_data])
 
-        except Exception:
-            DB_WRITER_INSERT_FAILURE_TOTAL.labels(operation="save_parsed_data").inc()
-            logger.exception(
-                "Unexpected error while saving parsed content: %s", page_data.source_page_url)
-            return False
+        CATEGORY_ID_CACHE.put_many(new_category_ids)
+        DB_WRITER_INSERT_SUCCESS_TOTAL.labels(operation="save_parsed_data").inc()
+        logger.info("Parsed content saved for: %s", page_data.source_page_url)
+        return True
+
+    except Exception:
+        DB_WRITER_INSERT_FAILURE_TOTAL.labels(operation="save_parsed_data").inc()
+        logger.exception(
+            "Unexpected error while saving parsed content: %s", page_data.source_page_url)
+        return False
 
 
 def add_links_to_schedule(links_to_schedule: SaveLinksToSchedule, logger: logging.Logger, session_factory=None) -> None:
     """
     Bulk insert new links into the ScheduledLinks table for future crawling
 
-    Performs a bulk upsert using ON CONFLICT DO NOTHING to avoid duplicates based on URL.
-    Each link includes its target URL, crawl depth, and the timestamp when it was scheduled.
+    Performs a bulk upsert on URL that only ever raises the priority of a link already
+    scheduled, and raises the priority of the message's `priority_updates` that are
+    still queued (see `_raise_scheduled_priorities`).
+    Each link includes its target URL, crawl depth, priority, and the timestamp when it was scheduled.
 
     Args:
         links_to_schedule (SaveLinksToSchedule): Structured data containing links to be scheduled
@@ -232,25 +189,22 @@ def add_links_to_schedule(links_to_schedule: SaveLinksToSchedule, logger: loggin
     with get_db(session_factory=session_factory) as db:
         try:
             with DB_WRITER_INSERT_LATENCY_SECONDS.labels(operation="add_links_to_schedule").time():
-                values = []
-                for link in links_to_schedule.links:
-                    values.append({
-                        "url": link.url,
-                        "scheduled_at": link.scheduled_at,
-                        'depth': link.depth
-                    })
+                values = [_scheduled_link_row(link) for link in links_to_schedule.links]
+                updates = _priority_updates([links_to_schedule])
 
                 # Skip if no values
-                if not values:
+                if not values and not updates:
                     logger.warning('Skipped scheduling links into the DB: no values received')
                     return
 
-                
-                stmt = insert(ScheduledLinks).values(values)
-                stmt = stmt.on_conflict_do_nothing(index_elements=['url'])
-                db.execute(stmt)
+                new_url_ids = {}
+                if values:
+                    new_url_ids = _attach_url_ids(db, values, SCHEDULED_LINK_URL_ID_COLUMNS)
+                    db.execute(_scheduled_links_upsert(values))
+                raised = _raise_scheduled_priorities(db, updates)
 
-            logger.info("Bulk inserted %d links into schedule table", len(values))
+            URL_ID_CACHE.put_many(new_url_ids)
+            logger.info("Bulk inserted %d links into schedule table (%d priorities raised)", len(values), raised)
             DB_WRITER_INSERT_SUCCESS_TOTAL.labels(operation="add_links_to_schedule").inc()
 
         except Exception:
@@ -259,32 +213,954 @@ def add_links_to_schedule(links_to_schedule: SaveLinksToSchedule, logger: loggin
             raise
 
 
-# Makes sure Category objects exist for each name in the list.
-def _get_or_create_categories(db: Session, category_names: List[str]) -> List[Category]:
+# ---------------------------------------------------------------------------
+# Batch writers
+#
+# Used by the micro-batching consumers: every message in a batch is written in one
+# transaction. Unlike the single-message functions above, failures are re-raised so
+# the consumer can fall back to writing the messages one by one.
+# ---------------------------------------------------------------------------
+
+def save_page_metadata_batch(tasks: list[SavePageMetadataTask], logger: logging.Logger, session_factory=None) -> None:
     """
-    Ensure that Category entries exist for all given names, and return the corresponding objects
+    Upsert the metadata of a batch of crawled pages with one multi-row statement
 
-    Looks up existing categories in bulk. Creates any missing ones and flushes them
-    to get assigned IDs without committing. Useful for assigning category relationships.
+    Crawl metadata is the highest-rate writer queue. Tasks whose idempotency key was
+    already applied are dropped (see `_claim_new_tasks`), the rest are deduplicated by URL
+    (the last delivered task wins, crawl attempts are summed) and executed against a
+    single module-level statement, so SQLAlchemy compiles it once and reuses it from its
+    compiled cache. The rows are sent through `executemany`, which SQLAlchemy's
+    "insertmanyvalues" mode turns into multi-row VALUES batches. With a recrawl policy
+    configured, every crawl in the batch is folded into its page's change history first.
+
+    Args:
+        tasks (List[SavePageMetadataTask]): Page metadata messages, in delivery order
+        logger (logging.Logger): Logger instance
+        session_factory (optional): Optional SQLAlchemy session factory override
+
+    Raises:
+        Exception: Any database error, after the transaction has been rolled back
+    """
+    if not tasks:
+        return
+
+    operation = "save_page_metadata_batch"
+    rows, new_url_ids = [], {}
+    try:
+        with (
+            DB_WRITER_INSERT_LATENCY_SECONDS.labels(operation=operation).time(),
+            get_db(session_factory=session_factory) as db,
+        ):
+            new_tasks = _claim_new_tasks(db, tasks, operation)
+            schedule = _recrawl_schedule(db, new_tasks, RECRAWL_POLICY) if RECRAWL_POLICY and new_tasks else None
+            rows = _page_metadata_rows(new_tasks, schedule)
+            if rows:
+                new_url_ids = _attach_url_ids(db, rows, PAGE_URL_ID_COLUMNS)
+                db.execute(PAGE_METADATA_BATCH_UPSERT, rows)
+
+        URL_ID_CACHE.put_many(new_url_ids)
+        DB_WRITER_INSERT_SUCCESS_TOTAL.labels(operation=operation).inc()
+        logger.info("Upserted metadata for %d pages from %d messages", len(rows), len(tasks))
+
+    except Exception:
+        DB_WRITER_INSERT_FAILURE_TOTAL.labels(operation=operation).inc()
+        raise
+
+
+def save_processed_links_batch(tasks: list[SaveProcessedLinks], logger: logging.Logger, session_factory=None) -> None:
+    """
+    Upsert the links of a batch of parsed pages with one multi-row statement
+
+    A (source_page_url, url) pair repeated across the batch keeps its last occurrence,
+    since Postgres rejects an ON CONFLICT DO UPDATE that touches the same row twice.
+
+    Args:
+        tasks (List[SaveProcessedLinks]): Processed links messages, in delivery order
+        logger (logging.Logger): Logger instance
+        session_factory (optional): Optional SQLAlchemy session factory override
+
+    Raises:
+        Exception: Any database error, after the transaction has been rolled back
+    """
+    rows = {}
+    for task in tasks:
+        for link in task.links:
+            rows[(link.source_page_url, link.url)] = _processed_link_row(link)
+
+    if not rows:
+        logger.warning("No links to insert")
+        return
+
+    operation = "save_processed_links_batch"
+    try:
+        with (
+            DB_WRITER_INSERT_LATENCY_SECONDS.labels(operation=operation).time(),
+            get_db(session_factory=session_factory) as db,
+        ):
+            new_url_ids = _attach_url_ids(db, rows.values(), LINK_URL_ID_COLUMNS)
+            db.execute(_processed_links_upsert(list(rows.values())))
+
+        URL_ID_CACHE.put_many(new_url_ids)
+        DB_WRITER_INSERT_SUCCESS_TOTAL.labels(operation=operation).inc()
+        logger.info("Bulk upserted %d links from %d pages into the Link table", len(rows), len(tasks))
+
+    except Exception:
+        DB_WRITER_INSERT_FAILURE_TOTAL.labels(operation=operation).inc()
+        raise
+
+
+def save_processed_links_copy(tasks: list[SaveProcessedLinks], logger: logging.Logger, session_factory=None) -> None:
+    """
+    Bulk load the links of a batch of parsed pages through PostgreSQL COPY
+
+    Alternative to `save_processed_links_batch` for large batches: rows are streamed
+    with `COPY ... FROM STDIN` into a staging table, then merged into `links` with one
+    set-based INSERT ... SELECT ... ON CONFLICT. This skips SQLAlchemy statement
+    compilation and per-value parameter binding entirely.
+
+    The staging table is a session-local temporary table (never WAL-logged, private to
+    the connection, emptied on commit), so concurrent db_writer replicas never see each
+    other's rows.
+
+    Args:
+        tasks (List[SaveProcessedLinks]): Processed links messages, in delivery order
+        logger (logging.Logger): Logger instance
+        session_factory (optional): Optional SQLAlchemy session factory override
+
+    Raises:
+        Exception: Any database error, after the transaction has been rolled back
+    """
+    rows = {}
+    for task in tasks:
+        for link in task.links:
+            rows[(link.source_page_url, link.url)] = _processed_link_row(link)
+
+    if not rows:
+        logger.warning("No links to insert")
+        return
+
+    operation = "save_processed_links_copy"
+    try:
+        with (
+            DB_WRITER_INSERT_LATENCY_SECONDS.labels(operation=operation).time(),
+            get_db(session_factory=session_factory) as db,
+        ):
+            connection = db.connection()
+            # Not cached per connection: a rolled back transaction also rolls back the CREATE
+            connection.execute(text(_CREATE_LINKS_STAGING_SQL))
+            new_url_ids = _attach_url_ids(db, rows.values(), LINK_URL_ID_COLUMNS)
+
+            buffer = io.StringIO()
+            for row in rows.values():
+                buffer.write(_copy_text_row(row[column] for column in _LINKS_COPY_COLUMNS))
+            buffer.seek(0)
+
+            cursor = connection.connection.cursor()
+            try:
+                cursor.copy_expert(_COPY_LINKS_STAGING_SQL, buffer)
+            finally:
+                cursor.close()
+
+            connection.execute(text(_MERGE_LINKS_STAGING_SQL))
+
+        URL_ID_CACHE.put_many(new_url_ids)
+        DB_WRITER_INSERT_SUCCESS_TOTAL.labels(operation=operation).inc()
+        logger.info("COPY loaded %d links from %d pages into the Link table", len(rows), len(tasks))
+
+    except Exception:
+        DB_WRITER_INSERT_FAILURE_TOTAL.labels(operation=operation).inc()
+        raise
+
+
+def save_parsed_data_batch(tasks: list[SaveParsedContent], logger: logging.Logger, session_factory=None) -> None:
+    """
+    Save the parsed content and categories of a batch of pages in a single transaction
+
+    A page repeated in the batch keeps its last delivered content. See `_write_parsed_data`.
+
+    Args:
+        tasks (List[SaveParsedContent]): Parsed content messages, in delivery order
+        logger (logging.Logger): Logger instance
+        session_factory (optional): Optional SQLAlchemy session factory override
+
+    Raises:
+        Exception: Any database error, after the transaction has been rolled back
+    """
+    operation = "save_parsed_data_batch"
+    try:
+        with (
+            DB_WRITER_INSERT_LATENCY_SECONDS.labels(operation=operation).time(),
+            get_db(session_factory=session_factory) as db,
+        ):
+            new_category_ids = _write_parsed_data(db, tasks)
+
+        CATEGORY_ID_CACHE.put_many(new_category_ids)
+        DB_WRITER_INSERT_SUCCESS_TOTAL.labels(operation=operation).inc()
+        logger.info("Parsed content saved for %d pages", len(tasks))
+
+    except Exception:
+        DB_WRITER_INSERT_FAILURE_TOTAL.labels(operation=operation).inc()
+        raise
+
+
+def add_links_to_schedule_batch(tasks: list[SaveLinksToSchedule], logger: logging.Logger, session_factory=None) -> None:
+    """
+    Schedule the links of a batch of messages with one multi-row upsert
+
+    A URL repeated across the batch is written once, keeping its highest-priority entry.
+    The messages' `priority_updates` are applied the same way as in `add_links_to_schedule`.
+
+    Args:
+        tasks (List[SaveLinksToSchedule]): Links to schedule messages, in delivery order
+        logger (logging.Logger): Logger instance
+        session_factory (optional): Optional SQLAlchemy session factory override
+
+    Raises:
+        Exception: Any database error, after the transaction has been rolled back
+    """
+    rows = {}
+    for task in tasks:
+        for link in task.links:
+            existing = rows.get(link.url)
+            if existing is None or link.priority > existing['priority']:
+                rows[link.url] = _scheduled_link_row(link)
+    updates = _priority_updates(tasks)
+
+    if not rows and not updates:
+        logger.warning('Skipped scheduling links into the DB: no values received')
+        return
+
+    operation = "add_links_to_schedule_batch"
+    try:
+        with (
+            DB_WRITER_INSERT_LATENCY_SECONDS.labels(operation=operation).time(),
+            get_db(session_factory=session_factory) as db,
+        ):
+            new_url_ids = {}
+            if rows:
+                new_url_ids = _attach_url_ids(db, rows.values(), SCHEDULED_LINK_URL_ID_COLUMNS)
+                db.execute(_scheduled_links_upsert(list(rows.values())))
+            raised = _raise_scheduled_priorities(db, updates)
+
+        URL_ID_CACHE.put_many(new_url_ids)
+        DB_WRITER_INSERT_SUCCESS_TOTAL.labels(operation=operation).inc()
+        logger.info(
+            "Bulk inserted %d links from %d messages into schedule table (%d priorities raised)",
+            len(rows), len(tasks), raised
+        )
+
+    except Exception:
+        DB_WRITER_INSERT_FAILURE_TOTAL.labels(operation=operation).inc()
+        raise
+
+
+# ---------------------------------------------------------------------------
+# Statement builders shared by the single-message and batch writers
+# ---------------------------------------------------------------------------
+
+def _page_metadata_upsert(page_metadata: SavePageMetadataTask, url_id: int, schedule: dict | None = None):
+    """
+    Build the INSERT ... ON CONFLICT (url) DO UPDATE statement for one page's crawl metadata
+
+    `schedule` (from `_recrawl_schedule`) overrides the crawler's next crawl time and
+    carries the page's change history
+    """
+    stmt = insert(Page).values(
+        url=page_metadata.url,
+        url_id=url_id,
+        last_crawl_status=page_metadata.status.value,
+        http_status_code=page_metadata.http_status_code,
+        url_hash=page_metadata.url_hash,
+        html_content_hash=page_metadata.html_content_hash,
+        compressed_filepath=page_metadata.compressed_filepath,
+        last_crawled_at=page_metadata.fetched_at,
+        total_crawl_attempts=1,
+        failed_crawl_attempts=0,
+        last_error_seen=page_metadata.error_message,
+        **{'next_crawl_at': page_metadata.next_crawl, **(schedule or {})}
+    )
+
+    # INSERT or UPDATE (aka Upsert)
+    return stmt.on_conflict_do_update(
+        # Assumes `url` has a UNIQUE constraint
+        index_elements=['url'],
+        set_={
+            'url_id': stmt.excluded.url_id,
+            'last_crawl_status': stmt.excluded.last_crawl_status,
+            'http_status_code': stmt.excluded.http_status_code,
+            'html_content_hash': stmt.excluded.html_content_hash,
+            'last_crawled_at': stmt.excluded.last_crawled_at,
+            'next_crawl_at': stmt.excluded.next_crawl_at,
+            'last_error_seen': stmt.excluded.last_error_seen,
+            'total_crawl_attempts': Page.total_crawl_attempts + 1,
+            'failed_crawl_attempts': case(
+                (
+                    stmt.excluded.last_crawl_status.in_(
+                        [CrawlStatus.FAILED.value, CrawlStatus.SKIPPED.value]),
+                    Page.failed_crawl_attempts + 1
+                ),
+                else_=Page.failed_crawl_attempts
+            ),
+            **_change_history_set(stmt)
+        }
+    )
+
+
+def _change_history_set(stmt) -> dict:
+    """
+    SET clauses of the change history columns, which keep the stored values unless the
+    row carries new ones (rows written without a recrawl policy leave them NULL)
+    """
+    return {
+        column: func.coalesce(getattr(stmt.excluded, column), getattr(Page, column))
+        for column in CHANGE_HISTORY_COLUMNS
+    }
+
+
+def _build_page_metadata_batch_upsert():
+    """
+    Build the parameterless upsert used by `save_page_metadata_batch`
+
+    Attempt counters in each row are per-batch totals, so they are added to the
+    stored counters instead of incrementing them by one.
+    """
+    stmt = insert(Page)
+    return stmt.on_conflict_do_update(
+        index_elements=['url'],
+        set_={
+            'url_id': stmt.excluded.url_id,
+            'last_crawl_status': stmt.excluded.last_crawl_status,
+            'http_status_code': stmt.excluded.http_status_code,
+            'html_content_hash': stmt.excluded.html_content_hash,
+            'last_crawled_at': stmt.excluded.last_crawled_at,
+            'next_crawl_at': stmt.excluded.next_crawl_at,
+            'last_error_seen': stmt.excluded.last_error_seen,
+            'total_crawl_attempts': Page.total_crawl_attempts + stmt.excluded.total_crawl_attempts,
+            'failed_crawl_attempts': Page.failed_crawl_attempts + stmt.excluded.failed_crawl_attempts,
+            **_change_history_set(stmt)
+        }
+    )
+
+
+CHANGE_HISTORY_COLUMNS = ('change_checks', 'changes_detected', 'change_observed_seconds', 'recrawl_interval_seconds')
+
+# Built once so every batch hits SQLAlchemy's compiled statement cache
+PAGE_METADATA_BATCH_UPSERT = _build_page_metadata_batch_upsert()
+
+_FAILED_CRAWL_STATUSES = (CrawlStatus.FAILED, CrawlStatus.SKIPPED)
+
+# Adaptive recrawl intervals, set by `configure_recrawl_policy`. None keeps the
+# crawler's fixed recrawl interval for every page
+RECRAWL_POLICY: RecrawlPolicy | None = None
+
+# Locked so concurrent writers of the same page fold its crawls in one at a time
+_SELECT_PAGE_HISTORY_SQL = text("""
+    SELECT url, html_content_hash, last_crawled_at,
+           change_checks, changes_detected, change_observed_seconds, recrawl_interval_seconds
+    FROM pages
+    WHERE url = ANY(CAST(:urls AS VARCHAR[]))
+    ORDER BY url
+    FOR UPDATE
+""")
+
+
+def configure_recrawl_policy(configs: dict[str, Any] | None) -> RecrawlPolicy | None:
+    """
+    Sets the recrawl policy from the db_writer's `recrawl_policy` config section, or
+    removes it when the section is missing or not enabled
+
+    Should be called once at startup, before messages are consumed.
+    """
+    global RECRAWL_POLICY
+    section = (configs or {}).get('recrawl_policy') or {}
+    RECRAWL_POLICY = RecrawlPolicy.from_configs(section) if section.get('enabled', False) else None
+    return RECRAWL_POLICY
+
+
+def _recrawl_schedule(db: Session, tasks: list[SavePageMetadataTask], policy: RecrawlPolicy) -> dict[str, dict]:
+    """
+    Folds each successful crawl into its page's change history and picks the page's
+    next crawl time from it
+
+    A crawl is compared with the page's previous one when both stored a content hash.
+    Crawls of the same page within `tasks` are folded in delivery order. Failed crawls
+    keep the crawler's next crawl time and leave the history as it is.
+
+    Returns:
+        Dict[str, dict]: `next_crawl_at` and the change history columns, per URL
+    """
+    pages = {}
+    for url, content_hash, crawled_at, checks, changes, observed, interval in db.execute(
+        _SELECT_PAGE_HISTORY_SQL, {'urls': sorted({task.url for task in tasks})}
+    ):
+        history = ChangeHistory(checks, changes, observed) if checks is not None else None
+        pages[url] = (content_hash, crawled_at, history, interval)
+
+    schedule = {}
+    for task in tasks:
+        content_hash, crawled_at, history, interval = pages.get(task.url, (None, None, None, None))
+        fetched_at = datetime.fromisoformat(task.fetched_at)
+        next_crawl_at = task.next_crawl
+
+        if task.status not in _FAILED_CRAWL_STATUSES and task.html_content_hash and task.next_crawl:
+            if content_hash is not None and crawled_at is not None:
+                changed = task.html_content_hash != content_hash
+                elapsed = (fetched_at - crawled_at).total_seconds()
+                history = policy.record(history or ChangeHistory(), changed, elapsed)
+                DB_WRITER_PAGE_CHANGE_CHECKS_TOTAL.labels(changed=str(changed).lower()).inc()
+
+            # The crawler's fixed interval seeds pages crawled for the first time
+            default_interval = (datetime.fromisoformat(task.next_crawl) - fetched_at).total_seconds()
+            interval = policy.next_interval(history, interval or default_interval)
+            next_crawl_at = (fetched_at + timedelta(seconds=interval)).isoformat()
+            DB_WRITER_RECRAWL_INTERVAL_SECONDS.observe(interval)
+
+        # The upsert stores no hash for a failed crawl, so the next one isn't compared
+        pages[task.url] = (task.html_content_hash, fetched_at, history, interval)
+        schedule[task.url] = {
+            'next_crawl_at': next_crawl_at,
+            'change_checks': history.checks if history else None,
+            'changes_detected': history.changes if history else None,
+            'change_observed_seconds': history.observed_seconds if history else None,
+            'recrawl_interval_seconds': interval,
+        }
+
+    return schedule
+
+
+def _claim_new_tasks(db: Session, tasks: list[SavePageMetadataTask], operation: str) -> list[SavePageMetadataTask]:
+    """
+    Drops tasks whose idempotency key was already applied, or repeats within `tasks`
+
+    The surviving keys are claimed in the caller's transaction, so they only count as
+    applied if the write commits. Tasks without a key (older producers) are kept.
+    """
+    claimed = claim_keys(db, [task.idempotency_key for task in tasks if task.idempotency_key])
+
+    new_tasks = []
+    for task in tasks:
+        if task.idempotency_key is None:
+            new_tasks.append(task)
+        elif task.idempotency_key in claimed:
+            claimed.discard(task.idempotency_key)
+            new_tasks.append(task)
+
+    skipped = len(tasks) - len(new_tasks)
+    if skipped:
+        DB_WRITER_DUPLICATES_SKIPPED_TOTAL.labels(operation=operation).inc(skipped)
+    return new_tasks
+
+
+def _page_metadata_rows(tasks: list[SavePageMetadataTask], schedule: dict[str, dict] | None = None) -> list[dict]:
+    """
+    Collapse a batch of page metadata tasks into one row per URL
+
+    The last task for a URL provides the row's values, and the attempt counters
+    count every task for that URL in the batch. `schedule` (from `_recrawl_schedule`)
+    overrides the next crawl times and adds the change history columns.
+    """
+    rows = {}
+    for task in tasks:
+        previous = rows.get(task.url)
+        rows[task.url] = {
+            'url': task.url,
+            'last_crawl_status': task.status.value,
+            'http_status_code': task.http_status_code,
+            'url_hash': task.url_hash,
+            'html_content_hash': task.html_content_hash,
+            'compressed_filepath': task.compressed_filepath,
+            'last_crawled_at': task.fetched_at,
+            'next_crawl_at': task.next_crawl,
+            'last_error_seen': task.error_message,
+            'total_crawl_attempts': (previous['total_crawl_attempts'] if previous else 0) + 1,
+            'failed_crawl_attempts': (
+                (previous['failed_crawl_attempts'] if previous else 0)
+                + (1 if task.status in _FAILED_CRAWL_STATUSES else 0)
+            ),
+        }
+
+    if schedule:
+        for url, row in rows.items():
+            row.update(schedule[url])
+
+    return list(rows.values())
+
+
+def _processed_link_row(link) -> dict:
+    return {
+        'source_page_url': link.source_page_url,
+        'url': link.url,
+        'depth': link.depth,
+        'discovered_at': datetime.fromisoformat(link.discovered_at),
+        'is_internal': link.is_internal,
+        'anchor_text': link.anchor_text,
+        'title_attribute': link.title_attribute,
+        'rel_attribute': link.rel_attribute,
+        'id_attribute': link.id_attribute,
+        'link_type': link.link_type,
+    }
+
+
+def _processed_links_upsert(values: list[dict]):
+    stmt = insert(Link).values(values)
+    return stmt.on_conflict_do_update(
+        index_elements=['source_page_url', 'url'],
+        set_={
+            'source_url_id': stmt.excluded.source_url_id,
+            'target_url_id': stmt.excluded.target_url_id,
+            'anchor_text': stmt.excluded.anchor_text,
+            'title_attribute': stmt.excluded.title_attribute,
+            'rel_attribute': stmt.excluded.rel_attribute,
+            'id_attribute': stmt.excluded.id_attribute,
+            'link_type': stmt.excluded.link_type,
+        }
+    )
+
+
+def _scheduled_link_row(link) -> dict:
+    return {
+        "url": link.url,
+        "scheduled_at": link.scheduled_at,
+        'depth': link.depth,
+        'priority': link.priority
+    }
+
+
+def _scheduled_links_upsert(values: list[dict]):
+    stmt = insert(ScheduledLinks).values(values)
+
+    # Partitioned scheduled_links has no UNIQUE (url) to conflict on; the Scheduler's
+    # seen-set already keeps a URL from being scheduled twice
+    if PARTITIONING_ENABLED:
+        return stmt.on_conflict_do_nothing()
+
+    return stmt.on_conflict_do_update(
+        index_elements=['url'],
+        set_={'priority': func.greatest(ScheduledLinks.priority, stmt.excluded.priority)}
+    )
+
+
+# Only touches URLs still queued, so a URL that was already popped isn't scheduled again
+_RAISE_SCHEDULED_PRIORITIES_SQL = text("""
+    UPDATE scheduled_links AS s
+    SET priority = u.priority
+    FROM unnest(CAST(:urls AS VARCHAR[]), CAST(:priorities AS DOUBLE PRECISION[])) AS u(url, priority)
+    WHERE s.url = u.url AND s.priority < u.priority
+""")
+
+
+def _priority_updates(tasks: list[SaveLinksToSchedule]) -> dict[str, float]:
+    """
+    Highest priority update per URL across messages
+    """
+    updates = {}
+    for task in tasks:
+        for update in task.priority_updates:
+            if update.priority > updates.get(update.url, float('-inf')):
+                updates[update.url] = update.priority
+    return updates
+
+
+def _raise_scheduled_priorities(db: Session, updates: dict[str, float]) -> int:
+    """
+    Raises the priority of queued links to the given values, returning how many rose
+    """
+    if not updates:
+        return 0
+
+    urls = sorted(updates)
+    result = db.execute(
+        _RAISE_SCHEDULED_PRIORITIES_SQL, {'urls': urls, 'priorities': [updates[url] for url in urls]}
+    )
+    return result.rowcount
+
+
+_LINKS_STAGING_TABLE = "links_staging"
+
+_LINKS_COPY_COLUMNS = (
+    'source_page_url', 'url', 'source_url_id', 'target_url_id', 'depth', 'discovered_at', 'is_internal', 'anchor_text',
+    'title_attribute', 'rel_attribute', 'id_attribute', 'link_type',
+)
+
+# ON COMMIT DELETE ROWS empties the table at the end of every transaction, so the
+# same staging table is reused for the lifetime of the pooled connection
+_CREATE_LINKS_STAGING_SQL = f"""
+    CREATE TEMPORARY TABLE IF NOT EXISTS {_LINKS_STAGING_TABLE} (
+        source_page_url TEXT NOT NULL,
+        url TEXT NOT NULL,
+        source_url_id BIGINT NOT NULL,
+        target_url_id BIGINT NOT NULL,
+        depth INTEGER NOT NULL,
+        discovered_at TIMESTAMPTZ NOT NULL,
+        is_internal BOOLEAN NOT NULL,
+        anchor_text TEXT,
+        title_attribute TEXT,
+        rel_attribute TEXT,
+        id_attribute TEXT,
+        link_type TEXT
+    ) ON COMMIT DELETE ROWS
+"""
+
+_COPY_LINKS_STAGING_SQL = (
+    f"COPY {_LINKS_STAGING_TABLE} ({', '.join(_LINKS_COPY_COLUMNS)}) FROM STDIN"
+)
+
+_MERGE_LINKS_STAGING_SQL = f"""
+    INSERT INTO links ({', '.join(_LINKS_COPY_COLUMNS)})
+    SELECT {', '.join(_LINKS_COPY_COLUMNS)} FROM {_LINKS_STAGING_TABLE}
+    ON CONFLICT (source_page_url, url) DO UPDATE SET
+        source_url_id = EXCLUDED.source_url_id,
+        target_url_id = EXCLUDED.target_url_id,
+        anchor_text = EXCLUDED.anchor_text,
+        title_attribute = EXCLUDED.title_attribute,
+        rel_attribute = EXCLUDED.rel_attribute,
+        id_attribute = EXCLUDED.id_attribute,
+        link_type = EXCLUDED.link_type
+"""
+
+
+def _copy_text_row(values) -> str:
+    """
+    Format one row for COPY's default text format (tab separated, \\N for NULL)
+    """
+    fields = []
+    for value in values:
+        if value is None:
+            fields.append("\\N")
+        elif isinstance(value, bool):
+            fields.append("t" if value else "f")
+        else:
+            fields.append(
+                str(value)
+                .replace("\\", "\\\\")
+                .replace("\t", "\\t")
+                .replace("\n", "\\n")
+                .replace("\r", "\\r")
+            )
+    return "\t".join(fields) + "\n"
+
+
+def _build_page_content_upsert():
+    stmt = insert(PageContent)
+    return stmt.on_conflict_do_update(
+        index_elements=['source_page_url'],
+        set_={
+            'title': stmt.excluded.title,
+            'text_content': stmt.excluded.text_content,
+            'text_content_hash': stmt.excluded.text_content_hash,
+            'parsed_at': stmt.excluded.parsed_at,
+        }
+    ).returning(PageContent.id, PageContent.source_page_url)
+
+
+PAGE_CONTENT_UPSERT = _build_page_content_upsert()
+
+
+def _build_text_content_upsert():
+    stmt = insert(TextContent)
+    return stmt.on_conflict_do_update(
+        index_elements=['content_hash'],
+        set_={'ref_count': TextContent.ref_count + stmt.excluded.ref_count}
+    )
+
+
+TEXT_CONTENT_UPSERT = _build_text_content_upsert()
+
+_SELECT_PREVIOUS_TEXT_SQL = text("""
+    SELECT source_page_url, text_content_hash, text_content IS NOT NULL, title
+    FROM page_content
+    WHERE source_page_url = ANY(CAST(:urls AS VARCHAR[]))
+    FOR UPDATE
+""")
+
+# Rows whose references drop to zero are deleted, the rest are decremented. The two
+# conditions are disjoint, so no row is modified twice by the statement
+_RELEASE_TEXT_CONTENTS_SQL = text("""
+    WITH released AS (
+        SELECT * FROM unnest(CAST(:content_hashes AS VARCHAR[]), CAST(:counts AS INTEGER[]))
+            AS r(content_hash, count)
+    ),
+    deleted AS (
+        DELETE FROM text_contents t
+        USING released r
+        WHERE t.content_hash = r.content_hash AND t.ref_count <= r.count
+    )
+    UPDATE text_contents t
+    SET ref_count = t.ref_count - r.count
+    FROM released r
+    WHERE t.content_hash = r.content_hash AND t.ref_count > r.count
+""")
+
+CATEGORY_ID_CACHE = IdCache()
+
+# Sorted input keeps concurrent writers locking new names in the same order
+_INSERT_CATEGORIES_SQL = text("""
+    INSERT INTO categories (name)
+    SELECT name FROM unnest(CAST(:names AS VARCHAR[])) AS name ORDER BY name
+    ON CONFLICT (name) DO NOTHING
+    RETURNING id, name
+""")
+
+# Names that conflicted above were created by someone else
+_SELECT_CATEGORIES_SQL = text("""
+    SELECT id, name FROM categories WHERE name = ANY(CAST(:names AS VARCHAR[]))
+""")
+
+# Makes page_categories for the given pages match exactly the wanted (page, category) pairs
+_SYNC_PAGE_CATEGORIES_SQL = text("""
+    WITH wanted AS (
+        SELECT * FROM unnest(CAST(:page_ids AS BIGINT[]), CAST(:category_ids AS INTEGER[]))
+            AS w(page_url, category_id)
+    ),
+    removed AS (
+        DELETE FROM page_categories pc
+        WHERE pc.page_url = ANY(CAST(:all_page_ids AS BIGINT[]))
+          AND NOT EXISTS (
+              SELECT 1 FROM wanted w
+              WHERE w.page_url = pc.page_url AND w.category_id = pc.category_id
+          )
+    )
+    INSERT INTO page_categories (page_url, category_id)
+    SELECT page_url, category_id FROM wanted
+    ON CONFLICT DO NOTHING
+""")
+
+
+def _write_parsed_data(db: Session, tasks: list[SaveParsedContent]) -> dict[str, int]:
+    """
+    Upsert PageContent rows and sync their categories with set-based statements
+
+    Runs one upsert for the pages, moves changed texts into the `text_contents` store
+    (see `_sync_text_contents`), resolves categories through CATEGORY_ID_CACHE (hitting
+    the database only for names it hasn't seen) and then one statement that inserts
+    missing and deletes stale `page_categories` rows. Pages whose title or text changed
+    are reindexed for full-text search last.
+
+    Returns:
+        dict[str, int]: Category IDs read from the database, to be cached once the transaction commits
+    """
+    pages = {task.source_page_url: task for task in tasks}
+    if not pages:
+        return {}
+
+    content_hashes = {url: _text_content_hash(page) for url, page in pages.items()}
+
+    # Read (and lock) what the pages referenced before this write
+    previous, previous_titles = {}, {}
+    for source_page_url, text_content_hash, has_inline_text, title in db.execute(
+        _SELECT_PREVIOUS_TEXT_SQL, {'urls': list(pages)}
+    ):
+        previous[source_page_url] = (text_content_hash, has_inline_text)
+        previous_titles[source_page_url] = title
+
+    rows = [
+        {
+            'source_page_url': page.source_page_url,
+            'title': page.title,
+            # The text itself lives in text_contents
+            'text_content': None,
+            'text_content_hash': content_hashes[url],
+            'parsed_at': page.parsed_at,
+        }
+        for url, page in pages.items()
+    ]
+    page_ids = {
+        source_page_url: page_id
+        for page_id, source_page_url in db.execute(PAGE_CONTENT_UPSERT, rows)
+    }
+
+    _sync_text_contents(db, pages, content_hashes, previous)
+
+    names = {name for page in pages.values() for name in (page.categories or [])}
+    category_ids, missing = CATEGORY_ID_CACHE.get_many(names)
+    fetched = _fetch_category_ids(db, missing)
+    category_ids.update(fetched)
+
+    wanted_pages, wanted_categories = [], []
+    for source_page_url, page in pages.items():
+        for category_id in {category_ids[name] for name in (page.categories or [])}:
+            wanted_pages.append(page_ids[source_page_url])
+            wanted_categories.append(category_id)
+
+    db.execute(_SYNC_PAGE_CATEGORIES_SQL, {
+        'page_ids': wanted_pages,
+        'category_ids': wanted_categories,
+        'all_page_ids': list(page_ids.values()),
+    })
+
+    # New pages, and pages whose text, title or storage (inline legacy text) changed
+    reindexed = [
+        (url, page.title, page.text_content)
+        for url, page in pages.items()
+        if url not in previous
+        or previous[url] != (content_hashes[url], False)
+        or previous_titles[url] != page.title
+    ]
+    if reindexed:
+        db.execute(UPDATE_SEARCH_VECTORS_SQL, search_vector_params(reindexed))
+
+    return fetched
+
+
+def _text_content_hash(page: SaveParsedContent):
+    if page.text_content is None:
+        return None
+    return page.text_content_hash or create_hash(page.text_content)
+
+
+def _sync_text_contents(
+    db: Session,
+    pages: dict[str, SaveParsedContent],
+    content_hashes: dict[str, str],
+    previous: dict[str, tuple]
+) -> None:
+    """
+    Apply the reference count changes caused by pages switching text
+
+    A page whose text is unchanged costs nothing here. A changed text is compressed and
+    upserted (adding its references), and the text it replaced loses a reference and is
+    deleted once nothing references it. A legacy row that still holds its text inline
+    only adds a reference, since its old text was never in the store.
+
+    Every upsert carries the compressed text, so it is also safe when a concurrent
+    writer deletes the same hash in between.
+    """
+    deltas = Counter()
+    texts = {}
+    for url, page in pages.items():
+        new_hash = content_hashes[url]
+        old_hash, has_inline_text = previous.get(url, (None, False))
+
+        if new_hash == old_hash and not has_inline_text:
+            continue
+        if new_hash is not None:
+            deltas[new_hash] += 1
+            texts[new_hash] = page.text_content
+        if old_hash is not None and not has_inline_text:
+            deltas[old_hash] -= 1
+
+    added = [
+        {
+            'content_hash': content_hash,
+            'compressed_text': compress_text(texts[content_hash]),
+            'compression': COMPRESSION_ZSTD,
+            'original_size': len(texts[content_hash].encode('utf-8')),
+            'ref_count': delta,
+        }
+        for content_hash, delta in sorted(deltas.items()) if delta > 0
+    ]
+    released = {content_hash: -delta for content_hash, delta in sorted(deltas.items()) if delta < 0}
+
+    if added:
+        db.execute(TEXT_CONTENT_UPSERT, added)
+    if released:
+        db.execute(_RELEASE_TEXT_CONTENTS_SQL, {
+            'content_hashes': list(released),
+            'counts': list(released.values()),
+        })
+
+
+def _fetch_category_ids(db: Session, names: list[str]) -> dict[str, int]:
+    """
+    Return the IDs of the given category names, creating the ones that don't exist yet
+    """
+    if not names:
+        return {}
+
+    names = sorted(names)
+    ids_by_name = {
+        name: category_id
+        for category_id, name in db.execute(_INSERT_CATEGORIES_SQL, {'names': names})
+    }
+
+    existing = [name for name in names if name not in ids_by_name]
+    if existing:
+        ids_by_name.update(
+            (name, category_id)
+            for category_id, name in db.execute(_SELECT_CATEGORIES_SQL, {'names': existing})
+        )
+
+    return ids_by_name
+
+
+URL_ID_CACHE = IdCache(maxsize=500_000)
+
+# ID column -> URL column, per table
+PAGE_URL_ID_COLUMNS = {'url_id': 'url'}
+LINK_URL_ID_COLUMNS = {'source_url_id': 'source_page_url', 'target_url_id': 'url'}
+SCHEDULED_LINK_URL_ID_COLUMNS = {'url_id': 'url'}
+
+# Sorted by hash so concurrent writers lock new URLs in the same order
+_INSERT_URLS_SQL = text("""
+    INSERT INTO urls (url, url_hash)
+    SELECT url, url_hash
+    FROM unnest(CAST(:urls AS VARCHAR[]), CAST(:url_hashes AS VARCHAR[])) AS u(url, url_hash)
+    ORDER BY url_hash
+    ON CONFLICT (url_hash) DO NOTHING
+    RETURNING id, url
+""")
+
+_SELECT_URLS_SQL = text("""
+    SELECT id, url FROM urls WHERE url_hash = ANY(CAST(:url_hashes AS VARCHAR[]))
+""")
+
+
+def _attach_url_ids(db: Session, rows: Iterable[dict], id_columns: dict[str, str]) -> dict[str, int]:
+    """
+    Intern every URL in `rows` and set the matching ID columns in place
 
     Args:
         db (Session): SQLAlchemy database session
-        category_names (List[str]): List of category names to ensure in the database
+        rows (Iterable[dict]): Rows about to be written
+        id_columns (dict[str, str]): ID column -> URL column, e.g. LINK_URL_ID_COLUMNS
 
     Returns:
-        List[Category]: Combined list of existing and newly created Category objects
+        dict[str, int]: URL IDs read from the database, to be cached once the transaction commits
     """
-    existing_categories = db.query(Category).filter(
-        Category.name.in_(category_names)
-    ).all()
+    rows = list(rows)
+    url_ids, fetched = _resolve_url_ids(
+        db, {row[url_column] for row in rows for url_column in id_columns.values()}
+    )
 
-    existing_names = {category.name for category in existing_categories}
-    new_names = set(category_names) - existing_names
+    for row in rows:
+        for id_column, url_column in id_columns.items():
+            row[id_column] = url_ids[row[url_column]]
+
+    return fetched
+
+
+def _resolve_url_ids(db: Session, urls: Iterable[str]) -> tuple[dict[str, int], dict[str, int]]:
+    """
+    Map URLs to their `urls.id` through URL_ID_CACHE, interning the ones never seen before
+
+    Returns:
+        Tuple[dict[str, int], dict[str, int]]: ID of every URL, and the IDs read from the
+                                               database (to cache once the transaction commits)
+    """
+    url_ids, missing = URL_ID_CACHE.get_many(set(urls))
+    fetched = _fetch_url_ids(db, missing)
+    url_ids.update(fetched)
+    return url_ids, fetched
+
+
+def _fetch_url_ids(db: Session, urls: list[str]) -> dict[str, int]:
+    """
+    Return the IDs of the given URLs, inserting the ones that aren't in `urls` yet
+    """
+    if not urls:
+        return {}
 
-    new_categories = [Category(name=name) for name in new_names]
-    db.add_all(new_categories)
+    url_hashes = [create_hash(url) for url in urls]
+    ids_by_url = {
+        url: url_id
+        for url_id, url in db.execute(_INSERT_URLS_SQL, {'urls': urls, 'url_hashes': url_hashes})
+    }
 
-    # to get IDs for new categories
-    db.flush()
+    existing = [url_hash for url, url_hash in zip(urls, url_hashes) if url not in ids_by_url]
+    if existing:
+        ids_by_url.update(
+            (url, url_id)
+            for url_id, url in db.execute(_SELECT_URLS_SQL, {'url_hashes': existing})
+        )
 
-    return existing_categories + new_categories
+    return ids_by_url
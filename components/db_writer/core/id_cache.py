@@ -0,0 +1,56 @@
+from collections import OrderedDict
+from collections.abc import Iterable
+from threading import Lock
+
+
+class IdCache:
+    """
+    In-process LRU map of a natural key -> surrogate ID (e.g. category name -> `categories.id`,
+    URL -> `urls.id`)
+
+    Category names and link targets repeat heavily across Wikipedia articles, so most
+    keys resolve without touching the database.
+
+    Only IDs from committed transactions may be added (see `put_many`); an ID read
+    inside a transaction that later rolls back may not exist.
+
+    Args:
+        maxsize (int): Maximum number of keys kept before the least recently used are evicted
+    """
+
+    def __init__(self, maxsize: int = 50_000):
+        self._maxsize = maxsize
+        self._ids: OrderedDict[str, int] = OrderedDict()
+        self._lock = Lock()
+
+    def get_many(self, keys: Iterable[str]) -> tuple[dict[str, int], list[str]]:
+        """
+        Looks up keys in the cache
+
+        Returns:
+            Tuple[dict[str, int], List[str]]: IDs of the cached keys, and the keys that missed
+        """
+        found, missing = {}, []
+        with self._lock:
+            for key in keys:
+                cached_id = self._ids.get(key)
+                if cached_id is None:
+                    missing.append(key)
+                else:
+                    self._ids.move_to_end(key)
+                    found[key] = cached_id
+        return found, missing
+
+    def put_many(self, ids_by_key: dict[str, int]) -> None:
+        """
+        Adds committed key -> ID pairs, evicting the least recently used keys if full
+        """
+        with self._lock:
+            for key, cached_id in ids_by_key.items():
+                self._ids[key] = cached_id
+                self._ids.move_to_end(key)
+            while len(self._ids) > self._maxsize:
+                self._ids.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._ids)
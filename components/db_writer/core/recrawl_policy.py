@@ -0,0 +1,117 @@
+import math
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class ChangeHistory:
+    """
+    What recrawls of a page observed, as stored in `pages`
+
+    Counts are weighted: older observations are decayed by `history_decay` on every
+    new one, so the estimate follows pages whose update frequency changes over time.
+
+    Fields:
+        - checks: Recrawls whose content was compared with the previous crawl
+        - changes: Of those, the ones where the content hash differed
+        - observed_seconds: Time covered by those recrawls
+    """
+    checks: float = 0.0
+    changes: float = 0.0
+    observed_seconds: float = 0.0
+
+
+class RecrawlPolicy:
+    """
+    Chooses each page's recrawl interval from how often its content was seen to change
+
+    Changes are modelled as a Poisson process. Its rate is estimated from the checks
+    and detected changes with Cho & Garcia-Molina's estimator, which accounts for
+    several changes between two crawls showing up as one:
+
+        rate = -ln((checks - changes + 0.5) / (checks + 0.5)) / mean_interval
+
+    and the page is recrawled once it has changed with `target_change_probability`:
+
+        interval = -ln(1 - target_change_probability) / rate
+
+    A page that never changed has a rate of zero, so its interval grows by at most
+    `max_growth_factor` per crawl (exponential backoff) instead of jumping straight to
+    the upper bound. Intervals are kept within [min_interval_seconds, max_interval_seconds].
+
+    Configured by the db_writer's `recrawl_policy` section.
+    """
+
+    def __init__(
+        self,
+        min_interval_seconds: float,
+        max_interval_seconds: float,
+        target_change_probability: float = 0.5,
+        max_growth_factor: float = 2.0,
+        history_decay: float = 0.9
+    ):
+        if not 0 < min_interval_seconds <= max_interval_seconds:
+            raise ValueError("Recrawl interval bounds must satisfy 0 < min <= max")
+        if not 0 < target_change_probability < 1:
+            raise ValueError("target_change_probability must be between 0 and 1")
+        if max_growth_factor < 1:
+            raise ValueError("max_growth_factor must be at least 1")
+        if not 0 < history_decay <= 1:
+            raise ValueError("history_decay must be in (0, 1]")
+
+        self.min_interval_seconds = min_interval_seconds
+        self.max_interval_seconds = max_interval_seconds
+        self.target_change_probability = target_change_probability
+        self.max_growth_factor = max_growth_factor
+        self.history_decay = history_decay
+
+    @classmethod
+    def from_configs(cls, configs: dict[str, Any]) -> "RecrawlPolicy":
+        return cls(
+            configs['min_interval_seconds'],
+            configs['max_interval_seconds'],
+            target_change_probability=configs.get('target_change_probability', 0.5),
+            max_growth_factor=configs.get('max_growth_factor', 2.0),
+            history_decay=configs.get('history_decay', 0.9),
+        )
+
+    def record(self, history: ChangeHistory, changed: bool, elapsed_seconds: float) -> ChangeHistory:
+        """
+        Returns the history with one more recrawl, `elapsed_seconds` after the previous one
+        """
+        decay = self.history_decay
+        return ChangeHistory(
+            checks=history.checks * decay + 1,
+            changes=history.changes * decay + (1 if changed else 0),
+            observed_seconds=history.observed_seconds * decay + max(0.0, elapsed_seconds),
+        )
+
+    def change_rate(self, history: ChangeHistory) -> float | None:
+        """
+        Estimated changes per second, or None without any observation
+        """
+        if history.checks <= 0 or history.observed_seconds <= 0:
+            return None
+        mean_interval = history.observed_seconds / history.checks
+        unchanged = max(0.0, history.checks - history.changes)
+        return -math.log((unchanged + 0.5) / (history.checks + 0.5)) / mean_interval
+
+    def next_interval(self, history: ChangeHistory | None, previous_interval: float) -> float:
+        """
+        Seconds until the page should be crawled again
+
+        Args:
+            history (ChangeHistory, optional): The page's change history, None if it has none yet
+            previous_interval (float): Interval the page was last scheduled with, or the
+                default interval for a page crawled for the first time
+        """
+        rate = self.change_rate(history) if history else None
+        if rate is None:
+            interval = previous_interval
+        elif rate > 0:
+            interval = -math.log(1 - self.target_change_probability) / rate
+        else:
+            interval = math.inf
+
+        interval = min(interval, previous_interval * self.max_growth_factor)
+        return min(self.max_interval_seconds, max(self.min_interval_seconds, interval))
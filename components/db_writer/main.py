@@ -1,24 +1,44 @@
 from prometheus_client import start_http_server
+
+from components.db_writer.core.db_writer import configure_recrawl_policy
+from components.db_writer.monitoring.metrics import DB_WRITER_POOL_CHECKOUT_WAIT_SECONDS
 from components.db_writer.services.message_handler import start_db_service_listener
+from components.db_writer.services.pipelines import start_queue_pipelines
+from database.engine import configure_engine
+from shared.configs.config_loader import component_config_loader
 from shared.logging_utils import get_logger
 from shared.rabbitmq.enums.queue_names import DbWriterQueueChannels
 from shared.rabbitmq.queue_service import QueueService
 
+COMPONENT_NAME = "db_writer"
+
 
 def main():
     """
     Entrypoint for the db_writer service
     """
-    logger = get_logger("db_writer")
+    configs = component_config_loader(COMPONENT_NAME)
+    logger = get_logger(
+        configs['logging']['logger_name'], configs['logging']['log_level']
+    )
     try:
-        queue_service = QueueService(logger, DbWriterQueueChannels.get_values())
-        # TODO: add component configs during cleanup
-        # If needed put port as part of a component config ()
-        prometheus_port = 8000
+        if configure_recrawl_policy(configs):
+            logger.info("Recrawl intervals adapt to each page's change history")
+
+        # Queue pipelines open their own RabbitMQ connections and engines
+        pipelines_enabled = configs.get("pipelines", {}).get("enabled", False)
+        if not pipelines_enabled:
+            configure_engine(configs, DB_WRITER_POOL_CHECKOUT_WAIT_SECONDS.observe)
+            queue_service = QueueService(logger, DbWriterQueueChannels.get_values())
+
+        prometheus_port = configs.get("monitoring", {}).get("port", 8000)
         start_http_server(prometheus_port)
         logger.info(f"Prometheus metrics exposed on port {prometheus_port}")
 
-        start_db_service_listener(queue_service, logger)
+        if pipelines_enabled:
+            start_queue_pipelines(logger, configs)
+        else:
+            start_db_service_listener(queue_service, logger, configs)
     except Exception:
         logger.exception("Unhandled exception in db_writer service")
 
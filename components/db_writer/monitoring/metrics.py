@@ -1,4 +1,4 @@
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 
 # Counters
 DB_WRITER_MESSAGES_RECEIVED_TOTAL = Counter(
@@ -33,3 +33,62 @@ DB_WRITER_INSERT_LATENCY_SECONDS = Histogram(
     "Latency for DB insert operations in seconds",
     ["operation"]
 )
+
+
+# Micro-batching
+DB_WRITER_BATCH_MESSAGES = Histogram(
+    "db_writer_batch_messages",
+    "Number of messages written per batch flush",
+    ["queue"],
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500)
+)
+
+DB_WRITER_BATCH_FLUSHES_TOTAL = Counter(
+    "db_writer_batch_flushes_total",
+    "Batch flushes by what triggered them (size, timeout)",
+    ["queue", "trigger"]
+)
+
+DB_WRITER_BATCH_FALLBACKS_TOTAL = Counter(
+    "db_writer_batch_fallbacks_total",
+    "Failed batch writes that were retried one message at a time",
+    ["queue"]
+)
+
+
+# Idempotency
+DB_WRITER_DUPLICATES_SKIPPED_TOTAL = Counter(
+    "db_writer_duplicates_skipped_total",
+    "Messages skipped because their idempotency key was already applied",
+    ["operation"]
+)
+
+
+# Per-queue pipelines
+DB_WRITER_PIPELINE_CONSUMERS = Gauge(
+    "db_writer_pipeline_consumers",
+    "Running consumers per queue pipeline",
+    ["queue"]
+)
+
+
+# Connection pool
+DB_WRITER_POOL_CHECKOUT_WAIT_SECONDS = Histogram(
+    "db_writer_pool_checkout_wait_seconds",
+    "Time spent waiting for a database connection from the pool",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+
+
+# Adaptive recrawl intervals
+DB_WRITER_PAGE_CHANGE_CHECKS_TOTAL = Counter(
+    "db_writer_page_change_checks_total",
+    "Recrawls compared with the page's previous crawl, by whether its content changed",
+    ["changed"]
+)
+
+DB_WRITER_RECRAWL_INTERVAL_SECONDS = Histogram(
+    "db_writer_recrawl_interval_seconds",
+    "Recrawl intervals chosen by the recrawl policy",
+    buckets=(600, 1800, 3600, 4 * 3600, 12 * 3600, 86400, 3 * 86400, 7 * 86400, 14 * 86400, 30 * 86400, 90 * 86400)
+)
@@ -1,19 +1,36 @@
 import logging
+from collections.abc import Callable
 from functools import partial
+from typing import Any
+
+from pydantic import BaseModel
 
-from components.db_writer.monitoring.metrics import DB_WRITER_MESSAGE_FAILURES_TOTAL, DB_WRITER_MESSAGES_RECEIVED_TOTAL
-from shared.rabbitmq.enums.queue_names import DbWriterQueueChannels
-from shared.rabbitmq.queue_service import QueueService
 from components.db_writer.core.db_writer import (
     add_links_to_schedule,
+    add_links_to_schedule_batch,
     save_page_metadata,
+    save_page_metadata_batch,
     save_parsed_data,
-    save_processed_links)
+    save_parsed_data_batch,
+    save_processed_links,
+    save_processed_links_batch,
+    save_processed_links_copy,
+)
+from components.db_writer.monitoring.metrics import (
+    DB_WRITER_BATCH_FALLBACKS_TOTAL,
+    DB_WRITER_BATCH_FLUSHES_TOTAL,
+    DB_WRITER_BATCH_MESSAGES,
+    DB_WRITER_MESSAGE_FAILURES_TOTAL,
+    DB_WRITER_MESSAGES_RECEIVED_TOTAL,
+)
+from shared.rabbitmq.enums.queue_names import DbWriterQueueChannels
+from shared.rabbitmq.queue_service import QueueService
 from shared.rabbitmq.schemas.save_to_db import (
     SaveLinksToSchedule,
     SavePageMetadataTask,
     SaveParsedContent,
-    SaveProcessedLinks)
+    SaveProcessedLinks,
+)
 
 
 def consume_save_page_metadata(ch, method, properties, body, logger: logging.Logger):
@@ -170,14 +187,223 @@ def consume_add_links_to_schedule(ch, method, properties, body, logger: logging.
         ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
 
 
-def start_db_service_listener(queue_service: QueueService, logger: logging.Logger):
+class BatchWriteConsumer:
+    """
+    Micro-batching consumer for one db_writer queue
+
+    Buffers validated messages and writes them with a single batch write once
+    `max_messages` are buffered or `max_wait_ms` has passed since the first buffered
+    message. A successful batch is acknowledged with one `basic_ack(multiple=True)`.
+
+    If the batch write fails, every buffered message is retried on its own so a single
+    bad message only dead-letters itself. Invalid messages are rejected immediately and
+    never enter the buffer.
+
+    NOTE: Multi-acks cover every unacked delivery on the channel, so each consumer
+          must be registered on its own channel (see `QueueService.open_channel`).
+
+    Args:
+        queue_name (str): Queue this consumer reads from (used for metrics and logs)
+        schema (type[BaseModel]): Message schema to validate against
+        write_batch (Callable): Batch writer, called as `write_batch(tasks, logger)`; must raise on failure
+        queue_service (QueueService): Used to schedule the flush timer
+        batching (dict[str, Any]): `max_messages` and `max_wait_ms` for this queue
+        logger (logging.Logger): Logger instance
+    """
+
+    def __init__(
+        self,
+        queue_name: str,
+        schema: type[BaseModel],
+        write_batch: Callable[[list[BaseModel], logging.Logger], None],
+        queue_service: QueueService,
+        batching: dict[str, Any],
+        logger: logging.Logger
+    ):
+        self.max_messages = max(int(batching.get('max_messages', 1)), 1)
+        self._max_wait_seconds = batching.get('max_wait_ms', 250) / 1000
+
+        self._queue_name = queue_name
+        self._schema = schema
+        self._write_batch = write_batch
+        self._queue_service = queue_service
+        self._logger = logger
+
+        self._tasks: list[BaseModel] = []
+        self._delivery_tags: list[int] = []
+        self._channel = None
+        self._flush_timer = None
+
+    def on_message(self, ch, method, properties, body):
+        """
+        pika callback: validates the message and adds it to the current batch
+        """
+        try:
+            task = self._schema.model_validate_json(body.decode('utf-8'))
+
+        except ValueError as e:
+            self._logger.error("Message Skipped - Invalid task message: %s", e)
+            DB_WRITER_MESSAGE_FAILURES_TOTAL.labels(error_type="ValueError").inc()
+            DB_WRITER_MESSAGES_RECEIVED_TOTAL.labels(status="error").inc()
+            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+            return
+
+        self._tasks.append(task)
+        self._delivery_tags.append(method.delivery_tag)
+        self._channel = ch
+
+        if len(self._tasks) >= self.max_messages:
+            self.flush(trigger="size")
+        elif self._flush_timer is None:
+            self._flush_timer = self._queue_service.call_later(
+                self._max_wait_seconds, self._on_flush_timer
+            )
+
+    def flush(self, trigger: str = "manual"):
+        """
+        Writes every buffered message as one batch and settles them with a single multi-ack
+        """
+        self._cancel_flush_timer()
+
+        if not self._tasks:
+            return
+
+        tasks, self._tasks = self._tasks, []
+        delivery_tags, self._delivery_tags = self._delivery_tags, []
+
+        DB_WRITER_BATCH_FLUSHES_TOTAL.labels(queue=self._queue_name, trigger=trigger).inc()
+        DB_WRITER_BATCH_MESSAGES.labels(queue=self._queue_name).observe(len(tasks))
+
+        try:
+            self._write_batch(tasks, self._logger)
+
+            DB_WRITER_MESSAGES_RECEIVED_TOTAL.labels(status="valid").inc(len(tasks))
+            self._channel.basic_ack(delivery_tag=delivery_tags[-1], multiple=True)
+
+        except Exception:
+            self._logger.exception(
+                "Batch write of %d messages from %s failed, retrying one by one",
+                len(tasks), self._queue_name
+            )
+            DB_WRITER_BATCH_FALLBACKS_TOTAL.labels(queue=self._queue_name).inc()
+            self._write_one_by_one(tasks, delivery_tags)
+
+    def _write_one_by_one(self, tasks: list[BaseModel], delivery_tags: list[int]):
+        for task, delivery_tag in zip(tasks, delivery_tags):
+            try:
+                self._write_batch([task], self._logger)
+                DB_WRITER_MESSAGES_RECEIVED_TOTAL.labels(status="valid").inc()
+                self._channel.basic_ack(delivery_tag=delivery_tag)
+
+            except Exception:
+                self._logger.exception("Error processing message from %s", self._queue_name)
+                DB_WRITER_MESSAGE_FAILURES_TOTAL.labels(error_type="UnexpectedError").inc()
+                DB_WRITER_MESSAGES_RECEIVED_TOTAL.labels(status="error").inc()
+                self._channel.basic_nack(delivery_tag=delivery_tag, requeue=False)
+
+    def _on_flush_timer(self):
+        self._flush_timer = None
+        self.flush(trigger="timeout")
+
+    def _cancel_flush_timer(self):
+        if self._flush_timer is not None:
+            self._queue_service.remove_timeout(self._flush_timer)
+            self._flush_timer = None
+
+
+DEFAULT_LOADER = "upsert"
+
+# Queue -> (message schema, loader name -> batch writer)
+BATCH_WRITERS = {
+    DbWriterQueueChannels.PAGE_METADATA_TO_SAVE: (
+        SavePageMetadataTask, {"upsert": save_page_metadata_batch}
+    ),
+    DbWriterQueueChannels.PARSED_CONTENT_TO_SAVE: (
+        SaveParsedContent, {"upsert": save_parsed_data_batch}
+    ),
+    DbWriterQueueChannels.SCHEDULED_LINKS_TO_SAVE: (
+        SaveProcessedLinks, {"upsert": save_processed_links_batch, "copy": save_processed_links_copy}
+    ),
+    DbWriterQueueChannels.ADD_LINKS_TO_SCHEDULE: (
+        SaveLinksToSchedule, {"upsert": add_links_to_schedule_batch}
+    ),
+}
+
+
+def get_batch_writer(queue_name: str, loader: str) -> Callable[[list[BaseModel], logging.Logger], None]:
+    """
+    Returns the batch writer for a queue's configured loader
+
+    Raises:
+        ValueError: If the queue doesn't support the loader
+    """
+    _, writers = BATCH_WRITERS[queue_name]
+    if loader not in writers:
+        raise ValueError(
+            f"Unsupported loader '{loader}' for queue {queue_name}, expected one of {sorted(writers)}"
+        )
+    return writers[loader]
+
+
+def get_queue_batching(configs: dict[str, Any], queue_name: str) -> dict[str, Any]:
+    """
+    Returns the batching settings for a queue: `batching.defaults` overridden by `batching.queues.<queue_name>`
+    """
+    batching = (configs or {}).get('batching', {})
+    return {
+        **batching.get('defaults', {}),
+        **batching.get('queues', {}).get(queue_name, {})
+    }
+
+
+def start_batch_listener(queue_service: QueueService, logger: logging.Logger, configs: dict[str, Any]):
+    """
+    Starts one micro-batching consumer per db_writer queue, each on its own channel
+
+    Each channel's prefetch matches its batch size, otherwise the broker would stop
+    delivering before a batch can fill up. The optional per-queue `loader` setting picks
+    the batch writer (e.g. `copy` for `scheduled_links_to_save`).
+
+    Args:
+        queue_service (QueueService): The shared queue abstraction for subscribing to messages
+        logger (logging.Logger): Logger instance
+        configs (dict[str, Any]): db_writer component configs
+    """
+    for queue_name, (schema, _) in BATCH_WRITERS.items():
+        batching = get_queue_batching(configs, queue_name.value)
+        write_batch = get_batch_writer(queue_name, batching.get('loader', DEFAULT_LOADER))
+
+        consumer = BatchWriteConsumer(
+            queue_name.value, schema, write_batch, queue_service, batching, logger
+        )
+        channel = queue_service.open_channel(prefetch_count=consumer.max_messages)
+        channel.basic_consume(
+            queue=queue_name,
+            on_message_callback=consumer.on_message,
+            auto_ack=False
+        )
+
+    # Buffered messages are still unacked, so the broker redelivers them if we stop mid-batch
+    logger.info("Listening for Database requests (batched)...")
+    queue_service.run_io_loop()
+
+
+def start_db_service_listener(queue_service: QueueService, logger: logging.Logger, configs: dict[str, Any] | None = None):
     """
     Starts listening to database-write related RabbitMQ queues and redirects each to its corresponding consumer
 
+    When `batching.enabled` is set in the component configs, messages are micro-batched
+    per queue (see `start_batch_listener`). Otherwise each message is written on its own.
+
     Args:
         queue_service (QueueService): The shared queue abstraction for subscribing to messages
         logger (logging.Logger): Logger instance
+        configs (dict[str, Any], optional): db_writer component configs
     """
+    if (configs or {}).get('batching', {}).get('enabled', False):
+        start_batch_listener(queue_service, logger, configs)
+        return
+
     # Partial allows us to inject the value of a param into a function.
     # This allows me to inject the logger while still complying with
     # the RabbitMQ api for listening to messages
@@ -0,0 +1,149 @@
+import logging
+import threading
+from functools import partial
+from typing import Any
+
+from sqlalchemy.orm import sessionmaker
+
+from components.db_writer.monitoring.metrics import (
+    DB_WRITER_PIPELINE_CONSUMERS,
+    DB_WRITER_POOL_CHECKOUT_WAIT_SECONDS,
+)
+from components.db_writer.services.message_handler import (
+    BATCH_WRITERS,
+    DEFAULT_LOADER,
+    BatchWriteConsumer,
+    get_batch_writer,
+    get_queue_batching,
+)
+from database.engine import build_engine, load_engine_profile
+from shared.rabbitmq.enums.queue_names import DbWriterQueueChannels
+from shared.rabbitmq.queue_service import QueueService
+
+
+def get_queue_pipeline(configs: dict[str, Any], queue_name: str) -> dict[str, Any]:
+    """
+    Returns the pipeline settings for a queue: `pipelines.defaults` overridden by `pipelines.queues.<queue_name>`
+
+    `db_connections` defaults to `concurrency`, one connection per consumer.
+    """
+    pipelines = (configs or {}).get('pipelines', {})
+    settings = {
+        'concurrency': 1,
+        **pipelines.get('defaults', {}),
+        **pipelines.get('queues', {}).get(queue_name, {})
+    }
+    settings.setdefault('db_connections', settings['concurrency'])
+
+    if settings['concurrency'] < 1 or settings['db_connections'] < 1:
+        raise ValueError(f"Pipeline for {queue_name} needs at least one consumer and one connection")
+    return settings
+
+
+class QueuePipeline:
+    """
+    Independent write pipeline for one db_writer queue
+
+    Runs `concurrency` consumers, each on its own thread with its own RabbitMQ
+    connection, and writes through an engine of its own capped at `db_connections`.
+    A slow write on one queue therefore only holds up that queue, and a queue can't
+    take connections from the others.
+
+    Each consumer is a BatchWriteConsumer using the queue's batching settings (a batch
+    of one when batching is disabled).
+
+    Args:
+        queue (DbWriterQueueChannels): Queue this pipeline consumes
+        configs (dict[str, Any]): db_writer component configs
+        stopped (threading.Event): Set when any consumer of any pipeline exits
+        logger (logging.Logger): Logger instance
+    """
+
+    def __init__(self, queue: DbWriterQueueChannels, configs: dict[str, Any], stopped: threading.Event, logger: logging.Logger):
+        self._queue_name = queue_name = queue.value
+        self._stopped = stopped
+        self._logger = logger
+
+        settings = get_queue_pipeline(configs, queue_name)
+        self.concurrency = int(settings['concurrency'])
+
+        self._batching = get_queue_batching(configs, queue_name)
+        if not configs.get('batching', {}).get('enabled', False):
+            self._batching = {**self._batching, 'max_messages': 1}
+
+        self._schema, _ = BATCH_WRITERS[queue]
+        self._engine = build_engine(
+            {
+                **load_engine_profile(configs),
+                'pool_size': int(settings['db_connections']),
+                'max_overflow': 0,
+            },
+            DB_WRITER_POOL_CHECKOUT_WAIT_SECONDS.observe
+        )
+        self._write_batch = partial(
+            get_batch_writer(queue, self._batching.get('loader', DEFAULT_LOADER)),
+            session_factory=sessionmaker(autocommit=False, bind=self._engine)
+        )
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        """
+        Starts the pipeline's consumer threads
+        """
+        for index in range(self.concurrency):
+            thread = threading.Thread(
+                target=self._run_consumer,
+                name=f"{self._queue_name}-{index}",
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def _run_consumer(self) -> None:
+        DB_WRITER_PIPELINE_CONSUMERS.labels(queue=self._queue_name).inc()
+        try:
+            # pika connections aren't thread safe, so every consumer opens its own
+            queue_service = QueueService(self._logger, [self._queue_name])
+            consumer = BatchWriteConsumer(
+                self._queue_name, self._schema, self._write_batch, queue_service, self._batching, self._logger
+            )
+            channel = queue_service.open_channel(prefetch_count=consumer.max_messages)
+            channel.basic_consume(
+                queue=self._queue_name,
+                on_message_callback=consumer.on_message,
+                auto_ack=False
+            )
+            queue_service.run_io_loop()
+
+        except Exception:
+            self._logger.exception("Consumer %s stopped", threading.current_thread().name)
+        finally:
+            DB_WRITER_PIPELINE_CONSUMERS.labels(queue=self._queue_name).dec()
+            self._stopped.set()
+
+
+def start_queue_pipelines(logger: logging.Logger, configs: dict[str, Any]) -> None:
+    """
+    Runs one QueuePipeline per db_writer queue, so writes to different tables overlap
+
+    Blocks until any consumer stops, then returns so the service exits and is restarted
+    rather than running with a queue silently unconsumed. Unacked messages of the
+    other consumers are redelivered by the broker.
+
+    Args:
+        logger (logging.Logger): Logger instance
+        configs (dict[str, Any]): db_writer component configs
+    """
+    stopped = threading.Event()
+    pipelines = [
+        QueuePipeline(queue, configs, stopped, logger)
+        for queue in BATCH_WRITERS
+    ]
+    for pipeline in pipelines:
+        pipeline.start()
+
+    logger.info(
+        "Listening for Database requests (%d queue pipelines, %d consumers)...",
+        len(pipelines), sum(pipeline.concurrency for pipeline in pipelines)
+    )
+    stopped.wait()
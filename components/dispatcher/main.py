@@ -1,9 +1,14 @@
+import signal
+import sys
+
 from prometheus_client import start_http_server
+
+from components.dispatcher.services.dispatching_service import Dispatcher
+from shared.configs.config_loader import component_config_loader, global_config_loader
 from shared.logging_utils import get_logger
-from shared.rabbitmq.queue_service import QueueService
 from shared.rabbitmq.enums.queue_names import DispatcherQueueChannels
-from components.dispatcher.services.dispatching_service import Dispatcher
-from shared.configs.config_loader import component_config_loader
+from shared.rabbitmq.queue_service import QueueService
+from shared.redis.frontier import create_frontier
 
 COMPONENT_NAME = "dispatcher"
 
@@ -31,7 +36,11 @@ def run() -> None:
     start_http_server(prometheus_port)
     logger.info(f"Prometheus metrics exposed on port {prometheus_port}")
 
-    dispatcher = Dispatcher(dispatcher_configs, queue_service, logger)
+    frontier = create_frontier(global_config_loader(), logger)
+    dispatcher = Dispatcher(dispatcher_configs, queue_service, logger, frontier)
+
+    # Exit through the run loop's cleanup on `docker stop`, so buffered links are handed back
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
 
     logger.info("Starting Dispatcher Component...")
     dispatcher.run()
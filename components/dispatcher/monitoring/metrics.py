@@ -1,4 +1,4 @@
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 
 DISPATCHER_LINKS_FETCHED_TOTAL = Counter(
     "dispatcher_links_fetched_total",
@@ -25,3 +25,60 @@ DISPATCHER_DISPATCH_LATENCY_SECONDS = Histogram(
     "dispatcher_dispatch_latency_seconds",
     "Latency for one dispatch cycle"
 )
+
+DISPATCHER_FRONTIER_SIZE = Gauge(
+    "dispatcher_frontier_size",
+    "Number of URLs queued in the Redis frontier (only set with the redis backend)"
+)
+
+
+# Adaptive dispatch (only set when `adaptive.enabled`)
+DISPATCHER_CRAWL_QUEUE_DEPTH = Gauge(
+    "dispatcher_crawl_queue_depth",
+    "Messages ready in the crawl queue, read before each dispatch"
+)
+
+DISPATCHER_CRAWL_QUEUE_CONSUMERS = Gauge(
+    "dispatcher_crawl_queue_consumers",
+    "Consumers of the crawl queue"
+)
+
+DISPATCHER_CONSUME_RATE = Gauge(
+    "dispatcher_consume_rate",
+    "Estimated rate at which crawlers drain the crawl queue (messages/second)"
+)
+
+DISPATCHER_DISPATCH_COUNT = Gauge(
+    "dispatcher_dispatch_count",
+    "Links requested from the frontier in the last dispatch"
+)
+
+DISPATCHER_QUEUE_DEPTH_ERROR = Gauge(
+    "dispatcher_queue_depth_error",
+    "Target crawl queue depth minus the measured depth"
+)
+
+
+# Host-fair dispatch (only set when `host_fairness.enabled`)
+DISPATCHER_HOST_BUFFERED_LINKS = Gauge(
+    "dispatcher_host_buffered_links",
+    "Links popped from the frontier and waiting in the per-host sub-queues"
+)
+
+DISPATCHER_HOST_BUFFERED_HOSTS = Gauge(
+    "dispatcher_host_buffered_hosts",
+    "Hosts with links waiting in the per-host sub-queues"
+)
+
+
+# Publisher confirms
+DISPATCHER_PUBLISH_CONFIRM_LATENCY_SECONDS = Histogram(
+    "dispatcher_publish_confirm_latency_seconds",
+    "Time between publishing a crawl task and the broker confirming it",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+)
+
+DISPATCHER_PUBLISH_RETRIES_TOTAL = Counter(
+    "dispatcher_publish_retries_total",
+    "Crawl tasks published again after a nack or a lost channel"
+)
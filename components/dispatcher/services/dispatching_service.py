@@ -2,41 +2,82 @@ import logging
 from time import sleep
 from typing import Any
 
+from components.dispatcher.monitoring.metrics import (
+    DISPATCHER_CONSUME_RATE,
+    DISPATCHER_CRAWL_QUEUE_CONSUMERS,
+    DISPATCHER_CRAWL_QUEUE_DEPTH,
+    DISPATCHER_DISPATCH_COUNT,
+    DISPATCHER_DISPATCH_ERRORS_TOTAL,
+    DISPATCHER_DISPATCH_LATENCY_SECONDS,
+    DISPATCHER_EMPTY_DB_STARTUP_TOTAL,
+    DISPATCHER_FRONTIER_SIZE,
+    DISPATCHER_HOST_BUFFERED_HOSTS,
+    DISPATCHER_HOST_BUFFERED_LINKS,
+    DISPATCHER_LINKS_FETCHED_TOTAL,
+    DISPATCHER_QUEUE_DEPTH_ERROR,
+)
 from components.dispatcher.services.db_client import DBReaderClient
+from components.dispatcher.services.flow_control import AdaptiveDispatchController
+from components.dispatcher.services.host_fairness import HostFairQueue
 from components.dispatcher.services.publisher import PublishingService
+from shared.rabbitmq.enums.queue_names import DispatcherQueueChannels
 from shared.rabbitmq.queue_service import QueueService
 from shared.rabbitmq.schemas.crawling import CrawlTask
+from shared.redis.frontier import RedisFrontier
 from shared.utils import get_timestamp_eastern_time
 
-from components.dispatcher.monitoring.metrics import (
-    DISPATCHER_LINKS_FETCHED_TOTAL,
-    DISPATCHER_DISPATCH_ERRORS_TOTAL,
-    DISPATCHER_EMPTY_DB_STARTUP_TOTAL,
-    DISPATCHER_DISPATCH_LATENCY_SECONDS,
-)
-
 
 class Dispatcher:
     """
     Dispatcher service responsible for orchestrating crawl jobs
 
-    It continuously polls the DB for scheduled links, converts them into CrawlTask
-    objects, and publishes them to the crawl queue. It also seeds the queue with
-    initial links if the database is empty on startup.
+    It continuously polls the frontier for scheduled links (the db_reader, or the Redis
+    frontier when one is configured), converts them into CrawlTask objects, and publishes
+    them to the crawl queue. It also seeds the queue with initial links if the database
+    is empty on startup.
+
+    Each tick dispatches `dispatch_count` links, or, with `adaptive.enabled`, as many as
+    keep the crawl queue near `adaptive.target_queue_depth` (see AdaptiveDispatchController).
+
+    With `host_fairness.enabled`, popped links are buffered in per-host sub-queues (up to
+    `host_fairness.max_buffered_links`) and each tick's links are taken from them by
+    weighted round robin, so one host can't fill the crawl queue while others wait.
+    Buffered links have already left the frontier: `close` hands them back on shutdown,
+    but they are lost if the dispatcher is killed, so the buffer should stay small.
     """
 
     def __init__(
-        self, configs: dict[str, Any], queue_service: QueueService, logger: logging.Logger
+        self,
+        configs: dict[str, Any],
+        queue_service: QueueService,
+        logger: logging.Logger,
+        frontier: RedisFrontier | None = None
     ):
         self.configs = configs
         self._queue_service = queue_service
         self._logger = logger
+        self._frontier = frontier
         self._dbclient = DBReaderClient(
             logger, 
             self.configs['db_reader_timeout_seconds']
         )
         self._publisher = PublishingService(queue_service, logger)
 
+        adaptive = self.configs.get('adaptive', {})
+        self._controller = (
+            AdaptiveDispatchController(adaptive, self.configs['dispatch_tick'])
+            if adaptive.get('enabled') else None
+        )
+        # Tasks published since the controller last measured the queue
+        self._published_since_update = 0
+
+        fairness = self.configs.get('host_fairness', {})
+        self._host_queue = (
+            HostFairQueue(fairness.get('weights'), fairness.get('default_weight', 1.0))
+            if fairness.get('enabled') else None
+        )
+        self._max_buffered_links = fairness.get('max_buffered_links', 0)
+
         if self._dbclient.tables_are_empty():
             DISPATCHER_EMPTY_DB_STARTUP_TOTAL.inc()
             self.seed_empty_queue()
@@ -47,9 +88,39 @@ class Dispatcher:
         Main dispatcher loop — fetches links from db_reader and emits crawl tasks
         at a fixed interval defined in config
         """
-        while True:
-            self._dispatch()
-            sleep(self.configs['dispatch_tick'])
+        try:
+            while True:
+                self._dispatch()
+                sleep(self.configs['dispatch_tick'])
+        finally:
+            self.close()
+
+
+    def close(self) -> None:
+        """
+        Hands the links still buffered for host fairness back to the frontier. Call once on shutdown
+        """
+        if self._host_queue is None or not len(self._host_queue):
+            return
+
+        tasks = [self._crawl_task(link) for link in self._host_queue.drain()]
+        DISPATCHER_HOST_BUFFERED_LINKS.set(0)
+        DISPATCHER_HOST_BUFFERED_HOSTS.set(0)
+        try:
+            if self._frontier is not None:
+                self._frontier.push_links(tasks)
+                returned = True
+            else:
+                returned = self._publisher.publish_links_to_schedule(tasks)
+        except Exception:
+            # Shutting down either way, so the error is only logged
+            self._logger.exception("Could not return %d buffered links to the frontier", len(tasks))
+            returned = False
+
+        if returned:
+            self._logger.info("Returned %d buffered links to the frontier", len(tasks))
+        else:
+            self._logger.error("Lost %d buffered links: %s", len(tasks), [task.url for task in tasks])
 
 
     def _dispatch(self) -> None:
@@ -59,19 +130,13 @@ class Dispatcher:
         """
         try:
             with DISPATCHER_DISPATCH_LATENCY_SECONDS.time():
-                links = self._dbclient.pop_links_from_schedule(self.configs['dispatch_count'])
+                count = self._next_dispatch_count()
+                DISPATCHER_DISPATCH_COUNT.set(count)
+                links = self._take_links(count) if count > 0 else []
+                self._published_since_update += len(links)
 
                 if links:
-                    DISPATCHER_LINKS_FETCHED_TOTAL.inc(len(links))
-
-                    tasks = [
-                        CrawlTask(
-                            url=link['url'],
-                            scheduled_at=link['scheduled_at'],
-                            depth=link['depth']
-                        )
-                        for link in links
-                    ]
+                    tasks = [self._crawl_task(link) for link in links]
                     self._publisher.publish_crawl_tasks(tasks)
 
         except Exception:
@@ -79,6 +144,76 @@ class Dispatcher:
             DISPATCHER_DISPATCH_ERRORS_TOTAL.inc()
 
 
+    @staticmethod
+    def _crawl_task(link: dict) -> CrawlTask:
+        return CrawlTask(
+            url=link['url'],
+            scheduled_at=link['scheduled_at'],
+            depth=link['depth'],
+            priority=link.get('priority', 0.0)
+        )
+
+
+    def _next_dispatch_count(self) -> int:
+        """
+        Number of links to dispatch this tick: fixed, or chosen from the crawl queue's depth
+        """
+        if self._controller is None:
+            return self.configs['dispatch_count']
+
+        try:
+            depth, consumers = self._queue_service.queue_depth(DispatcherQueueChannels.URLS_TO_CRAWL.value)
+        except Exception:
+            self._logger.exception("Could not read the crawl queue depth, dispatching the fixed count")
+            return self.configs['dispatch_count']
+
+        count = self._controller.update(depth, self._published_since_update)
+        self._published_since_update = 0
+
+        DISPATCHER_CRAWL_QUEUE_DEPTH.set(depth)
+        DISPATCHER_CRAWL_QUEUE_CONSUMERS.set(consumers)
+        DISPATCHER_CONSUME_RATE.set(self._controller.consume_rate)
+        DISPATCHER_QUEUE_DEPTH_ERROR.set(self._controller.target_depth - depth)
+        self._logger.debug(
+            "Crawl queue depth %d (%d consumers, %.1f msg/s), dispatching %d",
+            depth, consumers, self._controller.consume_rate, count
+        )
+        return count
+
+
+    def _take_links(self, count: int) -> list[dict]:
+        """
+        Up to `count` links to dispatch now, straight from the frontier or host-fair
+        """
+        if self._host_queue is None:
+            return self._pop_links(count)
+
+        # Look ahead past the next `count` links, so other hosts' links are at hand
+        # when one host dominates the head of the frontier
+        refill = max(count, self._max_buffered_links) - len(self._host_queue)
+        if refill > 0:
+            self._host_queue.push_many(self._pop_links(refill))
+
+        links = self._host_queue.pop(count)
+        DISPATCHER_HOST_BUFFERED_LINKS.set(len(self._host_queue))
+        DISPATCHER_HOST_BUFFERED_HOSTS.set(self._host_queue.host_count)
+        return links
+
+
+    def _pop_links(self, count: int) -> list[dict]:
+        """
+        Pop up to `count` scheduled links from the configured frontier backend
+        """
+        if self._frontier is None:
+            links = self._dbclient.pop_links_from_schedule(count)
+        else:
+            links = self._frontier.pop_links(count)
+            DISPATCHER_FRONTIER_SIZE.set(self._frontier.size())
+
+        DISPATCHER_LINKS_FETCHED_TOTAL.inc(len(links))
+        return links
+
+
     def seed_empty_queue(self) -> None:
         """
         Seed the crawl queue with a set of predefined seed URLs
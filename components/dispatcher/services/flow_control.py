@@ -0,0 +1,108 @@
+import time
+from collections.abc import Callable
+from typing import Any
+
+
+class PIDController:
+    """
+    Discrete PID controller with output limits
+
+    The integral only accumulates while the output isn't saturated (conditional
+    integration), so a long stretch at a limit doesn't wind it up and cause overshoot
+    once the process comes back into range.
+    """
+
+    def __init__(
+        self,
+        kp: float,
+        ki: float,
+        kd: float,
+        output_min: float = float("-inf"),
+        output_max: float = float("inf")
+    ):
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.output_min = output_min
+        self.output_max = output_max
+
+        self._integral = 0.0
+        self._previous_error: float | None = None
+
+    def update(self, error: float, dt: float, bias: float = 0.0) -> float:
+        """
+        Returns the clamped control output for the current error
+
+        Args:
+            error (float): Setpoint minus measured value
+            dt (float): Seconds since the previous update
+            bias (float): Feed-forward term added to the output before clamping
+        """
+        derivative = 0.0
+        if self._previous_error is not None and dt > 0:
+            derivative = (error - self._previous_error) / dt
+        self._previous_error = error
+
+        integral = self._integral + error * dt
+        unclamped = bias + self.kp * error + self.ki * integral + self.kd * derivative
+        output = min(self.output_max, max(self.output_min, unclamped))
+
+        if output == unclamped:
+            self._integral = integral
+        return output
+
+
+class AdaptiveDispatchController:
+    """
+    Chooses how many links to dispatch per tick so the crawl queue stays near a target depth
+
+    Each update measures the queue depth, estimates how fast crawlers drain the queue
+    from the change in depth and the number of tasks published since the previous
+    update, and sets the dispatch count to what the crawlers consumed (feed-forward)
+    plus a PID correction of the depth error.
+
+    Configured by the dispatcher's `adaptive` section:
+        - target_queue_depth: Messages to keep ready in the crawl queue
+        - min_dispatch_count / max_dispatch_count: Bounds of the dispatch count
+        - kp, ki, kd: PID gains, in links per tick per message of depth error
+        - rate_smoothing: Weight of the newest sample in the consume rate EWMA (0-1]
+    """
+
+    def __init__(self, configs: dict[str, Any], tick_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.target_depth = configs['target_queue_depth']
+        self._tick_seconds = tick_seconds
+        self._smoothing = configs.get('rate_smoothing', 0.3)
+        self._clock = clock
+
+        self._pid = PIDController(
+            configs.get('kp', 0.5),
+            configs.get('ki', 0.05),
+            configs.get('kd', 0.0),
+            output_min=configs.get('min_dispatch_count', 0),
+            output_max=configs['max_dispatch_count'],
+        )
+
+        self.consume_rate = 0.0
+        self._previous_depth: int | None = None
+        self._previous_time: float | None = None
+
+    def update(self, queue_depth: int, published: int) -> int:
+        """
+        Returns the number of links to dispatch this tick
+
+        Args:
+            queue_depth (int): Messages ready in the crawl queue now
+            published (int): Tasks published since the previous update
+        """
+        now = self._clock()
+        dt = self._tick_seconds if self._previous_time is None else now - self._previous_time
+
+        if self._previous_depth is not None and dt > 0:
+            consumed = max(0, self._previous_depth + published - queue_depth)
+            self.consume_rate += self._smoothing * (consumed / dt - self.consume_rate)
+
+        self._previous_depth = queue_depth
+        self._previous_time = now
+
+        error = self.target_depth - queue_depth
+        return round(self._pid.update(error, dt, bias=self.consume_rate * self._tick_seconds))
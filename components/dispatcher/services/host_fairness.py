@@ -0,0 +1,102 @@
+from collections import deque
+from collections.abc import Hashable, Iterable
+from typing import Any
+from urllib.parse import urlsplit
+
+
+def link_host(link: dict) -> str:
+    """
+    Host a scheduled link is fetched from, the key crawl work is shared fairly by
+    """
+    return (urlsplit(link['url']).hostname or "").lower()
+
+
+class HostFairQueue:
+    """
+    Per-host sub-queues drained with deficit round robin
+
+    Every round, each host with queued links earns `weight` credits and may emit one
+    link per whole credit, so hosts share the output in proportion to their weights
+    (fractional weights carry over between rounds) and links of different hosts are
+    interleaved. A host that is alone gets the whole output, so no capacity is left
+    idle. Within a host, links keep the order they were pushed in.
+
+    Args:
+        weights (Dict[str, float], optional): Weight per host
+        default_weight (float): Weight of hosts missing from `weights`
+    """
+
+    def __init__(self, weights: dict[str, float] | None = None, default_weight: float = 1.0):
+        if default_weight <= 0 or any(weight <= 0 for weight in (weights or {}).values()):
+            raise ValueError("Host weights must be positive")
+        self._weights = weights or {}
+        self._default_weight = default_weight
+        self._queues: dict[Hashable, deque] = {}
+        self._deficits: dict[Hashable, float] = {}
+        # Hosts with queued links, in round robin order
+        self._active: deque = deque()
+        # Whether the host at the front already earned its credit this round (the
+        # previous pop stopped in the middle of its turn)
+        self._in_turn = False
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def host_count(self) -> int:
+        return len(self._active)
+
+    def push(self, host: Hashable, item: Any) -> None:
+        queue = self._queues.get(host)
+        if queue is None:
+            queue = self._queues[host] = deque()
+            self._deficits[host] = 0.0
+            self._active.append(host)
+        queue.append(item)
+        self._size += 1
+
+    def push_many(self, items: Iterable[Any], key=link_host) -> None:
+        for item in items:
+            self.push(key(item), item)
+
+    def drain(self) -> list[Any]:
+        """
+        Removes and returns every queued item, host by host
+        """
+        items = [item for host in self._active for item in self._queues[host]]
+        self._queues.clear()
+        self._deficits.clear()
+        self._active.clear()
+        self._in_turn = False
+        self._size = 0
+        return items
+
+    def pop(self, count: int) -> list[Any]:
+        """
+        Removes and returns up to `count` items, interleaved across hosts by weight
+        """
+        popped = []
+        while len(popped) < count and self._active:
+            host = self._active[0]
+            queue = self._queues[host]
+            if not self._in_turn:
+                self._deficits[host] += self._weights.get(host, self._default_weight)
+
+            while self._deficits[host] >= 1 and queue and len(popped) < count:
+                popped.append(queue.popleft())
+                self._deficits[host] -= 1
+
+            self._in_turn = bool(queue) and self._deficits[host] >= 1
+            if self._in_turn:
+                break
+            if queue:
+                self._active.rotate(-1)
+            else:
+                # An idle host doesn't bank credit for later
+                self._active.popleft()
+                del self._queues[host]
+                del self._deficits[host]
+
+        self._size -= len(popped)
+        return popped
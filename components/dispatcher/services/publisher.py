@@ -1,9 +1,15 @@
 import logging
-from typing import List
-from components.dispatcher.monitoring.metrics import DISPATCHER_CRAWL_TASKS_PUBLISHED_TOTAL, DISPATCHER_DISPATCH_ERRORS_TOTAL
+
+from components.dispatcher.monitoring.metrics import (
+    DISPATCHER_CRAWL_TASKS_PUBLISHED_TOTAL,
+    DISPATCHER_DISPATCH_ERRORS_TOTAL,
+    DISPATCHER_PUBLISH_CONFIRM_LATENCY_SECONDS,
+    DISPATCHER_PUBLISH_RETRIES_TOTAL,
+)
 from shared.rabbitmq.enums.queue_names import DispatcherQueueChannels
-from shared.rabbitmq.schemas.crawling import CrawlTask
 from shared.rabbitmq.queue_service import QueueService
+from shared.rabbitmq.schemas.crawling import CrawlTask
+from shared.rabbitmq.schemas.save_to_db import SaveLinksToSchedule
 
 
 class PublishingService:
@@ -12,6 +18,7 @@ class PublishingService:
 
     Publishes:
         - CrawlTask messages to the 'urls_to_crawl' queue
+        - Links handed back to the Postgres frontier to the 'add_links_to_schedule' queue
     """
 
     def __init__(self, queue_service: QueueService, logger: logging.Logger):
@@ -19,36 +26,52 @@ class PublishingService:
         self._logger = logger
 
 
-    def publish_crawl_tasks(self, crawl_tasks: List[CrawlTask]) -> None:
+    def publish_crawl_tasks(self, crawl_tasks: list[CrawlTask]) -> None:
         """
         Publish a list of CrawlTask messages to the 'urls_to_crawl' queue
 
-        Each task is serialized to JSON and sent via the queue service.
-        Logs the total number of tasks published.
+        The tasks are published as one batch with publisher confirms (see
+        `QueueService.publish_batch`), so a task only counts as published once the
+        broker has confirmed it. Nacked tasks are retried.
 
         Args:
             crawl_tasks (List[CrawlTask]): List of CrawlTask Pydantic models to publish
         """
-        successful = 0
-
-        for task in crawl_tasks:
-            try:
-                self._queue_service.publish(
-                    DispatcherQueueChannels.URLS_TO_CRAWL.value, 
-                    task.model_dump_json()
-                )
-                self._logger.debug("Published Crawl Task: %s", task)
-                successful += 1
-                DISPATCHER_CRAWL_TASKS_PUBLISHED_TOTAL.labels(
-                    status="success"
-                ).inc()
-
-            except Exception:
-                self._logger.exception("Failed to publish crawl task")
-                DISPATCHER_DISPATCH_ERRORS_TOTAL.inc()
-                DISPATCHER_CRAWL_TASKS_PUBLISHED_TOTAL.labels(
-                    status="error"
-                ).inc()
-
-        self._logger.info("Successfully published %d out of %d crawl tasks", successful, len(crawl_tasks))
+        if not crawl_tasks:
+            return
+
+        try:
+            result = self._queue_service.publish_batch(
+                DispatcherQueueChannels.URLS_TO_CRAWL.value,
+                [task.model_dump_json() for task in crawl_tasks],
+                observe_confirm_latency=DISPATCHER_PUBLISH_CONFIRM_LATENCY_SECONDS.observe,
+            )
+        except Exception:
+            self._logger.exception("Failed to publish %d crawl tasks", len(crawl_tasks))
+            DISPATCHER_DISPATCH_ERRORS_TOTAL.inc()
+            DISPATCHER_CRAWL_TASKS_PUBLISHED_TOTAL.labels(status="error").inc(len(crawl_tasks))
+            return
+
+        DISPATCHER_CRAWL_TASKS_PUBLISHED_TOTAL.labels(status="success").inc(result.confirmed)
+        DISPATCHER_PUBLISH_RETRIES_TOTAL.inc(result.retried)
+        if result.failed:
+            DISPATCHER_DISPATCH_ERRORS_TOTAL.inc()
+            DISPATCHER_CRAWL_TASKS_PUBLISHED_TOTAL.labels(status="error").inc(len(result.failed))
+
+        self._logger.info("Successfully published %d out of %d crawl tasks", result.confirmed, len(crawl_tasks))
+
+
+    def publish_links_to_schedule(self, tasks: list[CrawlTask]) -> bool:
+        """
+        Hands links back to the Postgres frontier through the db_writer's
+        'add_links_to_schedule' queue, as one confirmed message
+
+        Returns:
+            bool: Whether the broker confirmed the message
+        """
+        if not tasks:
+            return True
 
+        message = SaveLinksToSchedule(links=tasks).model_dump_json()
+        result = self._queue_service.publish_batch(DispatcherQueueChannels.ADD_LINKS_TO_SCHEDULE.value, [message])
+        return result.confirmed == 1
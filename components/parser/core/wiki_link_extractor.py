@@ -1,9 +1,11 @@
 import logging
 from typing import List, Optional
-from urllib.parse import urljoin, urlparse, urlunparse
+from urllib.parse import urlparse
 
 from lxml import html
+
 from shared.rabbitmq.schemas.scheduling import LinkData
+from shared.url_canonicalizer import canonicalize_url
 from shared.utils import get_timestamp_eastern_time
 
 
@@ -109,15 +111,9 @@ class PageLinkExtractor:
     
     def normalize_url(self, href: str) -> str:
         """
-        Normalizes a URL by converting to absolute, and removing fragments/query parameters.
+        Normalizes a URL into its canonical absolute form (see shared.url_canonicalizer)
         """
-        # Convert relative URL to absolute
-        full_url = urljoin(self.configs['wikipedia']['base_url'], href)
-
-        # Remove fragments (#section) and query params (?foo=bar)
-        parsed = urlparse(full_url)
-        cleaned = parsed._replace(fragment="", query="")
-        return urlunparse(cleaned)
+        return canonicalize_url(href, self.configs['wikipedia']['base_url'])
     
     
     def is_internal_link(self, href: str) -> bool:
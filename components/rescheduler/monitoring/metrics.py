@@ -20,3 +20,16 @@ RESCHEDULER_RESCHEDULE_LATENCY_SECONDS = Histogram(
     "rescheduler_reschedule_latency_seconds",
     "Time taken for a rescheduling iteration"
 )
+
+
+# Publisher confirms
+RESCHEDULER_PUBLISH_CONFIRM_LATENCY_SECONDS = Histogram(
+    "rescheduler_publish_confirm_latency_seconds",
+    "Time between publishing a crawl task and the broker confirming it",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+)
+
+RESCHEDULER_PUBLISH_RETRIES_TOTAL = Counter(
+    "rescheduler_publish_retries_total",
+    "Crawl tasks published again after a nack or a lost channel"
+)
@@ -1,8 +1,11 @@
+import json
 import logging
-import requests
 import os
+from collections.abc import Iterator
 from urllib.parse import urljoin
 
+import requests
+
 
 class DBReaderClient:
     """
@@ -34,3 +37,29 @@ class DBReaderClient:
             if e.response:
                 print(f"Status code: {e.response.status_code}")
                 print(f"Response body: {e.response.text}")
+
+
+    def iter_pages_need_rescheduling(self, limit: int | None = None) -> Iterator[dict]:
+        """
+        Streams the pages due for recrawling from the db_reader's NDJSON endpoint
+
+        Pages are yielded as they arrive, so the backlog is never held in memory at once.
+        `db_timeout` applies to each read from the stream, not to the whole stream.
+
+        Args:
+            limit (int, optional): Maximum number of pages to fetch, all due pages if None
+
+        Yields:
+            dict: 'url' and 'depth' of a due page
+
+        Raises:
+            requests.RequestException: If the request fails
+        """
+        db_url = urljoin(self._base_url, '/due_pages')
+        params = {'limit': limit} if limit else None
+
+        with self._session.get(db_url, params=params, timeout=self.db_timeout, stream=True) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
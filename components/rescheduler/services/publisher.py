@@ -1,6 +1,11 @@
 import logging
-from typing import List
-from components.rescheduler.monitoring.metrics import RESCHEDULER_CRAWL_TASKS_PUBLISHED_TOTAL, RESCHEDULER_ERRORS_TOTAL
+
+from components.rescheduler.monitoring.metrics import (
+    RESCHEDULER_CRAWL_TASKS_PUBLISHED_TOTAL,
+    RESCHEDULER_ERRORS_TOTAL,
+    RESCHEDULER_PUBLISH_CONFIRM_LATENCY_SECONDS,
+    RESCHEDULER_PUBLISH_RETRIES_TOTAL,
+)
 from shared.rabbitmq.enums.queue_names import ReschedulerQueueChannels
 from shared.rabbitmq.queue_service import QueueService
 from shared.rabbitmq.schemas.crawling import CrawlTask
@@ -19,36 +24,36 @@ class PublishingService:
         self._logger = logger
 
 
-    def publish_crawl_tasks(self, crawl_tasks: List[CrawlTask]) -> None:
+    def publish_crawl_tasks(self, crawl_tasks: list[CrawlTask]) -> None:
         """
         Publish a list of CrawlTask messages to the 'urls_to_crawl' queue
 
-        Each task is serialized to JSON and sent via the queue service.
-        Logs the total number of tasks published.
+        The tasks are published as one batch with publisher confirms (see
+        `QueueService.publish_batch`), so a task only counts as published once the
+        broker has confirmed it. Nacked tasks are retried.
 
         Args:
             crawl_tasks (List[CrawlTask]): List of CrawlTask Pydantic models to publish
         """
-        successful = 0
-
-        for task in crawl_tasks:
-            try:
-                self._queue_service.publish(
-                    ReschedulerQueueChannels.URLS_TO_CRAWL.value, 
-                    task.model_dump_json()
-                )
-                self._logger.debug("Published Crawl Task: %s", task)
-                successful += 1
-                RESCHEDULER_CRAWL_TASKS_PUBLISHED_TOTAL.labels(
-                    status="success"
-                ).inc()
-
-            except Exception:
-                self._logger.exception("Failed to publish crawl task")
-                RESCHEDULER_ERRORS_TOTAL.inc()
-                RESCHEDULER_CRAWL_TASKS_PUBLISHED_TOTAL.labels(
-                    status="error"
-                ).inc()
-
-        self._logger.info("Successfully published %d out of %d crawl tasks", successful, len(crawl_tasks))
-
+        if not crawl_tasks:
+            return
+
+        try:
+            result = self._queue_service.publish_batch(
+                ReschedulerQueueChannels.URLS_TO_CRAWL.value,
+                [task.model_dump_json() for task in crawl_tasks],
+                observe_confirm_latency=RESCHEDULER_PUBLISH_CONFIRM_LATENCY_SECONDS.observe,
+            )
+        except Exception:
+            self._logger.exception("Failed to publish %d crawl tasks", len(crawl_tasks))
+            RESCHEDULER_ERRORS_TOTAL.inc()
+            RESCHEDULER_CRAWL_TASKS_PUBLISHED_TOTAL.labels(status="error").inc(len(crawl_tasks))
+            return
+
+        RESCHEDULER_CRAWL_TASKS_PUBLISHED_TOTAL.labels(status="success").inc(result.confirmed)
+        RESCHEDULER_PUBLISH_RETRIES_TOTAL.inc(result.retried)
+        if result.failed:
+            RESCHEDULER_ERRORS_TOTAL.inc()
+            RESCHEDULER_CRAWL_TASKS_PUBLISHED_TOTAL.labels(status="error").inc(len(result.failed))
+
+        self._logger.info("Successfully published %d out of %d crawl tasks", result.confirmed, len(crawl_tasks))
@@ -1,16 +1,27 @@
 import logging
+from collections.abc import Iterable, Iterator
+from itertools import islice
 from time import sleep
+
+from components.rescheduler.monitoring.metrics import (
+    RESCHEDULER_ERRORS_TOTAL,
+    RESCHEDULER_PAGES_RESCHEDULED_TOTAL,
+    RESCHEDULER_RESCHEDULE_LATENCY_SECONDS,
+)
 from components.rescheduler.services.db_client import DBReaderClient
 from components.rescheduler.services.publisher import PublishingService
 from shared.rabbitmq.queue_service import QueueService
 from shared.rabbitmq.schemas.save_to_db import CrawlTask
 from shared.utils import get_timestamp_eastern_time
 
-from components.rescheduler.monitoring.metrics import (
-    RESCHEDULER_PAGES_RESCHEDULED_TOTAL,
-    RESCHEDULER_ERRORS_TOTAL,
-    RESCHEDULER_RESCHEDULE_LATENCY_SECONDS,
-)
+
+def batched(items: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    """
+    Splits an iterable into lists of at most `size` items, consuming it lazily
+    """
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
 
 
 class Rescheduler:
@@ -49,23 +60,31 @@ class Rescheduler:
         """
         try:
             with RESCHEDULER_RESCHEDULE_LATENCY_SECONDS.time():
-                pages = self._dbclient.get_pages_need_rescheduling()
-                self._logger.info(pages)
+                batch_size = self.configs.get('rescheduling_batch_size', 500)
+                pages = self._dbclient.iter_pages_need_rescheduling(
+                    limit=self.configs.get('rescheduling_limit')
+                )
 
-                if pages:
-                    RESCHEDULER_PAGES_RESCHEDULED_TOTAL.inc(len(pages))
+                # Published as they stream in, so memory is bounded by the batch size
+                total = 0
+                for batch in batched(pages, batch_size):
+                    RESCHEDULER_PAGES_RESCHEDULED_TOTAL.inc(len(batch))
+                    total += len(batch)
 
+                    scheduled_at = get_timestamp_eastern_time(isoformat=True)
                     tasks = [
                         CrawlTask(
                             url=page['url'],
                             depth=page['depth'],
-                            scheduled_at=get_timestamp_eastern_time(isoformat=True),
+                            scheduled_at=scheduled_at,
                         )
-                        for page in pages
+                        for page in batch
                     ]
-                    
+
                     self._publisher.publish_crawl_tasks(tasks)
-                    
+
+                self._logger.info("Rescheduled %d pages", total)
+
         except Exception:
             self._logger.exception("Rescheduler encountered an unexpected error")
             RESCHEDULER_ERRORS_TOTAL.inc()
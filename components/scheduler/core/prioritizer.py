@@ -0,0 +1,99 @@
+import logging
+import math
+from collections import defaultdict
+from typing import Any
+
+from components.scheduler.monitoring.metrics import SCHEDULER_LINK_PRIORITY_SCORE
+from shared.rabbitmq.schemas.scheduling import LinkData
+from shared.redis.cache_service import CacheService
+
+
+class LinkPrioritizer:
+    """
+    Assigns a crawl priority score to newly scheduled links
+
+    The score combines:
+        - Depth: shallower pages score higher
+        - In-link count: how many times the URL has been discovered so far
+        - OPIC-style cash: every page hands out one unit of cash split evenly across
+          its out-links, so a link from a page with few out-links is worth more
+        - Link type: configurable bonus per `LinkData.link_type`
+
+    In-link counts and cash are accumulated in Redis for every discovered link,
+    including ones already seen, so a URL discovered late is scored with every link to
+    it found so far. Already seen URLs are scored again on every discovery, so the
+    priority of those still queued can be raised as their in-links grow.
+
+    Attributes:
+        _cache (CacheService): Redis-backed store for in-link statistics
+        _weights (dict): Weight per score component
+        _link_type_weights (dict): Bonus per link type
+    """
+
+    def __init__(self, configs: dict[str, Any], cache: CacheService, logger: logging.Logger):
+        priority_configs = configs.get('priority', {})
+
+        self._cache = cache
+        self._logger = logger
+        self._weights = {
+            'depth': 1.0,
+            'inlinks': 1.0,
+            'cash': 1.0,
+            **priority_configs.get('weights', {})
+        }
+        self._link_type_weights = priority_configs.get('link_type_weights', {})
+
+    def score_links(
+        self,
+        discovered_links: list[LinkData],
+        new_links: list[LinkData],
+        seen_links: list[LinkData] | None = None
+    ) -> dict[str, float]:
+        """
+        Records in-link statistics for every discovered link and scores the new and seen ones
+
+        Args:
+            discovered_links (List[LinkData]): Every canonical link in the batch, duplicates included
+            new_links (List[LinkData]): Links that are about to be scheduled
+            seen_links (List[LinkData], optional): Links already scheduled before, to be scored again
+
+        Returns:
+            dict[str, float]: Priority score per URL in `new_links` and `seen_links`
+        """
+        stats = self._cache.batch_record_inlinks(self._inlink_contributions(discovered_links))
+
+        scores = {}
+        for links, observe in ((new_links, True), (seen_links or [], False)):
+            for link in links:
+                inlinks, cash = stats.get(link.url, (0, 0.0))
+                score = self._score(link, inlinks, cash)
+                if observe:
+                    SCHEDULER_LINK_PRIORITY_SCORE.observe(score)
+                scores[link.url] = score
+
+        return scores
+
+    def _inlink_contributions(self, links: list[LinkData]) -> dict[str, tuple[int, float]]:
+        """
+        Aggregates in-link count and OPIC cash per target URL for one batch
+        """
+        out_degree = defaultdict(int)
+        for link in links:
+            out_degree[link.source_page_url] += 1
+
+        contributions = defaultdict(lambda: [0, 0.0])
+        for link in links:
+            entry = contributions[link.url]
+            entry[0] += 1
+            entry[1] += 1.0 / out_degree[link.source_page_url]
+
+        return {url: (count, cash) for url, (count, cash) in contributions.items()}
+
+    def _score(self, link: LinkData, inlinks: int, cash: float) -> float:
+        return round(
+            self._weights['depth'] / (1 + link.depth)
+            + self._weights['inlinks'] * math.log1p(inlinks)
+            + self._weights['cash'] * cash
+            + self._link_type_weights.get(link.link_type, 0.0),
+            6
+        )
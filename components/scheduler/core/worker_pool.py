@@ -0,0 +1,118 @@
+import logging
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Any
+
+from components.scheduler.monitoring.metrics import (
+    SCHEDULER_WORKER_POOL_ACTIVE_TASKS,
+    SCHEDULER_WORKER_POOL_PENDING_TASKS,
+    SCHEDULER_WORKER_POOL_SATURATED_TOTAL,
+    SCHEDULER_WORKER_POOL_SUBMIT_WAIT_SECONDS,
+)
+
+
+class WorkerPool:
+    """
+    Long-lived thread pool shared by every message the scheduler processes
+
+    Threads are created once at service start instead of per message. Submissions
+    are bounded: once `max_workers + max_pending` tasks are in flight, callers block
+    until a slot frees up, so a burst of large pages can't grow the pool's internal
+    queue without limit.
+
+    Attributes:
+        _executor (ThreadPoolExecutor): Underlying executor, alive for the service lifetime
+        _slots (threading.BoundedSemaphore): Caps running + queued tasks
+        _logger (logging.Logger): Logger for diagnostics
+    """
+
+    def __init__(self, max_workers: int, max_pending: int, logger: logging.Logger):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if max_pending < 0:
+            raise ValueError("max_pending must be a non-negative integer")
+
+        self._logger = logger
+        self._max_workers = max_workers
+        self._capacity = max_workers + max_pending
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="scheduler-worker"
+        )
+        self._slots = threading.BoundedSemaphore(self._capacity)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+        self._logger.info(
+            "Worker pool started — %d workers, %d max pending tasks", max_workers, max_pending
+        )
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        Submits a task to the pool, blocking while the pool is saturated
+
+        Returns:
+            Future: The future for the submitted task
+        """
+        if not self._slots.acquire(blocking=False):
+            SCHEDULER_WORKER_POOL_SATURATED_TOTAL.inc()
+            with SCHEDULER_WORKER_POOL_SUBMIT_WAIT_SECONDS.time():
+                self._slots.acquire()
+
+        self._track_in_flight(1)
+        try:
+            future = self._executor.submit(self._run_task, fn, *args, **kwargs)
+        except Exception:
+            self._track_in_flight(-1)
+            self._slots.release()
+            raise
+
+        future.add_done_callback(self._on_task_done)
+        return future
+
+    def map_unordered(self, fn: Callable[..., Any], items: Iterable[Any]) -> list[Any]:
+        """
+        Runs `fn(item, idx)` for every item and collects the results in completion order
+
+        Results that are None are dropped, which lets callers use None as a
+        "filtered out" signal
+
+        Returns:
+            List[Any]: Non-None results from every task
+        """
+        futures = [
+            self.submit(fn, item, idx)
+            for idx, item in enumerate(items, start=1)
+        ]
+
+        results = []
+        for future in as_completed(futures):
+            result = future.result()
+            if result is not None:
+                results.append(result)
+        return results
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stops accepting new tasks and releases the worker threads
+        """
+        self._executor.shutdown(wait=wait)
+        self._logger.info("Worker pool shut down")
+
+    def _run_task(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        SCHEDULER_WORKER_POOL_ACTIVE_TASKS.inc()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            SCHEDULER_WORKER_POOL_ACTIVE_TASKS.dec()
+
+    def _on_task_done(self, _future: Future) -> None:
+        self._track_in_flight(-1)
+        self._slots.release()
+
+    def _track_in_flight(self, delta: int) -> None:
+        with self._lock:
+            self._in_flight += delta
+            pending = max(self._in_flight - self._max_workers, 0)
+        SCHEDULER_WORKER_POOL_PENDING_TASKS.set(pending)
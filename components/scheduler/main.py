@@ -8,13 +8,14 @@ to handle incoming scheduling tasks via RabbitMQ
 import logging
 
 from prometheus_client import start_http_server
-from shared.logging_utils import get_logger
-from shared.rabbitmq.queue_service import QueueService
-from shared.rabbitmq.enums.queue_names import SchedulerQueueChannels
+
 from components.scheduler.services.message_handler import start_schedule_listener
 from components.scheduler.services.schedule_service import ScheduleService
 from shared.configs.config_loader import component_config_loader, global_config_loader
-
+from shared.logging_utils import get_logger
+from shared.rabbitmq.enums.queue_names import SchedulerQueueChannels
+from shared.rabbitmq.queue_service import QueueService
+from shared.redis.frontier import create_frontier
 
 COMPONENT_NAME = "scheduler"
 
@@ -30,14 +31,24 @@ def run():
 
     logger.info("Scheduler service is starting up...")
 
-    queue_service = QueueService(logger, SchedulerQueueChannels.get_values())
+    # Prefetch must cover a full batch, otherwise the broker stops delivering before it fills
+    batch_size = component_configs.get('batching', {}).get('max_messages', 1)
+    queue_service = QueueService(
+        logger, SchedulerQueueChannels.get_values(), prefetch_count=batch_size
+    )
 
     prometheus_port = component_configs.get("monitoring", {}).get("port", 8000)
     start_http_server(prometheus_port)
     logger.info(f"Prometheus metrics exposed on port {prometheus_port}")
 
-    scheduler_service = ScheduleService(component_configs, redis_configs, queue_service, logger)
-    start_schedule_listener(scheduler_service, queue_service, logger)
+    frontier = create_frontier(global_configs, logger)
+    scheduler_service = ScheduleService(
+        component_configs, redis_configs, queue_service, logger, frontier
+    )
+    try:
+        start_schedule_listener(scheduler_service, queue_service, logger, component_configs)
+    finally:
+        scheduler_service.close()
 
 
 if __name__ == "__main__":
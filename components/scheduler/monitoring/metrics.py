@@ -1,4 +1,4 @@
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 
 # Counters
 SCHEDULER_MESSAGES_RECEIVED_TOTAL = Counter(
@@ -31,6 +31,12 @@ SCHEDULER_LINKS_DEDUPLICATED_TOTAL = Counter(
     "Number of links skipped due to being seen in Redis"
 )
 
+# Links dropped because another page in the same batch linked to the same URL
+SCHEDULER_LINKS_COLLAPSED_TOTAL = Counter(
+    "scheduler_links_collapsed_total",
+    "Number of duplicate links collapsed within a batch before reaching Redis"
+)
+
 # Links filtered by domain, depth, robots.txt, etc.
 FILTERED_LINKS_TOTAL = Counter(
     "scheduler_links_filtered_total",
@@ -58,3 +64,49 @@ SCHEDULER_REDIS_ERRORS_TOTAL = Counter(
     "Number of Redis operation failures in scheduler",
     ["operation"]
 )
+
+# Worker pool saturation
+SCHEDULER_WORKER_POOL_ACTIVE_TASKS = Gauge(
+    "scheduler_worker_pool_active_tasks",
+    "Number of link-processing tasks currently running in the worker pool"
+)
+
+SCHEDULER_WORKER_POOL_PENDING_TASKS = Gauge(
+    "scheduler_worker_pool_pending_tasks",
+    "Number of link-processing tasks queued behind busy workers"
+)
+
+SCHEDULER_WORKER_POOL_SATURATED_TOTAL = Counter(
+    "scheduler_worker_pool_saturated_total",
+    "Number of task submissions that had to wait for a free worker pool slot"
+)
+
+SCHEDULER_WORKER_POOL_SUBMIT_WAIT_SECONDS = Histogram(
+    "scheduler_worker_pool_submit_wait_seconds",
+    "Time spent waiting for a free worker pool slot when the pool is saturated"
+)
+
+# Micro-batching consumer
+SCHEDULER_BATCH_MESSAGES = Histogram(
+    "scheduler_batch_messages",
+    "Number of messages flushed together in one scheduling batch",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200)
+)
+
+SCHEDULER_BATCH_FLUSHES_TOTAL = Counter(
+    "scheduler_batch_flushes_total",
+    "Number of scheduling batch flushes by trigger",
+    ["trigger"]
+)
+
+SCHEDULER_BATCH_FALLBACKS_TOTAL = Counter(
+    "scheduler_batch_fallbacks_total",
+    "Failed scheduling batches that were retried one message at a time"
+)
+
+# Crawl frontier priority
+SCHEDULER_LINK_PRIORITY_SCORE = Histogram(
+    "scheduler_link_priority_score",
+    "Priority score assigned to newly scheduled links",
+    buckets=(0.1, 0.25, 0.5, 1, 2, 3, 5, 8, 13)
+)
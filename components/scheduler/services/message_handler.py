@@ -1,18 +1,35 @@
 """
 Message handler for the Scheduler component.
 
-Defines the consumer callback for processing discovered links and sets up
-the RabbitMQ listener to receive scheduling tasks.
+Defines the consumer callbacks for processing discovered links and sets up
+the RabbitMQ listener to receive scheduling tasks. Messages can be handled one
+at a time or micro-batched across pages (see `LinksToScheduleBatchConsumer`).
 """
 
 import logging
 from functools import partial
-
-from components.scheduler.monitoring.metrics import SCHEDULER_MESSAGE_FAILURES_TOTAL, SCHEDULER_MESSAGES_RECEIVED_TOTAL, SCHEDULER_PROCESSING_DURATION_SECONDS
+from typing import Any
+
+import redis.exceptions
+
+from components.scheduler.monitoring.metrics import (
+    SCHEDULER_BATCH_FALLBACKS_TOTAL,
+    SCHEDULER_BATCH_FLUSHES_TOTAL,
+    SCHEDULER_BATCH_MESSAGES,
+    SCHEDULER_MESSAGE_FAILURES_TOTAL,
+    SCHEDULER_MESSAGES_RECEIVED_TOTAL,
+    SCHEDULER_PROCESSING_DURATION_SECONDS,
+)
 from components.scheduler.services.schedule_service import ScheduleService
-from shared.rabbitmq.queue_service import QueueService
 from shared.rabbitmq.enums.queue_names import SchedulerQueueChannels
+from shared.rabbitmq.queue_service import QueueService
 from shared.rabbitmq.schemas.scheduling import ProcessDiscoveredLinks
+from shared.redis.cache_service import REDIS_UNAVAILABLE_ERRORS
+
+# Errors that say Redis is unreachable or the (noeviction) frontier is full, rather
+# than that the message is bad; messages failing with them are requeued instead of
+# dead-lettered
+TRANSIENT_ERRORS = (*REDIS_UNAVAILABLE_ERRORS, redis.exceptions.OutOfMemoryError)
 
 
 def links_to_schedule(ch, method, properties, body, scheduler: ScheduleService, logger: logging.Logger):
@@ -40,30 +57,168 @@ def links_to_schedule(ch, method, properties, body, scheduler: ScheduleService,
         SCHEDULER_MESSAGES_RECEIVED_TOTAL.labels(status="error").inc()
         ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
 
+    except TRANSIENT_ERRORS as e:
+        logger.warning("Redis unavailable, requeueing links to schedule: %s", e)
+        SCHEDULER_MESSAGE_FAILURES_TOTAL.labels(error_type="TransientError").inc()
+        ch.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+
     except Exception:
-        # TODO: Requeue only on transient errors (e.g., database OperationalError)
-        #       Consider adding dead-letter queue handling for persistent failures
+        # TODO: Consider adding dead-letter queue handling for persistent failures
         logger.exception("Unexpected error processing links to schedule")
         SCHEDULER_MESSAGE_FAILURES_TOTAL.labels(error_type="ValueError").inc()
         SCHEDULER_MESSAGES_RECEIVED_TOTAL.labels(status="error").inc()
         ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
 
 
-def start_schedule_listener(scheduler_service: ScheduleService, queue_service: QueueService, logger: logging.Logger):
+class LinksToScheduleBatchConsumer:
+    """
+    Micro-batching consumer for the `links_to_schedule` queue
+
+    Buffers ProcessDiscoveredLinks messages from many pages and flushes them to the
+    scheduler as a single batch once `max_messages` are buffered or `max_wait_ms`
+    has passed since the first buffered message. A successful flush is acknowledged
+    with one `basic_ack(multiple=True)`. A failed one is requeued as a whole if Redis
+    was unreachable, and otherwise retried one message at a time so only the messages
+    that fail on their own are rejected.
+
+    Invalid messages are rejected immediately and never enter the buffer.
+    """
+
+    def __init__(
+        self,
+        scheduler: ScheduleService,
+        queue_service: QueueService,
+        configs: dict[str, Any],
+        logger: logging.Logger
+    ):
+        batching = configs.get('batching', {})
+        self._max_messages = max(int(batching.get('max_messages', 1)), 1)
+        self._max_wait_seconds = batching.get('max_wait_ms', 500) / 1000
+
+        self._scheduler = scheduler
+        self._queue_service = queue_service
+        self._logger = logger
+
+        self._tasks: list[ProcessDiscoveredLinks] = []
+        self._delivery_tags: list[int] = []
+        self._channel = None
+        self._flush_timer = None
+
+    def on_message(self, ch, method, properties, body):
+        """
+        pika callback: validates the message and adds it to the current batch
+        """
+        try:
+            message_str = body.decode('utf-8')
+            task = ProcessDiscoveredLinks.model_validate_json(message_str)
+
+        except ValueError as e:
+            self._logger.error("Message Skipped - Invalid task message: %s", e)
+            SCHEDULER_MESSAGE_FAILURES_TOTAL.labels(error_type="ValueError").inc()
+            SCHEDULER_MESSAGES_RECEIVED_TOTAL.labels(status="error").inc()
+            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+            return
+
+        self._tasks.append(task)
+        self._delivery_tags.append(method.delivery_tag)
+        self._channel = ch
+
+        if len(self._tasks) >= self._max_messages:
+            self.flush(trigger="size")
+        elif self._flush_timer is None:
+            self._flush_timer = self._queue_service.call_later(
+                self._max_wait_seconds, self._on_flush_timer
+            )
+
+    def flush(self, trigger: str = "manual"):
+        """
+        Processes every buffered message as one batch and settles them with a single multi-ack
+        """
+        self._cancel_flush_timer()
+
+        if not self._tasks:
+            return
+
+        tasks, self._tasks = self._tasks, []
+        delivery_tags, self._delivery_tags = self._delivery_tags, []
+
+        SCHEDULER_BATCH_FLUSHES_TOTAL.labels(trigger=trigger).inc()
+        SCHEDULER_BATCH_MESSAGES.observe(len(tasks))
+
+        try:
+            with SCHEDULER_PROCESSING_DURATION_SECONDS.labels("total_latency").time():
+                self._scheduler.process_batch(tasks)
+
+            SCHEDULER_MESSAGES_RECEIVED_TOTAL.labels(status="valid").inc(len(tasks))
+            self._channel.basic_ack(delivery_tag=delivery_tags[-1], multiple=True)
+
+        except TRANSIENT_ERRORS as e:
+            self._logger.warning("Redis unavailable, requeueing batch of %d messages: %s", len(tasks), e)
+            SCHEDULER_MESSAGE_FAILURES_TOTAL.labels(error_type="TransientError").inc()
+            self._channel.basic_nack(delivery_tag=delivery_tags[-1], multiple=True, requeue=True)
+
+        except Exception:
+            self._logger.exception("Batch of %d messages failed, retrying one by one", len(tasks))
+            SCHEDULER_BATCH_FALLBACKS_TOTAL.inc()
+            self._process_one_by_one(tasks, delivery_tags)
+
+    def _process_one_by_one(self, tasks: list[ProcessDiscoveredLinks], delivery_tags: list[int]):
+        for task, delivery_tag in zip(tasks, delivery_tags):
+            try:
+                self._scheduler.process_batch([task])
+                SCHEDULER_MESSAGES_RECEIVED_TOTAL.labels(status="valid").inc()
+                self._channel.basic_ack(delivery_tag=delivery_tag)
+
+            except TRANSIENT_ERRORS as e:
+                self._logger.warning("Redis unavailable, requeueing message: %s", e)
+                SCHEDULER_MESSAGE_FAILURES_TOTAL.labels(error_type="TransientError").inc()
+                self._channel.basic_nack(delivery_tag=delivery_tag, requeue=True)
+
+            except Exception:
+                self._logger.exception("Error processing links to schedule")
+                SCHEDULER_MESSAGE_FAILURES_TOTAL.labels(error_type="UnexpectedError").inc()
+                SCHEDULER_MESSAGES_RECEIVED_TOTAL.labels(status="error").inc()
+                self._channel.basic_nack(delivery_tag=delivery_tag, requeue=False)
+
+    def _on_flush_timer(self):
+        self._flush_timer = None
+        self.flush(trigger="timeout")
+
+    def _cancel_flush_timer(self):
+        if self._flush_timer is not None:
+            self._queue_service.remove_timeout(self._flush_timer)
+            self._flush_timer = None
+
+
+def start_schedule_listener(
+    scheduler_service: ScheduleService,
+    queue_service: QueueService,
+    logger: logging.Logger,
+    configs: dict[str, Any] | None = None
+):
     """
     Initializes RabbitMQ consumer for scheduling messages.
 
-    Binds the `links_to_schedule` callback with the required scheduler service
-    and logger, and begins consuming messages from the relevant queue.
+    When `batching.max_messages` is greater than 1 in the component configs, messages
+    are micro-batched through `LinksToScheduleBatchConsumer`. Otherwise the
+    `links_to_schedule` callback handles each message on its own.
     """
-    links_to_schedule_partial = partial(
-        links_to_schedule, scheduler=scheduler_service, logger=logger
-    )
+    batching = (configs or {}).get('batching', {})
+
+    if batching.get('max_messages', 1) > 1:
+        batch_consumer = LinksToScheduleBatchConsumer(
+            scheduler_service, queue_service, configs, logger
+        )
+        on_message_callback = batch_consumer.on_message
+    else:
+        on_message_callback = partial(
+            links_to_schedule, scheduler=scheduler_service, logger=logger
+        )
 
     # TODO: Replace direct access to _channel with a public consume method on QueueService
     queue_service._channel.basic_consume(
         queue=SchedulerQueueChannels.LINKS_TO_SCHEDULE.value,
-        on_message_callback=links_to_schedule_partial,
+        on_message_callback=on_message_callback,
         auto_ack=False
     )
 
@@ -3,28 +3,38 @@ Publishes messages from the Scheduler component to appropriate RabbitMQ queues
 
 Handles serialization and routing of:
     - Processed links for database storage
-    - Scheduling newly discovered links for future crawling
+    - Scheduling newly discovered links for future crawling (via the db_writer,
+      or straight into the Redis frontier when that backend is enabled)
 """
 
 import logging
-from typing import List
-from components.scheduler.monitoring.metrics import SCHEDULER_PUBLISHED_MESSAGES_TOTAL, SCHEDULER_LINKS_SCHEDULED_TOTAL
+
+from components.scheduler.monitoring.metrics import (
+    SCHEDULER_LINKS_SCHEDULED_TOTAL,
+    SCHEDULER_PUBLISHED_MESSAGES_TOTAL,
+)
 from shared.rabbitmq.enums.queue_names import SchedulerQueueChannels
+from shared.rabbitmq.queue_service import QueueService
 from shared.rabbitmq.schemas.crawling import CrawlTask
+from shared.rabbitmq.schemas.save_to_db import (
+    PriorityUpdate,
+    SaveLinksToSchedule,
+    SaveProcessedLinks,
+)
 from shared.rabbitmq.schemas.scheduling import LinkData
-from shared.rabbitmq.schemas.save_to_db import SaveProcessedLinks, SaveLinksToSchedule
-from shared.rabbitmq.queue_service import QueueService
+from shared.redis.frontier import RedisFrontier
 from shared.utils import get_timestamp_eastern_time
 
 
 class PublishingService:
-    def __init__(self, queue_service: QueueService, logger: logging.Logger):
+    def __init__(self, queue_service: QueueService, logger: logging.Logger, frontier: RedisFrontier | None = None):
         self._queue_service = queue_service
         self._logger = logger
+        self._frontier = frontier
 
 
     # TODO: Implement retry mechanism or dead-letter
-    def publish_save_processed_links(self, links_to_save: List[LinkData]):
+    def publish_save_processed_links(self, links_to_save: list[LinkData]):
         """
         Publishes a list of processed links to the database writer queue
 
@@ -56,35 +66,63 @@ class PublishingService:
             ).inc()
 
 
-    # TODO: Implement retry mechanism and dead-letter
-    def publish_links_to_schedule(self, links_to_crawl: List[LinkData]):
+    def publish_links_to_schedule(
+        self,
+        links_to_crawl: list[LinkData],
+        priorities: dict[str, float] | None = None,
+        priority_updates: dict[str, float] | None = None
+    ):
         """
-        Publishes a list of links to schedule to the database writer queue
+        Publishes a list of links to schedule to the database writer queue, or pushes
+        them directly into the Redis frontier when one is configured
+
+        `priority_updates` raise the priority of already scheduled URLs that are still
+        queued, in the same message (or frontier round trip) as the new links.
+
+        The links are already claimed in the seen set, so failures are re-raised for
+        the batch to be retried rather than logged and lost. This includes a full
+        frontier, which runs with `noeviction` and refuses writes with an OOM error.
 
         Args:
             links_to_crawl (List[LinkData]): Links to schedule for crawling
+            priorities (Optional[dict[str, float]]): Crawl priority per URL, missing URLs default to 0
+            priority_updates (Optional[dict[str, float]]): New priority per already scheduled URL
+
+        Raises:
+            Exception: Any publishing or frontier error
         """
-        if not links_to_crawl:
+        priority_updates = priority_updates or {}
+        if not links_to_crawl and not priority_updates:
             self._logger.warning("No links provided to publish_links_to_schedule - skipping publish")
             return
         try:
-        
+            priorities = priorities or {}
             scheduled_links = []
             
             for link in links_to_crawl:
                 task = CrawlTask(
                     url=link.url,
                     scheduled_at=get_timestamp_eastern_time(isoformat=True),
-                    depth=link.depth
+                    depth=link.depth,
+                    priority=priorities.get(link.url, 0.0)
                 )
                 scheduled_links.append(task)
                 # SCHEDULER_LINKS_SCHEDULED_TOTAL.inc()
 
-            message = SaveLinksToSchedule(links=scheduled_links)
+            if self._frontier:
+                self._frontier.push_links(scheduled_links)
+                self._frontier.raise_priorities(priority_updates)
+            else:
+                message = SaveLinksToSchedule(
+                    links=scheduled_links,
+                    priority_updates=[
+                        PriorityUpdate(url=url, priority=priority) for url, priority in priority_updates.items()
+                    ]
+                )
 
-            self._queue_service.publish(
-                SchedulerQueueChannels.ADD_LINKS_TO_SCHEDULE.value, 
-                message.model_dump_json())
+                self._queue_service.publish(
+                    SchedulerQueueChannels.ADD_LINKS_TO_SCHEDULE.value, 
+                    message.model_dump_json())
             
             self._logger.info("Published: %s Links Scheduled", len(scheduled_links))
             SCHEDULER_LINKS_SCHEDULED_TOTAL.inc(len(scheduled_links))
@@ -92,7 +130,10 @@ class PublishingService:
                 status="success"
             ).inc()
         except Exception as e:
-            self._logger.error("Unexpected error occurred: %s", e)
+            self._logger.error(
+                "Scheduling %d links (%d priority updates) failed: %s", len(links_to_crawl), len(priority_updates), e
+            )
             SCHEDULER_PUBLISHED_MESSAGES_TOTAL.labels(
                 status="error"
             ).inc()
+            raise
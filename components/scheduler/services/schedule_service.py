@@ -1,17 +1,22 @@
 import logging
-from typing import List, Optional
+
+import redis.exceptions
+
+from components.scheduler.core.filter import FilteringService, LinkData
+from components.scheduler.core.prioritizer import LinkPrioritizer
+from components.scheduler.core.worker_pool import WorkerPool
 from components.scheduler.monitoring.metrics import (
+    SCHEDULER_LINKS_COLLAPSED_TOTAL,
     SCHEDULER_LINKS_DEDUPLICATED_TOTAL,
     SCHEDULER_LINKS_RECEIVED_TOTAL,
     SCHEDULER_PROCESSING_DURATION_SECONDS,
-
 )
-from shared.rabbitmq.schemas.scheduling import ProcessDiscoveredLinks
-from shared.redis.cache_service import CacheService
-from shared.rabbitmq.queue_service import QueueService
-from components.scheduler.core.filter import FilteringService, LinkData
 from components.scheduler.services.publisher import PublishingService
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from shared.rabbitmq.queue_service import QueueService
+from shared.rabbitmq.schemas.scheduling import ProcessDiscoveredLinks
+from shared.redis.cache_service import REDIS_UNAVAILABLE_ERRORS, CacheService
+from shared.redis.frontier import RedisFrontier
+from shared.url_canonicalizer import DEFAULT_BASE_URL, canonicalize_url
 
 
 class ScheduleService:
@@ -19,103 +24,202 @@ class ScheduleService:
     Service responsible for processing discovered links before they are scheduled for crawling
 
     Includes:
-        - Redis-based deduplication
+        - URL canonicalization (shared with the parser)
+        - In-batch collapsing of duplicate URLs across pages
+        - Redis-based deduplication (one pipelined round trip per batch)
+        - Priority scoring for the crawl frontier, raising the priority of queued URLs
+          as they are discovered again
         - Filtering (depth, domain, prefix, robots.txt)
-        - Parallel processing for performance
+        - Parallel processing on a long-lived worker pool
         - Publishing to downstream queues
     """
     
     # TODO: remove docstrings from all __init__ methods
-    def __init__(self, component_configs, redis_configs, queue_service: QueueService, logger: logging.Logger):
+    def __init__(
+        self,
+        component_configs,
+        redis_configs,
+        queue_service: QueueService,
+        logger: logging.Logger,
+        frontier: RedisFrontier | None = None
+    ):
         self.configs = component_configs
         self._logger = logger
         self._queue_service = queue_service
         self.cache = CacheService(redis_configs, logger)
-        self._publisher = PublishingService(queue_service, logger)
+        self._publisher = PublishingService(queue_service, logger, frontier)
         self.filter = FilteringService(component_configs, logger)
+        self._prioritizer = LinkPrioritizer(component_configs, self.cache, logger)
+        self._base_url = component_configs.get('wikipedia', {}).get('base_url', DEFAULT_BASE_URL)
+
+        # Created once and shared by every message, instead of one executor per page
+        pool_configs = component_configs.get('worker_pool', {})
+        self._worker_pool = WorkerPool(
+            max_workers=component_configs['max_workers'],
+            max_pending=pool_configs.get('max_pending_tasks', 1000),
+            logger=logger
+        )
 
         self._logger.debug("Scheduler service initialized.")
 
 
-    def process_links(self, page_links: ProcessDiscoveredLinks)  -> None:
+    def close(self) -> None:
+        """
+        Releases the worker pool threads. Call once on service shutdown
         """
-        Orchestrates processing of discovered links from a parsed page
+        self._worker_pool.shutdown()
 
-        Filters out invalid or duplicate links, deduplicates via Redis, and
-        publishes valid links to downstream services
+    def process_links(self, page_links: ProcessDiscoveredLinks)  -> None:
+        """
+        Orchestrates processing of discovered links from a single parsed page
 
         Args:
             page_links (ProcessDiscoveredLinks): All links discovered on a page awaiting processing
         """
-        total_links = len(page_links.links)
+        self.process_batch([page_links])
+
+    def process_batch(self, pages: list[ProcessDiscoveredLinks]) -> None:
+        """
+        Orchestrates processing of links discovered across one or more parsed pages
+
+        Collapses duplicate URLs across the whole batch, filters out invalid links,
+        deduplicates the rest via Redis in a single round trip, and publishes the
+        valid links to downstream services as one message per queue
+
+        If anything fails after the links were claimed in the seen set, they are
+        released before the error is re-raised, so retrying the batch (or its messages
+        one by one) schedules them instead of skipping them as already seen
+
+        Args:
+            pages (List[ProcessDiscoveredLinks]): Link sets from every page in the batch
+        """
+        all_links = [link for page in pages for link in page.links]
+        total_links = len(all_links)
         SCHEDULER_LINKS_RECEIVED_TOTAL.inc(total_links)
-        
-        unseen_links = self._get_unseen_links(page_links.links)
-        valid_links = self._process_links_concurrently(unseen_links)
 
-        self._logger.info("Link Processing Completed — %d valid out of %d",
-                      len(valid_links), total_links)
+        canonical_links = self._canonicalize_links(all_links)
+        unique_links = self._collapse_duplicates(canonical_links)
+        candidate_links = self._filter_links_concurrently(unique_links)
+        valid_links = self._claim_unseen_links(candidate_links)
+        try:
+            valid_urls = {link.url for link in valid_links}
+            seen_links = [link for link in candidate_links if link.url not in valid_urls]
+            priorities = self._score_links(canonical_links, candidate_links, valid_links, seen_links)
 
+            self._logger.info("Link Processing Completed — %d valid out of %d (%d pages)",
+                          len(valid_links), total_links, len(pages))
 
-        if not valid_links:
-            self._logger.info("No valid links found — skipping publish")
-            return
+            priority_updates = {url: priority for url, priority in priorities.items() if url not in valid_urls}
+            if not valid_links and not priority_updates:
+                self._logger.info("No valid links found — skipping publish")
+                return
 
-        self._publish_valid_links(valid_links)
+            self._publish_valid_links(valid_links, priorities, priority_updates)
+        except Exception:
+            self._release_claimed_links(valid_links)
+            raise
 
-    def _get_unseen_links(self, all_links: List[LinkData]) -> List[LinkData]:
-        all_urls = [link.url for link in all_links]
+    def _canonicalize_links(self, links: list[LinkData]) -> list[LinkData]:
+        """
+        Rewrites every link URL into its canonical form so spelling variants of the
+        same article share one Redis key. Links that can't be parsed are dropped
+        """
+        canonical_links = []
+        for link in links:
+            try:
+                url = canonicalize_url(link.url, self._base_url)
+            except ValueError:
+                self._logger.warning("Dropping unparseable link: %s", link.url)
+                continue
+
+            canonical_links.append(
+                link if url == link.url else link.model_copy(update={'url': url})
+            )
+        return canonical_links
+
+    def _collapse_duplicates(self, all_links: list[LinkData]) -> list[LinkData]:
+        """
+        Keeps one link per URL, preferring the shallowest depth. Hub pages are linked
+        from most pages in a batch, so this removes them before they reach Redis
+        """
+        unique: dict[str, LinkData] = {}
+        for link in all_links:
+            kept = unique.get(link.url)
+            if kept is None or link.depth < kept.depth:
+                unique[link.url] = link
 
-        try:
-            with SCHEDULER_PROCESSING_DURATION_SECONDS.labels("deduplication").time():
-                seen_flags = self.cache.batch_is_seen_url(all_urls)
-                unseen_links = [link for link, seen in zip(all_links, seen_flags) if not seen]
+        SCHEDULER_LINKS_COLLAPSED_TOTAL.inc(len(all_links) - len(unique))
+        return list(unique.values())
 
-                deduplicated_count = len(all_links) - len(unseen_links)
+    def _claim_unseen_links(self, links: list[LinkData]) -> list[LinkData]:
+        if not links:
+            return []
 
-                # Increment the metric by however many URLs were dropped because they had already
-                # been processed before
-                SCHEDULER_LINKS_DEDUPLICATED_TOTAL.inc(deduplicated_count)
+        with SCHEDULER_PROCESSING_DURATION_SECONDS.labels("deduplication").time():
+            added_flags = self.cache.batch_add_to_seen_set([link.url for link in links])
+            unseen_links = [link for link, added in zip(links, added_flags) if added]
 
-                return unseen_links
-        
+        # Increment the metric by however many URLs were dropped because they had already
+        # been processed before
+        SCHEDULER_LINKS_DEDUPLICATED_TOTAL.inc(len(links) - len(unseen_links))
+        return unseen_links
+
+    def _release_claimed_links(self, links: list[LinkData]) -> None:
+        try:
+            self.cache.batch_remove_from_seen_set([link.url for link in links])
+        except redis.exceptions.RedisError:
+            # The batch is retried anyway, but these links will be skipped as already seen
+            self._logger.exception("Could not release %d claimed links", len(links))
+
+    def _score_links(
+        self,
+        canonical_links: list[LinkData],
+        candidate_links: list[LinkData],
+        valid_links: list[LinkData],
+        seen_links: list[LinkData]
+    ) -> dict[str, float]:
+        """
+        Scores the links about to be scheduled and the already seen ones, whose priority
+        is raised if they are still queued. In-link statistics are recorded for every
+        link that passed the filters. Scoring errors fall
+        back to the default priority, except Redis being unreachable, which fails the batch
+        """
+        candidate_urls = {link.url for link in candidate_links}
+        discovered = [link for link in canonical_links if link.url in candidate_urls]
+
+        try:
+            with SCHEDULER_PROCESSING_DURATION_SECONDS.labels("prioritization").time():
+                return self._prioritizer.score_links(discovered, valid_links, seen_links)
+        except REDIS_UNAVAILABLE_ERRORS:
+            raise
         except Exception:
-            self._logger.exception("Redis batch seen check failed")
-            return all_links  # fail-safe
+            self._logger.exception("Link prioritization failed — scheduling with default priority")
+            return {}
 
-    def _process_single_link(self, link: LinkData, idx: int) -> Optional[LinkData]:
+    def _filter_single_link(self, link: LinkData, idx: int) -> LinkData | None:
         try:
             if self.filter.is_filtered(link):
                 return None
-            if not self.cache.add_to_seen_set(link.url):
-                return None
             return link
         
         except Exception:
-            self._logger.exception("Error processing link %d (%s)", idx, link.url)
+            self._logger.exception("Error filtering link %d (%s)", idx, link.url)
             return None
 
-    def _process_links_concurrently(self, links: List[LinkData]) -> List[LinkData]:
-        valid_links = []
+    def _filter_links_concurrently(self, links: list[LinkData]) -> list[LinkData]:
+        return self._worker_pool.map_unordered(self._filter_single_link, links)
 
-        with ThreadPoolExecutor(max_workers=self.configs['max_workers']) as executor:
-            futures = [
-                executor.submit(self._process_single_link, link, idx)
-                for idx, link in enumerate(links, start=1)
-            ]
+    def _publish_valid_links(
+        self,
+        links: list[LinkData],
+        priorities: dict[str, float],
+        priority_updates: dict[str, float]
+    ) -> None:
+        self._logger.info("Publishing %d valid links (%d priority updates)", len(links), len(priority_updates))
 
-            for future in as_completed(futures):
-                result = future.result()
-                if result:
-                    valid_links.append(result)
-                    
-        return valid_links
-
-    def _publish_valid_links(self, links: List[LinkData]) -> None:
-        self._logger.info("Publishing %d valid links", len(links))
-        
-        with SCHEDULER_PROCESSING_DURATION_SECONDS.labels("publish_save_processed_links").time():
-            self._publisher.publish_save_processed_links(links)
+        if links:
+            with SCHEDULER_PROCESSING_DURATION_SECONDS.labels("publish_save_processed_links").time():
+                self._publisher.publish_save_processed_links(links)
 
         with SCHEDULER_PROCESSING_DURATION_SECONDS.labels("publish_links_to_schedule").time():
-            self._publisher.publish_links_to_schedule(links)
\ No newline at end of file
+            self._publisher.publish_links_to_schedule(links, priorities, priority_updates)
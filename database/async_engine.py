@@ -0,0 +1,109 @@
+"""
+Asyncio engine for async services (the db_reader)
+
+Kept apart from database.engine so services that only use the sync engine don't need
+an async driver (asyncpg, greenlet) installed. Engines are built from the same
+engine profiles, see database.engine.DEFAULT_ENGINE_PROFILE.
+"""
+
+import asyncio
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+
+from database.engine import (
+    DATABASE_URL,
+    DEFAULT_ENGINE_PROFILE,
+    _set_statement_timeout_per_transaction,
+    _timed_pool_class,
+    load_engine_profile,
+)
+
+
+def build_async_engine(
+    profile: dict[str, Any] | None = None,
+    observe_checkout_wait: Callable[[float], None] | None = None,
+    url: str | None = None
+) -> AsyncEngine:
+    """
+    Creates an asyncio engine on asyncpg from an engine profile (see DEFAULT_ENGINE_PROFILE)
+
+    DATABASE_URL's driver is swapped for asyncpg, so both engines share one setting.
+    The executemany and stream_results keys only apply to sync engines and are ignored.
+
+    Args:
+        profile (dict[str, Any], optional): Profile as returned by `load_engine_profile`
+        observe_checkout_wait (Callable[[float], None], optional): Called with the seconds every
+            pool checkout waited for a connection
+        url (str, optional): Database URL, defaults to DATABASE_URL
+    """
+    profile = {**DEFAULT_ENGINE_PROFILE, **(profile or {})}
+    async_url = make_url(url or DATABASE_URL).set(drivername="postgresql+asyncpg")
+    base_pool = NullPool if profile['pgbouncer'] else AsyncAdaptedQueuePool
+
+    kwargs = {
+        'echo': False,
+        'poolclass': _timed_pool_class(base_pool, observe_checkout_wait) if observe_checkout_wait else base_pool,
+        'pool_pre_ping': profile['pool_pre_ping'],
+    }
+    if profile['pgbouncer']:
+        # PgBouncer in transaction mode can't keep prepared statements across transactions
+        kwargs['connect_args'] = {'statement_cache_size': 0}
+        async_url = async_url.update_query_dict({'prepared_statement_cache_size': '0'})
+    else:
+        kwargs.update(
+            pool_size=profile['pool_size'],
+            max_overflow=profile['max_overflow'],
+            pool_timeout=profile['pool_timeout'],
+            pool_recycle=profile['pool_recycle'],
+        )
+        if profile['statement_timeout_ms']:
+            kwargs['connect_args'] = {
+                'server_settings': {'statement_timeout': str(int(profile['statement_timeout_ms']))}
+            }
+
+    new_engine = create_async_engine(async_url, **kwargs)
+
+    if profile['statement_timeout_ms'] and profile['pgbouncer']:
+        _set_statement_timeout_per_transaction(new_engine.sync_engine, int(profile['statement_timeout_ms']))
+
+    return new_engine
+
+
+def configure_async_engine(
+    component_configs: dict[str, Any] | None = None,
+    observe_checkout_wait: Callable[[float], None] | None = None
+) -> AsyncEngine:
+    """
+    Builds the async engine from the component's engine profile and binds AsyncSessionLocal to it
+
+    Must be called from the event loop that will use the engine (e.g. an app's startup).
+
+    Returns:
+        AsyncEngine: The new engine
+    """
+    global async_engine
+    async_engine = build_async_engine(load_engine_profile(component_configs), observe_checkout_wait)
+    AsyncSessionLocal.configure(bind=async_engine)
+    return async_engine
+
+
+async def warm_up_pool(target: AsyncEngine, connections: int) -> None:
+    """
+    Opens `connections` pooled connections concurrently so the first requests don't pay
+    for connection setup (TLS, auth, server_settings)
+    """
+    async def ping():
+        async with target.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(ping() for _ in range(connections)))
+
+
+# Bound by configure_async_engine once the service's event loop is running
+async_engine: AsyncEngine | None = None
+AsyncSessionLocal = async_sessionmaker(expire_on_commit=False)
@@ -0,0 +1,32 @@
+"""
+Compression codec for the `text_contents` content store
+
+Rows record the codec they were written with, so the level (or the codec itself)
+can change without rewriting existing rows.
+"""
+
+import zstandard
+
+COMPRESSION_ZSTD = "zstd"
+
+ZSTD_LEVEL = 3
+
+
+def compress_text(text: str) -> bytes:
+    """
+    Compresses article text with zstd
+    """
+    # zstd contexts aren't thread safe, so one is created per call (they are cheap)
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(text.encode("utf-8"))
+
+
+def decompress_text(data: bytes, compression: str = COMPRESSION_ZSTD) -> str:
+    """
+    Restores text stored in `text_contents.compressed_text`
+
+    Raises:
+        ValueError: If the codec is unknown
+    """
+    if compression != COMPRESSION_ZSTD:
+        raise ValueError(f"Unknown text compression: {compression}")
+    return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
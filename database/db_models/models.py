@@ -1,20 +1,32 @@
-from shared.rabbitmq.enums.crawl_status import CrawlStatus
-from sqlalchemy.orm import declarative_base, relationship
 from sqlalchemy import (
     BigInteger,
     Boolean,
+    Column,
     DateTime,
-    Enum as SqlEnum,
+    Float,
     ForeignKey,
     Index,
-    Column,
     Integer,
+    LargeBinary,
     String,
     Table,
     Text,
     UniqueConstraint,
     func,
+    text,
 )
+from sqlalchemy import (
+    Enum as SqlEnum,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import declarative_base, relationship
+
+from database.partitioning import (
+    PARTITIONING_ENABLED,
+    links_table_kwargs,
+    scheduled_links_table_kwargs,
+)
+from shared.rabbitmq.enums.crawl_status import CrawlStatus
 
 Base = declarative_base()
 
@@ -31,18 +43,43 @@ crawl_status_enum = SqlEnum(
 """****  TABLE DEFINITIONS  ****"""
 
 
+class Url(Base):
+    """
+    Dictionary of every URL stored by the system, so the large tables can reference
+    a BIGINT instead of repeating (and indexing) 2048-character strings.
+
+    Fields:
+        - url: The URL itself (not indexed).
+        - url_hash: SHA-256 hex digest of the URL (same as `shared.utils.create_hash`),
+          the fixed-width unique lookup key.
+
+    Referenced by:
+        - pages.url_id, links.source_url_id / links.target_url_id, scheduled_links.url_id
+    """
+    __tablename__ = "urls"
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    url = Column(String(2048), nullable=False)
+    url_hash = Column(String(64), unique=True, nullable=False)
+
+
+
 class Page(Base):
     """
     Represents a crawled web page and stores crawl-related metadata.
 
     Fields:
         - url: Unique URL of the page.
+        - url_id: Interned ID of `url` in the urls table.
         - last_crawl_status: Result of the most recent crawl attempt.
         - http_status_code: HTTP response status from last crawl.
         - url_hash, html_content_hash: Help detect duplicate or changed pages.
         - compressed_filepath: Filepath to stored HTML content.
         - last_crawled_at, next_crawl_at: Crawl scheduling.
         - total_crawl_attempts, failed_crawl_attempts: Retry tracking.
+        - change_checks, changes_detected, change_observed_seconds: Decayed counts of
+          recrawls compared with the previous crawl, of those that found the content
+          changed, and the time they covered (see components.db_writer.core.recrawl_policy).
+        - recrawl_interval_seconds: Interval `next_crawl_at` was last set with.
         - last_error_seen: Optional crawl failure info.
         - created_at, updated_at: Timestamps.
     
@@ -54,6 +91,7 @@ class Page(Base):
     id = Column(BigInteger, primary_key=True, autoincrement=True)
 
     url = Column(String(2048), unique=True, nullable=False)
+    url_id = Column(BigInteger, ForeignKey("urls.id"), unique=True, nullable=True)
     last_crawl_status = Column(
         crawl_status_enum,
         nullable=False,
@@ -76,6 +114,13 @@ class Page(Base):
     total_crawl_attempts = Column(Integer, nullable=False, default=1)
     failed_crawl_attempts = Column(Integer, nullable=False, default=0)
 
+    # Change history for adaptive recrawl intervals, NULL until the db_writer's recrawl
+    # policy first compares two crawls of the page
+    change_checks = Column(Float, nullable=True)
+    changes_detected = Column(Float, nullable=True)
+    change_observed_seconds = Column(Float, nullable=True)
+    recrawl_interval_seconds = Column(Float, nullable=True)
+
     last_error_seen = Column(String(2048), nullable=True)
 
     created_at = Column(
@@ -100,7 +145,11 @@ class Page(Base):
     __table_args__ = (
         Index("idx_pages_url", "url"),
         Index("idx_last_crawled", "last_crawled_at"),
-        # Index("idx_next_crawl", "next_crawl_at"),
+        # Serves the keyset scan of due pages: ORDER BY next_crawl_at, id
+        Index(
+            "idx_pages_next_crawl", "next_crawl_at", "id",
+            postgresql_where=text("next_crawl_at IS NOT NULL")
+        ),
         Index("idx_last_crawl_status", "last_crawl_status"),
     )
 
@@ -114,6 +163,7 @@ class Link(Base):
 
     Fields:
         - url: Target URL the link points to.
+        - source_url_id, target_url_id: Interned IDs of source_page_url and url.
         - depth: Distance from seed page.
         - is_internal: Whether it's in-domain.
         - anchor_text, id/rel/title/link_type: HTML attributes.
@@ -130,6 +180,11 @@ class Link(Base):
         primary_key=True,
     )
     url = Column(String(2048), primary_key=True)
+
+    # Interned IDs of source_page_url / url, used by link-graph queries
+    source_url_id = Column(BigInteger, ForeignKey("urls.id"), nullable=True)
+    target_url_id = Column(BigInteger, ForeignKey("urls.id"), nullable=True)
+
     depth = Column(Integer, nullable=False)
 
     is_internal = Column(Boolean, nullable=False)
@@ -156,6 +211,15 @@ class Link(Base):
 
     __table_args__ = (
         Index("idx_source_page_id", "source_page_url"),
+        # Out-links by source, and the (source, target) pair that becomes the key once
+        # the string columns are retired
+        Index("idx_links_source_target_url_id", "source_url_id", "target_url_id"),
+        # In-links by target
+        Index("idx_links_target_url_id", "target_url_id"),
+        # Links created since the last link graph snapshot (BRIN: rows arrive in created_at order)
+        Index("idx_links_created_at", "created_at", postgresql_using="brin"),
+        # HASH (source_page_url) when partitioning is enabled, see database.partitioning
+        links_table_kwargs(),
     )
 
 
@@ -165,21 +229,36 @@ class ScheduledLinks(Base):
 
     Fields:
         - url: The URL to crawl.
+        - url_id: Interned ID of `url` in the urls table.
         - depth: Crawl depth of this link.
+        - priority: Frontier score assigned by the scheduler (higher is crawled first).
         - scheduled_at: Timestamp when it was scheduled.
     
     Used by:
         - Scheduler to queue links.
-        - Dispatcher to convert queued links into crawl tasks.
+        - Dispatcher to convert queued links into crawl tasks, highest priority first.
+
+    When partitioning is enabled the table is RANGE partitioned on scheduled_at, so
+    scheduled_at joins the primary key and url is no longer unique (see database.partitioning).
     """
     __tablename__ = "scheduled_links"
     id = Column(BigInteger, primary_key=True, autoincrement=True)
-    url = Column(String(2048), unique=True, nullable=False)
+    url = Column(String(2048), unique=not PARTITIONING_ENABLED, nullable=False)
+    url_id = Column(BigInteger, ForeignKey("urls.id"), nullable=True)
     depth = Column(Integer, nullable=False)
+    priority = Column(Float, nullable=False, default=0.0, server_default="0")
     scheduled_at = Column(
         DateTime(timezone=True),
         server_default=func.now(),
         nullable=False,
+        primary_key=PARTITIONING_ENABLED,
+    )
+
+    __table_args__ = (
+        # Serves the top-k pop: ORDER BY priority DESC, id LIMIT k
+        Index("idx_scheduled_links_priority", priority.desc(), id),
+        *([Index("idx_scheduled_links_url", url)] if PARTITIONING_ENABLED else []),
+        scheduled_links_table_kwargs(),
     )
 
 
@@ -207,8 +286,11 @@ class PageContent(Base):
     Fields:
         - source_page_url: FK to the original Page.
         - title, summary: Headline and opening paragraph (if present).
-        - text_content: Extracted main body text of the article.
-        - text_content_hash: For change detection.
+        - text_content: Legacy inline copy of the article text. New rows leave it NULL
+          and store the text once in text_contents instead.
+        - text_content_hash: For change detection, and the key of the text in text_contents.
+        - search_vector: Weighted lexemes of the title and text, for full-text search
+          (see database.search).
         - parsed_at, created_at, updated_at: Timestamps.
 
     Relationships:
@@ -228,12 +310,16 @@ class PageContent(Base):
     # the first paragraph in an article page (under title)
     summary = Column(Text, nullable=True)
 
-    # The entire main article content
+    # The entire main article content (legacy rows only, see TextContent)
     text_content = Column(Text, nullable=True)
 
-    # A hash of the entire page to help detect changes in the page content
+    # A hash of the entire page to help detect changes in the page content.
+    # Also the key of the page's text in text_contents
     text_content_hash = Column(Text, nullable=True)
 
+    # Filled by the db_writer whenever title or text change (see database.search)
+    search_vector = Column(TSVECTOR, nullable=True)
+
     parsed_at = Column(DateTime(timezone=True),
                        server_default=func.now(), nullable=False)
 
@@ -252,6 +338,55 @@ class PageContent(Base):
         back_populates="pages"
     )
 
+    __table_args__ = (
+        Index("idx_page_content_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
+
+class TextContent(Base):
+    """
+    Content-addressed, compressed store of parsed article text.
+
+    Pages with identical text (mirrors, unchanged recrawls) share a single row, so
+    reparsing an unchanged page doesn't rewrite its text.
+
+    Fields:
+        - content_hash: text_content_hash of the text (SHA-256 hex).
+        - compressed_text: The text, compressed with `compression`.
+        - compression: Codec name (see database.content_store).
+        - original_size: Uncompressed size in bytes.
+        - ref_count: page_content rows referencing this text; rows that reach 0 are deleted.
+    """
+    __tablename__ = 'text_contents'
+
+    content_hash = Column(String(64), primary_key=True)
+    compressed_text = Column(LargeBinary, nullable=False)
+    compression = Column(String(16), nullable=False)
+    original_size = Column(Integer, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
+
+    created_at = Column(DateTime(timezone=True),
+                        server_default=func.now(), nullable=False)
+
+
+class AppliedWrite(Base):
+    """
+    Idempotency keys of db_writer messages that have been applied.
+
+    A key is inserted in the same transaction as the write it guards, so a redelivered
+    message whose key is already here is skipped instead of being applied twice.
+
+    Fields:
+        - idempotency_key: Key carried by the message (e.g. the crawl attempt id).
+        - applied_at: When the write committed. Rows past the retention window are
+          pruned (see database.idempotency), which bounds the table.
+    """
+    __tablename__ = 'applied_writes'
+
+    idempotency_key = Column(String(64), primary_key=True)
+    applied_at = Column(DateTime(timezone=True),
+                        server_default=func.now(), nullable=False, index=True)
+
 
 class Category(Base):
     """
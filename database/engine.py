@@ -1,21 +1,167 @@
 import os
-from sqlalchemy import create_engine
+import time
+from collections.abc import Callable
+from typing import Any
+
 from dotenv import load_dotenv
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, Pool, QueuePool
+
 from database.db_models.models import Base
+from database.migrations import apply_schema_upgrades
+from database.partitioning import ensure_partitions
 
 load_dotenv()
 
 DATABASE_URL = os.getenv('DATABASE_URL')
 
-engine = create_engine(DATABASE_URL, echo=False)
+# Used for any key a component's `database.engine` config leaves out
+DEFAULT_ENGINE_PROFILE = {
+    # Connections kept open, and extra ones allowed under load
+    'pool_size': 5,
+    'max_overflow': 10,
+    # Seconds to wait for a free connection before raising TimeoutError
+    'pool_timeout': 30,
+    # Seconds after which a connection is replaced (-1 never)
+    'pool_recycle': -1,
+    # Test connections on checkout so restarts of Postgres/PgBouncer aren't surfaced as errors
+    'pool_pre_ping': False,
+    # Server-side limit per statement (0 disables)
+    'statement_timeout_ms': 0,
+    # Rows per INSERT statement when executemany goes through insertmanyvalues
+    'insertmanyvalues_page_size': 1000,
+    # psycopg2 executemany strategy for UPDATE/DELETE: values_only or values_plus_batch
+    'executemany_mode': 'values_only',
+    # Stream SELECT results through server-side cursors instead of buffering them
+    # (sync engines only)
+    'stream_results': False,
+    'max_row_buffer': 1000,
+    # Connections opened when an async service starts (see database.async_engine.warm_up_pool)
+    'warmup_connections': 0,
+    # Behind PgBouncer in transaction mode: no client-side pool (PgBouncer pools) and
+    # no session-level settings (statement_timeout is set per transaction instead)
+    'pgbouncer': False,
+}
+
+
+def load_engine_profile(component_configs: dict[str, Any] | None = None) -> dict[str, Any]:
+    """
+    Returns the engine profile in a component config (`database.engine`) over the defaults
+    """
+    profile = ((component_configs or {}).get('database') or {}).get('engine') or {}
+    unknown = set(profile) - set(DEFAULT_ENGINE_PROFILE)
+    if unknown:
+        raise ValueError(f"Unknown engine profile keys: {sorted(unknown)}")
+    return {**DEFAULT_ENGINE_PROFILE, **profile}
+
+
+def build_engine(
+    profile: dict[str, Any] | None = None,
+    observe_checkout_wait: Callable[[float], None] | None = None,
+    url: str | None = None
+) -> Engine:
+    """
+    Creates an engine from an engine profile (see DEFAULT_ENGINE_PROFILE)
+
+    Args:
+        profile (dict[str, Any], optional): Profile as returned by `load_engine_profile`
+        observe_checkout_wait (Callable[[float], None], optional): Called with the seconds every
+            pool checkout waited for a connection, e.g. a Histogram's `observe`
+        url (str, optional): Database URL, defaults to DATABASE_URL
+    """
+    profile = {**DEFAULT_ENGINE_PROFILE, **(profile or {})}
+    base_pool = NullPool if profile['pgbouncer'] else QueuePool
+
+    kwargs = {
+        'echo': False,
+        'poolclass': _timed_pool_class(base_pool, observe_checkout_wait) if observe_checkout_wait else base_pool,
+        'pool_pre_ping': profile['pool_pre_ping'],
+        'insertmanyvalues_page_size': profile['insertmanyvalues_page_size'],
+        'executemany_mode': profile['executemany_mode'],
+    }
+    if not profile['pgbouncer']:
+        kwargs.update(
+            pool_size=profile['pool_size'],
+            max_overflow=profile['max_overflow'],
+            pool_timeout=profile['pool_timeout'],
+            pool_recycle=profile['pool_recycle'],
+        )
+    if profile['statement_timeout_ms'] and not profile['pgbouncer']:
+        kwargs['connect_args'] = {'options': f"-c statement_timeout={int(profile['statement_timeout_ms'])}"}
+    if profile['stream_results']:
+        kwargs['execution_options'] = {
+            'stream_results': True,
+            'max_row_buffer': profile['max_row_buffer'],
+        }
+
+    new_engine = create_engine(url or DATABASE_URL, **kwargs)
+
+    if profile['statement_timeout_ms'] and profile['pgbouncer']:
+        _set_statement_timeout_per_transaction(new_engine, int(profile['statement_timeout_ms']))
+
+    return new_engine
+
+
+def configure_engine(
+    component_configs: dict[str, Any] | None = None,
+    observe_checkout_wait: Callable[[float], None] | None = None
+) -> Engine:
+    """
+    Replaces the shared engine with one built from the component's engine profile
+
+    Should be called once at startup, before any session is opened. SessionLocal is rebound
+    in place, so modules that already imported it pick up the new engine.
+
+    Returns:
+        Engine: The new engine
+    """
+    global engine
+    previous, engine = engine, build_engine(load_engine_profile(component_configs), observe_checkout_wait)
+    SessionLocal.configure(bind=engine)
+    previous.dispose()
+    return engine
+
+
+def _timed_pool_class(base: type[Pool], observe: Callable[[float], None]) -> type[Pool]:
+    # A subclass rather than pool events, since events only fire once a connection is
+    # handed out. Being a class, it also survives the pool being recreated on dispose()
+    class TimedPool(base):
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                return super()._do_get()
+            finally:
+                observe(time.perf_counter() - start)
+
+    return TimedPool
+
+
+def _set_statement_timeout_per_transaction(target: Engine, timeout_ms: int) -> None:
+    # PgBouncer rejects startup options and hands the server connection to other
+    # clients between transactions, so the timeout is scoped to each transaction
+    @event.listens_for(target, "begin")
+    def set_local_timeout(conn):
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(f"SET LOCAL statement_timeout = {timeout_ms}")
+        finally:
+            cursor.close()
+
+
+engine = build_engine()
 SessionLocal = sessionmaker(autocommit=False, bind=engine)
 
 
 def init_db():
     """
-    Initializes the database schema by creating all defined tables
+    Initializes the database schema by creating all defined tables, then applies
+    idempotent upgrades so databases created by older versions match the models,
+    and creates the partitions of partitioned tables
 
     This should only be run during setup or migration workflows
     """
     Base.metadata.create_all(bind=engine)
+    apply_schema_upgrades(engine)
+    ensure_partitions(engine)
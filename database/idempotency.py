@@ -0,0 +1,77 @@
+"""
+Idempotency keys for db_writer writes that aren't naturally idempotent
+
+A write claims its message's key in the `applied_writes` table within the same
+transaction as the write itself. A key that is already there was applied by an
+earlier delivery, so the message is skipped; a write that rolls back releases its
+claims with it.
+
+Keys are kept for `database.idempotency.retention_hours` (global config), which must
+comfortably exceed how long a message can sit unacknowledged or in a dead-letter
+queue. Older keys are pruned by the periodic database maintenance job.
+"""
+
+import logging
+from collections.abc import Iterable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from shared.configs.config_loader import global_config_loader
+
+
+def load_idempotency_configs() -> dict[str, Any]:
+    configs = global_config_loader().get('database', {}).get('idempotency', {})
+    return {
+        'retention_hours': 72,
+        **configs,
+    }
+
+
+IDEMPOTENCY = load_idempotency_configs()
+
+# Sorted keys make concurrent batches take the key locks in the same order
+_CLAIM_KEYS_SQL = text("""
+    INSERT INTO applied_writes (idempotency_key)
+    SELECT key FROM unnest(CAST(:keys AS VARCHAR[])) AS key
+    ORDER BY key
+    ON CONFLICT (idempotency_key) DO NOTHING
+    RETURNING idempotency_key
+""")
+
+_PRUNE_SQL = text("DELETE FROM applied_writes WHERE applied_at < :cutoff")
+
+
+def claim_keys(db: Session, keys: Iterable[str]) -> set[str]:
+    """
+    Records idempotency keys as applied, as part of the session's transaction
+
+    Returns:
+        Set[str]: The keys that weren't applied before. Messages with any other key
+                  must be skipped
+    """
+    keys = sorted(set(keys))
+    if not keys:
+        return set()
+    return set(db.execute(_CLAIM_KEYS_SQL, {'keys': keys}).scalars())
+
+
+def prune_applied_writes(engine: Engine, now: datetime | None = None, logger: logging.Logger | None = None) -> int:
+    """
+    Deletes idempotency keys older than the retention window
+
+    Returns:
+        int: Number of keys deleted
+    """
+    logger = logger or logging.getLogger(__name__)
+    now = now or datetime.now(UTC)
+    cutoff = now - timedelta(hours=IDEMPOTENCY['retention_hours'])
+
+    with engine.begin() as conn:
+        deleted = conn.execute(_PRUNE_SQL, {'cutoff': cutoff}).rowcount
+
+    logger.info("Pruned %d idempotency keys applied before %s", deleted, cutoff.isoformat())
+    return deleted
@@ -0,0 +1,287 @@
+"""
+Idempotent schema upgrades for databases created before a model change
+
+`Base.metadata.create_all` only creates missing tables, it never alters existing
+ones. Every statement below must be safe to run on both fresh and existing
+databases (IF NOT EXISTS / IF EXISTS), since `init_db` runs them on every startup.
+
+Only cheap statements run on startup. Indexes on existing tables (INDEX_UPGRADES,
+UNIQUE_INDEX_UPGRADES) and data migrations that are too slow to run on startup are
+run by hand, the URL ID backfill first:
+
+    python -m database.migrations backfill-url-ids [--batch-size N]
+    python -m database.migrations create-indexes
+    python -m database.migrations backfill-search-vectors [--batch-size N]
+"""
+
+import argparse
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+SCHEMA_UPGRADES = [
+    # Priority-aware crawl frontier
+    "ALTER TABLE scheduled_links ADD COLUMN IF NOT EXISTS priority DOUBLE PRECISION NOT NULL DEFAULT 0",
+
+    # URL interning (expand phase): integer ID columns next to the URL strings. The
+    # db_writer fills them for new rows, `backfill_url_ids` fills existing ones. Their
+    # indexes, including the one keeping pages.url_id unique, are in INDEX_UPGRADES
+    # and UNIQUE_INDEX_UPGRADES
+    "ALTER TABLE pages ADD COLUMN IF NOT EXISTS url_id BIGINT REFERENCES urls (id)",
+    "ALTER TABLE links ADD COLUMN IF NOT EXISTS source_url_id BIGINT REFERENCES urls (id)",
+    "ALTER TABLE links ADD COLUMN IF NOT EXISTS target_url_id BIGINT REFERENCES urls (id)",
+    "ALTER TABLE scheduled_links ADD COLUMN IF NOT EXISTS url_id BIGINT REFERENCES urls (id)",
+
+    # Full-text search (see database.search). `backfill_search_vectors` fills existing rows
+    "ALTER TABLE page_content ADD COLUMN IF NOT EXISTS search_vector TSVECTOR",
+
+    # Adaptive recrawl intervals (see components.db_writer.core.recrawl_policy). Pages
+    # start without history, the db_writer fills it as they are recrawled
+    "ALTER TABLE pages ADD COLUMN IF NOT EXISTS change_checks DOUBLE PRECISION",
+    "ALTER TABLE pages ADD COLUMN IF NOT EXISTS changes_detected DOUBLE PRECISION",
+    "ALTER TABLE pages ADD COLUMN IF NOT EXISTS change_observed_seconds DOUBLE PRECISION",
+    "ALTER TABLE pages ADD COLUMN IF NOT EXISTS recrawl_interval_seconds DOUBLE PRECISION",
+]
+
+# Indexes added to existing tables, as (name, definition). Building one locks its
+# table against writes for as long as the build takes, so they are built by
+# `create_indexes` with CREATE INDEX CONCURRENTLY instead of on startup. Fresh
+# databases already get them from the models through create_all
+INDEX_UPGRADES = [
+    # Priority-aware crawl frontier
+    ("idx_scheduled_links_priority", "ON scheduled_links (priority DESC, id)"),
+
+    # URL interning: out-links by source, in-links by target
+    ("idx_links_source_target_url_id", "ON links (source_url_id, target_url_id)"),
+    ("idx_links_target_url_id", "ON links (target_url_id)"),
+
+    # Keyset scan of pages due for recrawl
+    ("idx_pages_next_crawl", "ON pages (next_crawl_at, id) WHERE next_crawl_at IS NOT NULL"),
+
+    # Full-text search (see database.search)
+    ("idx_page_content_search_vector", "ON page_content USING GIN (search_vector)"),
+
+    # Incremental link graph snapshots (see components.db_reader.core.link_graph)
+    ("idx_links_created_at", "ON links USING BRIN (created_at)"),
+]
+
+# Same, for unique indexes. Named like the constraint create_all gives fresh databases
+UNIQUE_INDEX_UPGRADES = [
+    # URL interning: one page per URL ID
+    ("pages_url_id_key", "ON pages (url_id)"),
+]
+
+_INDEX_STATE_SQL = """
+    SELECT i.indisvalid
+    FROM pg_index i
+    WHERE i.indexrelid = to_regclass(:name)
+"""
+
+# Same digest as shared.utils.create_hash
+_SQL_URL_HASH = "encode(sha256(convert_to({column}, 'UTF8')), 'hex')"
+
+# (table, ID column, URL column)
+URL_ID_BACKFILLS = [
+    ("pages", "url_id", "url"),
+    ("links", "source_url_id", "source_page_url"),
+    ("links", "target_url_id", "url"),
+    ("scheduled_links", "url_id", "url"),
+]
+
+# Each batch covers a primary key range, so it is an index range scan however much
+# of the table is already filled, and interns its own URLs first, so rows whose URL
+# was never interned (e.g. written by an older writer) are filled too
+_BACKFILL_INTERN_BATCH_SQL = """
+    INSERT INTO urls (url, url_hash)
+    SELECT DISTINCT t.{url_column}, {url_hash}
+    FROM {table} AS t
+    WHERE t.id > :after_id AND t.id <= :until_id AND t.{id_column} IS NULL
+    ON CONFLICT (url_hash) DO NOTHING
+"""
+
+_BACKFILL_BATCH_SQL = """
+    UPDATE {table} AS t
+    SET {id_column} = u.id
+    FROM urls AS u
+    WHERE t.id > :after_id AND t.id <= :until_id AND t.{id_column} IS NULL
+      AND u.url_hash = {url_hash}
+"""
+
+
+def apply_schema_upgrades(engine: Engine, logger: logging.Logger | None = None) -> None:
+    """
+    Runs every statement in SCHEMA_UPGRADES in a single transaction
+
+    Args:
+        engine (Engine): SQLAlchemy engine to run the upgrades on
+        logger (logging.Logger, optional): Logger instance
+    """
+    logger = logger or logging.getLogger(__name__)
+
+    with engine.begin() as conn:
+        for statement in SCHEMA_UPGRADES:
+            conn.execute(text(statement))
+
+    logger.info("Applied %d schema upgrade statements", len(SCHEMA_UPGRADES))
+
+
+def create_indexes(engine: Engine, logger: logging.Logger | None = None) -> None:
+    """
+    Builds the indexes in INDEX_UPGRADES and UNIQUE_INDEX_UPGRADES that don't exist
+    yet, without blocking writes
+
+    Each index is built with CREATE INDEX CONCURRENTLY, which can't run inside a
+    transaction, so the connection is in autocommit mode. A build that failed or was
+    interrupted leaves an invalid index behind; it is dropped and built again.
+
+    Args:
+        engine (Engine): SQLAlchemy engine to build the indexes on
+        logger (logging.Logger, optional): Logger instance
+    """
+    logger = logger or logging.getLogger(__name__)
+
+    upgrades = [("INDEX", *index) for index in INDEX_UPGRADES]
+    upgrades += [("UNIQUE INDEX", *index) for index in UNIQUE_INDEX_UPGRADES]
+
+    with engine.connect() as conn:
+        conn.execution_options(isolation_level="AUTOCOMMIT")
+        for kind, name, definition in upgrades:
+            valid = conn.execute(text(_INDEX_STATE_SQL), {'name': name}).scalar()
+            if valid:
+                continue
+            if valid is not None:
+                logger.warning("Rebuilding invalid index %s", name)
+                conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+
+            logger.info("Building index %s", name)
+            conn.execute(text(f"CREATE {kind} CONCURRENTLY IF NOT EXISTS {name} {definition}"))
+
+    logger.info("Indexes up to date")
+
+
+def backfill_url_ids(engine: Engine, batch_size: int = 10_000, logger: logging.Logger | None = None) -> None:
+    """
+    Fills the URL ID columns of rows written before URL interning existed
+
+    Walks each table by primary key up to its largest ID when the run starts, in ranges
+    of `batch_size` IDs, one transaction per range, so the tables stay writable. Each
+    range interns its missing URLs and then fills the ID columns. Run it after the
+    db_writer that fills the ID columns is deployed; rows written by an older writer in
+    the meantime are picked up by simply running it again.
+
+    Args:
+        engine (Engine): SQLAlchemy engine to run the backfill on
+        batch_size (int): IDs covered per transaction
+        logger (logging.Logger, optional): Logger instance
+    """
+    logger = logger or logging.getLogger(__name__)
+
+    for table, id_column, url_column in URL_ID_BACKFILLS:
+        names = {
+            'table': table,
+            'id_column': id_column,
+            'url_column': url_column,
+            'url_hash': _SQL_URL_HASH.format(column=f"t.{url_column}"),
+        }
+        intern = text(_BACKFILL_INTERN_BATCH_SQL.format(**names))
+        update = text(_BACKFILL_BATCH_SQL.format(**names))
+
+        with engine.connect() as conn:
+            min_id, max_id = conn.execute(text(f"SELECT min(id), max(id) FROM {table}")).one()
+
+        interned = updated = 0
+        after_id = (min_id or 0) - 1
+        while max_id is not None and after_id < max_id:
+            params = {'after_id': after_id, 'until_id': after_id + batch_size}
+            with engine.begin() as conn:
+                interned += conn.execute(intern, params).rowcount
+                updated += conn.execute(update, params).rowcount
+            after_id += batch_size
+
+        logger.info(
+            "Backfilled %s.%s for %d rows (%d URLs interned)", table, id_column, updated, interned
+        )
+
+
+# Texts are decompressed in Python, so they are read rather than updated in place
+_SEARCH_VECTOR_BACKFILL_BATCH_SQL = """
+    SELECT p.id, p.source_page_url, p.title, p.text_content, t.compressed_text, t.compression
+    FROM page_content p
+    LEFT JOIN text_contents t ON t.content_hash = p.text_content_hash
+    WHERE p.search_vector IS NULL AND p.id > :after_id
+    ORDER BY p.id
+    LIMIT :batch_size
+"""
+
+
+def backfill_search_vectors(engine: Engine, batch_size: int = 1_000, logger: logging.Logger | None = None) -> None:
+    """
+    Fills `page_content.search_vector` for rows written before full-text search existed
+
+    Runs one transaction per batch of `batch_size` pages. Rows whose text is missing
+    are indexed by their title only.
+
+    Args:
+        engine (Engine): SQLAlchemy engine to run the backfill on
+        batch_size (int): Pages indexed per transaction
+        logger (logging.Logger, optional): Logger instance
+    """
+    # Imported here so the schema upgrades don't need the compression codec installed
+    from database.content_store import decompress_text
+    from database.search import UPDATE_SEARCH_VECTORS_SQL, search_vector_params
+
+    logger = logger or logging.getLogger(__name__)
+
+    total, after_id = 0, 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                text(_SEARCH_VECTOR_BACKFILL_BATCH_SQL), {"after_id": after_id, "batch_size": batch_size}
+            ).all()
+            if not rows:
+                break
+
+            pages = []
+            for row in rows:
+                body = row.text_content
+                if body is None and row.compressed_text is not None:
+                    body = decompress_text(row.compressed_text, row.compression)
+                pages.append((row.source_page_url, row.title, body))
+            conn.execute(UPDATE_SEARCH_VECTORS_SQL, search_vector_params(pages))
+
+        total += len(rows)
+        after_id = rows[-1].id
+
+    logger.info("Backfilled page_content.search_vector for %d rows", total)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run data migrations that are too slow for startup")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    subcommands.add_parser("create-indexes", help="Build missing indexes without blocking writes")
+
+    backfill = subcommands.add_parser("backfill-url-ids", help="Fill the URL ID columns of existing rows")
+    backfill.add_argument("--batch-size", type=int, default=10_000)
+
+    search = subcommands.add_parser("backfill-search-vectors", help="Index the text of existing parsed pages")
+    search.add_argument("--batch-size", type=int, default=1_000)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    # Imported here so the module can be imported without DATABASE_URL set
+    from database.engine import engine, init_db
+
+    init_db()
+    if args.command == "create-indexes":
+        create_indexes(engine)
+    elif args.command == "backfill-url-ids":
+        backfill_url_ids(engine, args.batch_size)
+    elif args.command == "backfill-search-vectors":
+        backfill_search_vectors(engine, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
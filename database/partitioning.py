@@ -0,0 +1,253 @@
+"""
+Declarative partitioning for the two largest tables
+
+    - links: HASH partitioned on source_page_url into `links_hash_partitions` partitions
+    - scheduled_links: RANGE partitioned on scheduled_at into windows of
+      `scheduled_links_interval_hours`, so a window whose links have all been
+      dispatched is dropped as a whole instead of deleted row by row
+
+Enabled with `database.partitioning.enabled` in the global config. It only applies to
+tables created while it is enabled; existing tables are left alone (and a warning is
+logged), since converting them means rewriting the whole table.
+
+NOTE: Partitioned tables can't have a unique index that excludes the partition key,
+      so partitioned `scheduled_links` drops UNIQUE (url) and relies on the
+      Scheduler's Redis seen-set for deduplication.
+
+Maintenance (pre-create upcoming windows, drop consumed ones) runs on `init_db`
+and periodically, together with pruning expired idempotency keys (see
+database/idempotency.py), through:
+
+    python -m database.partitioning [--loop-seconds N]
+"""
+
+import argparse
+import logging
+import time
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+
+from database.idempotency import prune_applied_writes
+from shared.configs.config_loader import global_config_loader
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+SCHEDULED_LINKS_PARTITION_PREFIX = "scheduled_links_p"
+SCHEDULED_LINKS_PARTITION_FORMAT = "%Y%m%d%H"
+
+# How long retiring a window waits for its locks before leaving it for the next run,
+# so a busy table doesn't queue the dispatcher's pops behind the maintainer
+RETIRE_LOCK_TIMEOUT_MS = 5000
+
+
+def load_partitioning_configs() -> dict[str, Any]:
+    configs = global_config_loader().get('database', {}).get('partitioning', {})
+    return {
+        'enabled': False,
+        'links_hash_partitions': 16,
+        'scheduled_links_interval_hours': 24,
+        'scheduled_links_precreate': 3,
+        **configs,
+    }
+
+
+PARTITIONING = load_partitioning_configs()
+PARTITIONING_ENABLED = bool(PARTITIONING['enabled'])
+
+
+def links_table_kwargs() -> dict[str, str]:
+    """
+    Table kwargs for the `links` model
+    """
+    return {'postgresql_partition_by': 'HASH (source_page_url)'} if PARTITIONING_ENABLED else {}
+
+
+def scheduled_links_table_kwargs() -> dict[str, str]:
+    """
+    Table kwargs for the `scheduled_links` model
+    """
+    return {'postgresql_partition_by': 'RANGE (scheduled_at)'} if PARTITIONING_ENABLED else {}
+
+
+def window_start(moment: datetime, interval: timedelta) -> datetime:
+    """
+    Returns the start of the scheduled_links window containing `moment` (UTC, epoch aligned)
+    """
+    windows = (moment - _EPOCH) // interval
+    return _EPOCH + windows * interval
+
+
+def scheduled_links_partition_name(start: datetime) -> str:
+    return f"{SCHEDULED_LINKS_PARTITION_PREFIX}{start.strftime(SCHEDULED_LINKS_PARTITION_FORMAT)}"
+
+
+def parse_scheduled_links_partition_name(name: str):
+    """
+    Returns the window start encoded in a partition name, or None for other tables
+    (e.g. the default partition)
+    """
+    if not name.startswith(SCHEDULED_LINKS_PARTITION_PREFIX):
+        return None
+    try:
+        return datetime.strptime(
+            name[len(SCHEDULED_LINKS_PARTITION_PREFIX):], SCHEDULED_LINKS_PARTITION_FORMAT
+        ).replace(tzinfo=UTC)
+    except ValueError:
+        return None
+
+
+def ensure_partitions(engine: Engine, now: datetime | None = None, logger: logging.Logger | None = None) -> None:
+    """
+    Creates missing partitions: every `links` hash partition, the current and previous
+    `scheduled_links` windows plus `scheduled_links_precreate` upcoming ones, and a
+    default partition for rows outside any window (e.g. skewed clocks)
+    """
+    if not PARTITIONING_ENABLED:
+        return
+
+    logger = logger or logging.getLogger(__name__)
+    now = now or datetime.now(UTC)
+    interval = timedelta(hours=PARTITIONING['scheduled_links_interval_hours'])
+
+    with engine.begin() as conn:
+        if _is_partitioned(conn, "links", logger):
+            modulus = PARTITIONING['links_hash_partitions']
+            for remainder in range(modulus):
+                conn.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS links_p{remainder} PARTITION OF links "
+                    f"FOR VALUES WITH (MODULUS {modulus}, REMAINDER {remainder})"
+                ))
+
+        if _is_partitioned(conn, "scheduled_links", logger):
+            conn.execute(text(
+                "CREATE TABLE IF NOT EXISTS scheduled_links_default PARTITION OF scheduled_links DEFAULT"
+            ))
+
+            current = window_start(now, interval)
+            for offset in range(-1, PARTITIONING['scheduled_links_precreate'] + 1):
+                start = current + offset * interval
+                conn.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {scheduled_links_partition_name(start)} "
+                    f"PARTITION OF scheduled_links "
+                    f"FOR VALUES FROM ('{start.isoformat()}') TO ('{(start + interval).isoformat()}')"
+                ))
+
+    logger.info("Partitions ensured")
+
+
+def retire_partitions(engine: Engine, now: datetime | None = None, logger: logging.Logger | None = None) -> list[str]:
+    """
+    Drops `scheduled_links` windows that have ended and whose links have all been dispatched
+
+    Windows that still hold undispatched links are kept until they drain, and so are
+    windows whose locks aren't granted within RETIRE_LOCK_TIMEOUT_MS.
+
+    Returns:
+        List[str]: Names of the dropped partitions
+    """
+    if not PARTITIONING_ENABLED:
+        return []
+
+    logger = logger or logging.getLogger(__name__)
+    now = now or datetime.now(UTC)
+    interval = timedelta(hours=PARTITIONING['scheduled_links_interval_hours'])
+    current = window_start(now, interval)
+
+    with engine.connect() as conn:
+        if not _is_partitioned(conn, "scheduled_links", logger):
+            return []
+        partitions = conn.execute(text("""
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = 'scheduled_links'::regclass
+        """)).scalars().all()
+
+    dropped = []
+    for name in sorted(partitions):
+        start = parse_scheduled_links_partition_name(name)
+        if start is None or start + interval > current:
+            continue
+
+        exists_sql = text(f"SELECT EXISTS (SELECT 1 FROM {name})")
+        with engine.connect() as conn:
+            if conn.execute(exists_sql).scalar():
+                continue
+
+        # Dropping a partition locks its parent too. The parent is locked first, in the
+        # order the db_reader's pop (a DELETE on the parent) takes them, so the two can't
+        # deadlock. DETACH PARTITION ... CONCURRENTLY would avoid the parent lock, but
+        # isn't allowed while the default partition exists. The locks keep late inserts
+        # out between the emptiness check and the drop
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(f"SET LOCAL lock_timeout = {RETIRE_LOCK_TIMEOUT_MS}"))
+                conn.execute(text("LOCK TABLE ONLY scheduled_links IN ACCESS EXCLUSIVE MODE"))
+                conn.execute(text(f"LOCK TABLE {name} IN ACCESS EXCLUSIVE MODE"))
+                if conn.execute(exists_sql).scalar():
+                    continue
+                conn.execute(text(f"DROP TABLE {name}"))
+        except OperationalError as e:
+            logger.warning("Could not lock partition %s, retrying next run: %s", name, e)
+            continue
+
+        dropped.append(name)
+        logger.info("Dropped consumed partition %s", name)
+
+    return dropped
+
+
+def run_maintenance(engine: Engine, logger: logging.Logger | None = None) -> None:
+    """
+    Pre-creates upcoming partitions, retires consumed ones and prunes expired idempotency keys
+    """
+    ensure_partitions(engine, logger=logger)
+    retire_partitions(engine, logger=logger)
+    prune_applied_writes(engine, logger=logger)
+
+
+def _is_partitioned(conn: Connection, table: str, logger: logging.Logger) -> bool:
+    partitioned = conn.execute(
+        text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table))"),
+        {'table': table}
+    ).scalar()
+
+    if not partitioned:
+        logger.warning(
+            "Partitioning is enabled but %s was created unpartitioned, skipping it", table
+        )
+    return bool(partitioned)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-create and retire table partitions")
+    parser.add_argument(
+        "--loop-seconds", type=int, default=0,
+        help="Keep running, once every N seconds (default: run once and exit)"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    logger = logging.getLogger("partition_maintenance")
+
+    # Imported here so the module can be imported without DATABASE_URL set
+    from database.engine import engine
+
+    while True:
+        try:
+            run_maintenance(engine, logger)
+        except Exception:
+            if not args.loop_seconds:
+                raise
+            logger.exception("Partition maintenance failed, retrying next run")
+
+        if not args.loop_seconds:
+            return
+        time.sleep(args.loop_seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Full-text search over parsed page content
+
+`page_content.search_vector` holds each page's title (weight A) and text (weight B),
+indexed with GIN. The db_writer fills it when a page's title or text changes, in
+the same transaction as the content; rows written before the column existed are
+filled by `python -m database.migrations backfill-search-vectors`.
+
+The text search configuration used to build the vectors and to parse queries must
+match, otherwise queries stop matching the indexed lexemes.
+"""
+
+import re
+from collections.abc import Iterable
+
+from sqlalchemy import text
+
+TEXT_SEARCH_CONFIG = "english"
+
+# tsvector values are limited to 1MB, far more than the lexemes of any article
+# prefix this long. Longer texts are only indexed up to here
+MAX_INDEXED_CHARS = 500_000
+
+UPDATE_SEARCH_VECTORS_SQL = text("""
+    UPDATE page_content p
+    SET search_vector =
+        setweight(to_tsvector(CAST(:config AS REGCONFIG), COALESCE(d.title, '')), 'A')
+        || setweight(to_tsvector(CAST(:config AS REGCONFIG), COALESCE(d.body, '')), 'B')
+    FROM unnest(CAST(:urls AS VARCHAR[]), CAST(:titles AS TEXT[]), CAST(:bodies AS TEXT[]))
+        AS d(url, title, body)
+    WHERE p.source_page_url = d.url
+""")
+
+_QUERY_TERM_RE = re.compile(r"(-?)(\w+)")
+
+# websearch_to_tsquery syntax that isn't a search term
+_QUERY_OPERATORS = {"or"}
+
+
+def search_vector_params(pages: Iterable[tuple]) -> dict:
+    """
+    Parameters of UPDATE_SEARCH_VECTORS_SQL for (source_page_url, title, text) tuples
+    """
+    urls, titles, bodies = [], [], []
+    for url, title, body in pages:
+        urls.append(url)
+        titles.append(title)
+        bodies.append(body[:MAX_INDEXED_CHARS] if body else body)
+    return {'config': TEXT_SEARCH_CONFIG, 'urls': urls, 'titles': titles, 'bodies': bodies}
+
+
+def query_terms(query: str) -> list[str]:
+    """
+    The words a websearch-style query looks for, lowercased, without negated words
+    """
+    return [
+        word.lower()
+        for negated, word in _QUERY_TERM_RE.findall(query)
+        if not negated and word.lower() not in _QUERY_OPERATORS
+    ]
+
+
+def make_snippet(body: str | None, terms: list[str], max_chars: int = 200) -> str:
+    """
+    Cuts a window of about `max_chars` around the first word of `body` that starts with
+    one of `terms`, or the start of `body` when none does
+
+    Prefix matching finds most inflections of a stemmed query term ("crawl" matches
+    "crawling"). Done in Python on the few texts of a result page, since ts_headline
+    would need the text uncompressed in the database and reparses the whole document.
+    """
+    if not body:
+        return ""
+
+    start = 0
+    if terms:
+        pattern = re.compile(r"\b(?:" + "|".join(re.escape(term) for term in terms) + r")", re.IGNORECASE)
+        match = pattern.search(body)
+        if match:
+            start = max(0, match.start() - max_chars // 4)
+
+    end = min(len(body), start + max_chars)
+    # Don't cut words in half
+    if start > 0:
+        space = body.find(" ", start, end)
+        start = space + 1 if space != -1 else start
+    if end < len(body):
+        space = body.rfind(" ", start, end)
+        end = space if space > start else end
+
+    snippet = " ".join(body[start:end].split())
+    return ("…" if start > 0 else "") + snippet + ("…" if end < len(body) else "")
@@ -0,0 +1,114 @@
+"""
+Benchmarks the two db_writer bulk paths for the `links` table:
+
+    - upsert: multi-row INSERT ... ON CONFLICT DO UPDATE (save_processed_links_batch)
+    - copy:   COPY into a temporary staging table + one set-based merge (save_processed_links_copy)
+
+Each size is loaded twice per loader: once into an empty slice of the table (pure
+inserts) and once more with the same rows (every row hits ON CONFLICT).
+
+Usage (needs a Postgres reachable through DATABASE_URL, e.g. the docker stack):
+    python -m scripts.benchmark_links_loader --sizes 1000 10000 100000
+
+WARNING: writes to the database in DATABASE_URL, and deletes the benchmark rows afterwards.
+"""
+
+import argparse
+import logging
+import time
+from datetime import UTC, datetime
+
+from sqlalchemy import text
+
+from components.db_writer.core.db_writer import (
+    save_processed_links_batch,
+    save_processed_links_copy,
+)
+from database.engine import SessionLocal, init_db
+from shared.rabbitmq.schemas.save_to_db import SaveProcessedLinks
+from shared.rabbitmq.schemas.scheduling import LinkData
+
+SOURCE_URL_PREFIX = "https://benchmark.invalid/source"
+LINKS_PER_PAGE = 500
+
+LOADERS = {
+    "upsert": save_processed_links_batch,
+    "copy": save_processed_links_copy,
+}
+
+
+def build_tasks(size: int, run_id: str) -> list[SaveProcessedLinks]:
+    """Splits `size` links over pages of LINKS_PER_PAGE, like a batch of parser messages"""
+    discovered_at = datetime.now(UTC).isoformat()
+    tasks = []
+    for start in range(0, size, LINKS_PER_PAGE):
+        source = f"{SOURCE_URL_PREFIX}/{run_id}/{start // LINKS_PER_PAGE}"
+        tasks.append(SaveProcessedLinks(links=[
+            LinkData(
+                source_page_url=source,
+                url=f"https://en.wikipedia.org/wiki/Benchmark_{i}",
+                depth=1,
+                discovered_at=discovered_at,
+                anchor_text=f"Benchmark {i}\twith tab",
+                link_type="internal",
+            )
+            for i in range(start, min(start + LINKS_PER_PAGE, size))
+        ]))
+    return tasks
+
+
+def create_source_pages(tasks: list[SaveProcessedLinks]) -> None:
+    """links.source_page_url references pages.url, so the source pages must exist"""
+    with SessionLocal() as db:
+        for task in tasks:
+            db.execute(
+                text(
+                    "INSERT INTO pages (url, last_crawl_status) VALUES (:url, 'SUCCESS') "
+                    "ON CONFLICT (url) DO NOTHING"
+                ),
+                {"url": task.links[0].source_page_url},
+            )
+        db.commit()
+
+
+def cleanup() -> None:
+    # Deleting the pages cascades to their links
+    with SessionLocal() as db:
+        db.execute(text("DELETE FROM pages WHERE url LIKE :prefix"), {"prefix": f"{SOURCE_URL_PREFIX}/%"})
+        db.commit()
+
+
+def time_loader(loader, tasks, logger) -> float:
+    start = time.perf_counter()
+    loader(tasks, logger)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark db_writer links loaders")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    logger = logging.getLogger("links_loader_benchmark")
+    init_db()
+
+    print(f"{'links':>8}  {'loader':>6}  {'insert s':>9}  {'conflict s':>10}  {'rows/s':>10}")
+    try:
+        for size in args.sizes:
+            for name, loader in LOADERS.items():
+                tasks = build_tasks(size, f"{name}-{size}")
+                create_source_pages(tasks)
+
+                insert_seconds = time_loader(loader, tasks, logger)
+                conflict_seconds = time_loader(loader, tasks, logger)
+
+                print(
+                    f"{size:>8}  {name:>6}  {insert_seconds:>9.3f}  "
+                    f"{conflict_seconds:>10.3f}  {size / insert_seconds:>10.0f}"
+                )
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    main()
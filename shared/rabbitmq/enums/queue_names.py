@@ -155,6 +155,7 @@ class DispatcherQueueChannels(EnumCommonMethods, str, Enum):
     - add_links_to_schedule
     """
     URLS_TO_CRAWL = QueueNames.URLS_TO_CRAWL.value
+    ADD_LINKS_TO_SCHEDULE = QueueNames.ADD_LINKS_TO_SCHEDULE.value
 
 
 class ReschedulerQueueChannels(EnumCommonMethods, str, Enum):
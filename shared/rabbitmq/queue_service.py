@@ -1,13 +1,16 @@
+import json
 import logging
-import pika
-import time
 import os
-import json
-from pika.exceptions import AMQPConnectionError
+import time
+from collections import deque
+from collections.abc import Callable
+
+import pika
 from dotenv import load_dotenv
+from pika.exceptions import AMQPConnectionError, AMQPError
 
 from shared.configs.config_loader import global_config_loader
-from shared.rabbitmq.types import QueueMsgSchemaInterface
+from shared.rabbitmq.types import PublishBatchResult, QueueMsgSchemaInterface
 
 load_dotenv()
 
@@ -34,6 +37,11 @@ class QueueService:
         self._connection = None
         self._channel = None
 
+        # Channel in publisher confirm mode used by publish_batch, see _open_confirm_channel
+        self._confirm_channel = None
+        self._confirm_delivery_tag = 0
+        self._confirmations = []
+
         self._wait_for_rabbit(queue_names)
 
     def declare_queue_with_dlq(self, queue_name: str, durable=True, dlq_enabled=True):
@@ -130,6 +138,188 @@ class QueueService:
         self._logger.debug(f"Message published to {queue_name}: {message}")
 
 
+    def queue_depth(self, queue_name: str) -> tuple[int, int]:
+        """
+        Reads a queue's backlog with a passive declare, which fails instead of creating
+        the queue if it doesn't exist
+
+        Returns:
+            tuple[int, int]: Messages ready for delivery (unacknowledged ones excluded)
+                             and number of consumers
+        """
+        self._ensure_channel_open()
+        declared = self._channel.queue_declare(queue=queue_name, passive=True)
+        return declared.method.message_count, declared.method.consumer_count
+
+
+    def publish_batch(
+        self,
+        queue_name: str,
+        messages: list[str],
+        window: int = 1000,
+        max_attempts: int = 3,
+        timeout_seconds: float = 30,
+        observe_confirm_latency: Callable[[float], None] | None = None
+    ) -> PublishBatchResult:
+        """
+        Publishes persistent messages with publisher confirms, keeping up to `window`
+        of them unconfirmed at once instead of waiting for each one
+
+        A nacked message is published again, up to `max_attempts` publishes in total.
+        If the channel is lost, the unconfirmed messages are published again on a new
+        one, so a message may be delivered twice (consumers must tolerate redeliveries
+        anyway). Messages still unconfirmed after `timeout_seconds` are reported as failed.
+
+        Args:
+            queue_name (str): Queue to publish to (through the default exchange)
+            messages (List[str]): Serialized messages
+            window (int): Maximum number of unconfirmed messages
+            max_attempts (int): Publishes per message before giving up on it
+            timeout_seconds (float): Time allowed for the whole batch
+            observe_confirm_latency (Callable[[float], None], optional): Called with the
+                seconds between each publish and its confirm, e.g. a Histogram's `observe`
+
+        Returns:
+            PublishBatchResult: Confirmed and retried counts, and the failed messages
+        """
+        result = PublishBatchResult()
+        pending = deque((message, 1) for message in messages)
+        # delivery tag -> (message, attempt, published at), in publish order
+        in_flight = {}
+        deadline = time.monotonic() + timeout_seconds
+
+        while (pending or in_flight) and time.monotonic() < deadline:
+            try:
+                channel = self._open_confirm_channel()
+                while pending and len(in_flight) < window:
+                    message, attempt = pending.popleft()
+                    channel.basic_publish(
+                        exchange="",
+                        routing_key=queue_name,
+                        body=message,
+                        properties=pika.BasicProperties(delivery_mode=2),
+                    )
+                    self._confirm_delivery_tag += 1
+                    in_flight[self._confirm_delivery_tag] = (message, attempt, time.monotonic())
+
+                # Sends the buffered publishes and runs the confirm callback
+                self._connection.process_data_events(time_limit=min(0.1, max(0, deadline - time.monotonic())))
+
+            except AMQPError as e:
+                self._logger.warning("Lost channel while publishing to %s, republishing unconfirmed messages: %s", queue_name, e)
+                self._confirm_channel = None
+                for message, attempt, _ in in_flight.values():
+                    self._retry_or_fail(message, attempt, max_attempts, pending, result)
+                in_flight.clear()
+                time.sleep(min(1.0, max(0, deadline - time.monotonic())))
+                continue
+
+            confirmations, self._confirmations = self._confirmations, []
+            for method in confirmations:
+                acked = isinstance(method, pika.spec.Basic.Ack)
+                for tag in self._confirmed_tags(in_flight, method.delivery_tag, method.multiple):
+                    message, attempt, published_at = in_flight.pop(tag)
+                    if acked:
+                        result.confirmed += 1
+                        if observe_confirm_latency:
+                            observe_confirm_latency(time.monotonic() - published_at)
+                    else:
+                        self._retry_or_fail(message, attempt, max_attempts, pending, result)
+
+        result.failed.extend(message for message, _, _ in in_flight.values())
+        result.failed.extend(message for message, _ in pending)
+        if result.failed:
+            self._logger.warning("%d of %d messages to %s were not confirmed", len(result.failed), len(messages), queue_name)
+        return result
+
+    def _open_confirm_channel(self):
+        """
+        Returns the confirm mode channel used by publish_batch, opening it if needed
+
+        BlockingChannel.confirm_delivery() makes every basic_publish wait for its own
+        confirm. The underlying channel's callback form lets many publishes be in
+        flight at once, confirms being collected by `_on_publish_confirm` whenever
+        the connection processes events.
+        """
+        if self._confirm_channel is None or self._confirm_channel.is_closed:
+            self._ensure_channel_open()
+            channel = self._connection.channel()
+            channel._impl.confirm_delivery(ack_nack_callback=self._on_publish_confirm)
+            self._confirm_channel = channel._impl
+            self._confirm_delivery_tag = 0
+            self._confirmations = []
+        return self._confirm_channel
+
+    def _on_publish_confirm(self, frame) -> None:
+        self._confirmations.append(frame.method)
+
+    @staticmethod
+    def _confirmed_tags(in_flight: dict, delivery_tag: int, multiple: bool) -> list[int]:
+        if not multiple:
+            return [delivery_tag] if delivery_tag in in_flight else []
+        # Tags are inserted in increasing order
+        tags = []
+        for tag in in_flight:
+            if tag > delivery_tag:
+                break
+            tags.append(tag)
+        return tags
+
+    def _retry_or_fail(self, message: str, attempt: int, max_attempts: int, pending: deque, result: PublishBatchResult) -> None:
+        if attempt < max_attempts:
+            result.retried += 1
+            pending.append((message, attempt + 1))
+        else:
+            result.failed.append(message)
+
+
+    def call_later(self, delay_seconds: float, callback):
+        """
+        Schedules a callback on the connection's I/O loop (runs inside start_consuming)
+
+        Args:
+            delay_seconds (float): Delay before the callback fires
+            callback (Callable[[], None]): Function to call, with no arguments
+
+        Returns:
+            Opaque timer id that can be passed to `remove_timeout`
+        """
+        self._ensure_channel_open()
+        return self._connection.call_later(delay_seconds, callback)
+
+    def remove_timeout(self, timer_id) -> None:
+        """
+        Cancels a callback previously scheduled with `call_later`
+        """
+        if self._connection and self._connection.is_open:
+            self._connection.remove_timeout(timer_id)
+
+
+    def open_channel(self, prefetch_count: int):
+        """
+        Opens an additional channel on the existing connection with its own prefetch window
+
+        Delivery tags, and therefore `basic_ack(multiple=True)`, are scoped per channel, so
+        consumers that multi-ack must each get their own channel.
+
+        Returns:
+            pika.adapters.blocking_connection.BlockingChannel: The new channel
+        """
+        self._ensure_channel_open()
+        channel = self._connection.channel()
+        channel.basic_qos(prefetch_count=prefetch_count)
+        return channel
+
+    def run_io_loop(self):
+        """
+        Dispatches deliveries and timers for every channel on the connection until it closes
+
+        Use instead of `channel.start_consuming()` when consumers are spread across channels.
+        """
+        while self._connection and self._connection.is_open:
+            self._connection.process_data_events(time_limit=None)
+
+
     # TODO: remove if not needed
     def setup_delay_queue(self, delay_queue_name: str, processing_queue_name: str, exchange: str = ''):
         """
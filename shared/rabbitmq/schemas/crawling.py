@@ -9,6 +9,7 @@ class CrawlTask(BaseModel):
     url: str
     scheduled_at: str # ISO 8601 string (could be useful to help debugging)
     depth: int = 0
+    priority: float = 0.0 # frontier score, higher is crawled first
 
     @field_validator("url")
     @classmethod
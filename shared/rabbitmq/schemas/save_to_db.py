@@ -18,6 +18,8 @@ class SavePageMetadataTask(BaseModel):
     next_crawl: Optional[str] = None            # None if failed
     error_type: Optional[str] = None            # None if success
     error_message: Optional[str] = None         # None if success
+    # Unique per crawl attempt, so a redelivered message isn't counted twice
+    idempotency_key: str | None = None
 
     @field_validator("url")
     @classmethod
@@ -63,8 +65,16 @@ class SaveParsedContent(BaseModel):
         return parsed_at
 
 
+class PriorityUpdate(BaseModel):
+    url: str
+    priority: float
+
+
 class SaveLinksToSchedule(BaseModel):
     links: List[CrawlTask]
+    # Already scheduled URLs rediscovered with a higher priority. Only raises the
+    # priority of URLs still queued, never schedules them again
+    priority_updates: list[PriorityUpdate] = []
 
 
 class SaveProcessedLinks(ProcessDiscoveredLinks):
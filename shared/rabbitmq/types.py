@@ -1,6 +1,6 @@
 
 from abc import ABC, abstractmethod
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, dataclass, field
 from urllib.parse import urlparse
 
 
@@ -33,3 +33,18 @@ class ValidationError(Exception):
         self.field = field
         full_msg = f"{field}: {message}" if field else message
         super().__init__(full_msg)
+
+
+@dataclass
+class PublishBatchResult:
+    """
+    Outcome of `QueueService.publish_batch`
+
+    Attributes:
+        confirmed (int): Messages the broker confirmed (acked)
+        retried (int): Republished messages, after a nack or a lost channel
+        failed (List[str]): Messages that were never confirmed
+    """
+    confirmed: int = 0
+    retried: int = 0
+    failed: list[str] = field(default_factory=list)
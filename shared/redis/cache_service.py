@@ -6,6 +6,12 @@ import redis.exceptions
 # TODO: I temporarily commented out logging to test how it affects performace
 #       put them back when needed
 
+DEFAULT_INLINKS_TTL_SECONDS = 30 * 24 * 3600
+
+# Errors meaning Redis couldn't be reached, as opposed to a rejected command. The
+# scheduling batch methods re-raise them so the caller can retry the work later
+REDIS_UNAVAILABLE_ERRORS = (redis.exceptions.ConnectionError, redis.exceptions.TimeoutError)
+
 
 class CacheService:
     """
@@ -27,6 +33,8 @@ class CacheService:
                 - 'port' (int): Redis port number.
             Optional keys:
                 - 'decode_responses' (bool): Whether to decode byte responses to strings. Defaults to True.
+                - 'inlinks_ttl_seconds' (int): Lifetime of a URL's in-link totals since its last
+                  update. Defaults to 30 days.
 
         logger (logging.Logger): Logger instance.
 
@@ -48,6 +56,7 @@ class CacheService:
             port=redis_configs['port'], 
             decode_responses=redis_configs.get('decode_responses', True), 
         )
+        self._inlinks_ttl_seconds = redis_configs.get('inlinks_ttl_seconds', DEFAULT_INLINKS_TTL_SECONDS)
         self._logger = logger
 
     def batch_is_seen_url(self, urls: list[str]) -> list[bool]:
@@ -74,6 +83,97 @@ class CacheService:
             return [False] * len(urls)
 
 
+    def batch_add_to_seen_set(self, urls: list[str]) -> list[bool]:
+        """
+        Batch adds URLs to the seen set using pipelined SET NX (one round trip).
+
+        Returns:
+            list[bool]: True if the URL was newly added, False if it was already seen.
+                        On other Redis errors, returns all False as fail-safe.
+
+        Raises:
+            redis.exceptions.ConnectionError, redis.exceptions.TimeoutError: If Redis is unreachable
+        """
+        if not urls:
+            return []
+
+        try:
+            with self._redis.pipeline(transaction=False) as pipe:
+                for url in urls:
+                    pipe.set(url, 1, nx=True)
+                results = pipe.execute()
+
+            return [bool(r) for r in results]
+        except REDIS_UNAVAILABLE_ERRORS:
+            raise
+        except redis.exceptions.RedisError as e:
+            self._logger.warning(
+                'Redis batch insert failed: %s', e, exc_info=True)
+            # Fail-safe: treat all as already seen so nothing is scheduled twice
+            return [False] * len(urls)
+
+
+    def batch_remove_from_seen_set(self, urls: list[str]) -> None:
+        """
+        Batch removes URLs from the seen set (one round trip), releasing URLs claimed by
+        `batch_add_to_seen_set` whose scheduling failed so a retry can claim them again.
+
+        Raises:
+            redis.exceptions.RedisError: If the URLs couldn't be removed
+        """
+        if not urls:
+            return
+
+        with self._redis.pipeline(transaction=False) as pipe:
+            for url in urls:
+                pipe.delete(url)
+            pipe.execute()
+
+
+    def batch_record_inlinks(self, contributions: dict[str, tuple[int, float]]) -> dict[str, tuple[int, float]]:
+        """
+        Adds in-link counts and OPIC cash to each URL's running totals (one round trip).
+
+        Totals live in a hash per URL at `inlinks:<url>` with fields `count` and `cash`,
+        expiring `inlinks_ttl_seconds` after their last update so totals of URLs that
+        stopped being linked don't pile up in the (LRU-evicting) instance.
+
+        Args:
+            contributions: URL -> (in-links to add, cash to add)
+
+        Returns:
+            dict[str, tuple[int, float]]: URL -> (total in-links, total cash).
+                                          On other Redis errors, returns the batch contributions as fail-safe.
+
+        Raises:
+            redis.exceptions.ConnectionError, redis.exceptions.TimeoutError: If Redis is unreachable
+        """
+        if not contributions:
+            return {}
+
+        urls = list(contributions)
+        try:
+            with self._redis.pipeline(transaction=False) as pipe:
+                for url in urls:
+                    count, cash = contributions[url]
+                    key = f"inlinks:{url}"
+                    pipe.hincrby(key, "count", count)
+                    pipe.hincrbyfloat(key, "cash", cash)
+                    pipe.expire(key, self._inlinks_ttl_seconds)
+                results = pipe.execute()
+
+            return {
+                url: (int(results[3 * i]), float(results[3 * i + 1]))
+                for i, url in enumerate(urls)
+            }
+        except REDIS_UNAVAILABLE_ERRORS:
+            raise
+        except redis.exceptions.RedisError as e:
+            self._logger.warning(
+                'Redis in-link update failed: %s', e, exc_info=True)
+            return dict(contributions)
+
+
     def add_to_seen_set(self, url: str) -> bool:
         """
         Adds the URL to the seen set using SET NX.
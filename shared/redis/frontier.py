@@ -0,0 +1,171 @@
+import json
+import logging
+from typing import Any
+
+import redis
+
+from shared.rabbitmq.schemas.crawling import CrawlTask
+
+FRONTIER_BACKEND_POSTGRES = "postgres"
+FRONTIER_BACKEND_REDIS = "redis"
+
+# Atomically pops the top-N URLs by priority together with their metadata
+_POP_SCRIPT = """
+local popped = redis.call('ZPOPMAX', KEYS[1], ARGV[1])
+local result = {}
+for i = 1, #popped, 2 do
+    local url = popped[i]
+    result[#result + 1] = url
+    result[#result + 1] = popped[i + 1]
+    result[#result + 1] = redis.call('HGET', KEYS[2], url) or ''
+    redis.call('HDEL', KEYS[2], url)
+end
+return result
+"""
+
+
+class RedisFrontier:
+    """
+    Redis-native crawl frontier, an alternative to the Postgres `scheduled_links` table
+
+    The Scheduler pushes directly and the Dispatcher pops directly, skipping the
+    db_writer insert and the db_reader SELECT FOR UPDATE + DELETE round trip.
+
+    Layout:
+        - `<prefix>:queue` sorted set: URL -> priority (ZPOPMAX gives highest priority first)
+        - `<prefix>:meta` hash: URL -> JSON {depth, scheduled_at}
+
+    Pushing an already queued URL only ever raises its priority (ZADD GT), and pops
+    are atomic across dispatchers (Lua script). `raise_priorities` does the same for
+    URLs that are still queued, without queueing the others again (ZADD XX GT).
+
+    NOTE: The Redis instance backing the frontier must run with `maxmemory-policy noeviction`,
+          otherwise queued URLs can be silently evicted (see `check_eviction_policy`).
+
+    Args:
+        redis_configs (dict[str, Any]): Connection settings ('host', 'port', optional 'db', 'key_prefix')
+        logger (logging.Logger): Logger instance
+    """
+
+    def __init__(self, redis_configs: dict[str, Any], logger: logging.Logger):
+        if not logger:
+            raise ValueError("logger is required")
+
+        required_keys = ['host', 'port']
+        for key in required_keys:
+            if key not in redis_configs:
+                raise ValueError(f"Missing required Redis config key: {key}")
+
+        self._redis = redis.Redis(
+            host=redis_configs['host'],
+            port=redis_configs['port'],
+            db=redis_configs.get('db', 0),
+            decode_responses=True,
+        )
+        self._logger = logger
+
+        prefix = redis_configs.get('key_prefix', 'frontier')
+        self._queue_key = f"{prefix}:queue"
+        self._meta_key = f"{prefix}:meta"
+        self._pop_script = self._redis.register_script(_POP_SCRIPT)
+
+    def check_eviction_policy(self) -> None:
+        """
+        Raises RuntimeError unless the instance runs with `maxmemory-policy noeviction`
+
+        The policy applies to the whole instance, not per database, so sharing an
+        evicting instance (e.g. the seen-set cache) isn't safe even on another db.
+        """
+        policy = self._redis.config_get('maxmemory-policy').get('maxmemory-policy')
+        if policy != 'noeviction':
+            raise RuntimeError(
+                f"Redis frontier instance must run with maxmemory-policy noeviction, not {policy}"
+            )
+
+    def push_links(self, tasks: list[CrawlTask]) -> int:
+        """
+        Adds crawl tasks to the frontier in one round trip
+
+        Returns:
+            int: Number of URLs that were not already queued
+        """
+        if not tasks:
+            return 0
+
+        with self._redis.pipeline(transaction=True) as pipe:
+            pipe.zadd(self._queue_key, {task.url: task.priority for task in tasks}, gt=True)
+            for task in tasks:
+                pipe.hsetnx(
+                    self._meta_key,
+                    task.url,
+                    json.dumps({'depth': task.depth, 'scheduled_at': task.scheduled_at})
+                )
+            results = pipe.execute()
+
+        return int(results[0])
+
+    def raise_priorities(self, priorities: dict[str, float]) -> int:
+        """
+        Raises the priority of URLs that are still queued, leaving the others out
+
+        Returns:
+            int: Number of URLs whose priority was raised
+        """
+        if not priorities:
+            return 0
+
+        return int(self._redis.zadd(self._queue_key, priorities, xx=True, gt=True, ch=True))
+
+    def pop_links(self, count: int) -> list[dict]:
+        """
+        Atomically removes and returns the `count` highest-priority links
+
+        Returns:
+            list[dict]: Dicts with `url`, `scheduled_at`, `depth` and `priority`, in the same
+                        shape the db_reader `/get_scheduled_links` endpoint returns
+        """
+        if count <= 0:
+            return []
+
+        flat = self._pop_script(keys=[self._queue_key, self._meta_key], args=[count])
+
+        links = []
+        for i in range(0, len(flat), 3):
+            url, priority, raw_meta = flat[i], flat[i + 1], flat[i + 2]
+            meta = json.loads(raw_meta) if raw_meta else {}
+            links.append({
+                'url': url,
+                'scheduled_at': meta.get('scheduled_at'),
+                'depth': meta.get('depth', 0),
+                'priority': float(priority),
+            })
+
+        return links
+
+    def size(self) -> int:
+        """
+        Returns the number of URLs currently queued
+        """
+        return self._redis.zcard(self._queue_key)
+
+
+def create_frontier(global_configs: dict[str, Any], logger: logging.Logger) -> RedisFrontier | None:
+    """
+    Builds the configured frontier backend
+
+    Returns:
+        Optional[RedisFrontier]: A RedisFrontier when `frontier.backend` is 'redis', or None
+                                 when the Postgres `scheduled_links` path should be used
+    """
+    frontier_configs = global_configs.get('frontier', {})
+    backend = frontier_configs.get('backend', FRONTIER_BACKEND_POSTGRES)
+
+    if backend == FRONTIER_BACKEND_POSTGRES:
+        return None
+    if backend == FRONTIER_BACKEND_REDIS:
+        logger.info("Using Redis crawl frontier")
+        frontier = RedisFrontier(frontier_configs.get('redis', global_configs['redis']), logger)
+        frontier.check_eviction_policy()
+        return frontier
+
+    raise ValueError(f"Unknown frontier backend: {backend}")
@@ -0,0 +1,176 @@
+"""
+Canonical URL form shared by the Parser and the Scheduler
+
+Every distinct spelling of the same article burns its own Redis key, its own
+`scheduled_links` row and its own crawl, so both components run discovered
+links through `canonicalize_url` before deduplicating them.
+
+Wikipedia-aware rules (applied to Wikimedia hosts only):
+    - Mobile hosts are folded into desktop hosts (en.m.wikipedia.org -> en.wikipedia.org)
+    - Scheme is forced to https
+    - `/w/index.php?title=Foo` article views are rewritten to `/wiki/Foo`
+    - Titles are percent-decoded, spaces become underscores, repeated underscores
+      collapse, and the first letter (and the first letter after a namespace) is
+      upper-cased, then re-encoded the way MediaWiki does it
+    - Query strings and fragments are dropped
+
+Generic rules (all hosts):
+    - Relative URLs are resolved against the base URL
+    - Scheme and host are lower-cased and default ports removed
+    - Query strings and fragments are dropped
+
+Already-canonical article URLs (the vast majority of wikilinks) skip the full
+parse via a regex fast path, and results are memoized in an LRU cache.
+
+NOTE: Redirect pages (e.g. `/wiki/USA` -> `/wiki/United_States`) can't be
+      resolved syntactically and are not handled here.
+"""
+
+import re
+from functools import lru_cache
+from urllib.parse import parse_qs, quote, unquote, urljoin, urlsplit, urlunsplit
+
+DEFAULT_BASE_URL = "https://en.wikipedia.org"
+
+CACHE_SIZE = 100_000
+
+ARTICLE_PREFIX = "/wiki/"
+INDEX_PHP_PATHS = ("/w/index.php", "/index.php")
+
+# index.php query params that don't change which article is displayed
+_VIEW_ONLY_PARAMS = {"title", "action", "redirect", "uselang", "useskin", "variant"}
+
+# Characters MediaWiki leaves unescaped in article paths (see wfUrlencode)
+_TITLE_SAFE_CHARS = ";@$!*(),/:~"
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+_WIKIMEDIA_HOST_RE = re.compile(
+    r"^(?:[a-z0-9-]+\.)*(?:wikipedia|wiktionary|wikibooks|wikinews|wikiquote|"
+    r"wikisource|wikiversity|wikivoyage|wikimedia|wikidata|mediawiki)\.org$"
+)
+# Wikis configured with $wgCapitalLinks = false, where `apple` and `Apple` are
+# different pages, so the first letter of a title is kept as written
+_CASE_SENSITIVE_HOST_RE = re.compile(r"^(?:[a-z0-9-]+\.)*wiktionary\.org$")
+_MOBILE_HOST_RE = re.compile(r"^([a-z0-9-]+)\.m\.([a-z0-9-]+\.org)$")
+_UNDERSCORE_RUN_RE = re.compile(r"_+")
+
+# Plain ASCII article URL that is already in canonical form. Colons are excluded
+# so namespaced titles always take the slow path and get their namespace fixed
+_FAST_PATH_RE = re.compile(
+    r"^https://[a-z0-9-]+\.wikipedia\.org/wiki/[A-Z0-9][A-Za-z0-9_()\-.,!*$;@~/]*$"
+)
+
+# Lower-cased namespace -> canonical spelling (English Wikipedia)
+_NAMESPACES = {
+    name.lower(): name
+    for name in (
+        "Talk", "User", "User_talk", "Wikipedia", "Wikipedia_talk", "File", "File_talk",
+        "Image", "MediaWiki", "MediaWiki_talk", "Template", "Template_talk", "Help",
+        "Help_talk", "Category", "Category_talk", "Portal", "Portal_talk", "Draft",
+        "Draft_talk", "Module", "Module_talk", "Book", "Project", "Special", "Media",
+    )
+}
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def canonicalize_url(url: str, base_url: str = DEFAULT_BASE_URL) -> str:
+    """
+    Returns the canonical form of a (possibly relative) URL
+
+    Args:
+        url (str): Absolute URL or href relative to `base_url`
+        base_url (str): Base used to resolve relative hrefs
+
+    Returns:
+        str: Canonical absolute URL
+
+    Raises:
+        ValueError: If the URL can't be parsed (e.g. an invalid port)
+    """
+    if _FAST_PATH_RE.match(url) and "__" not in url and not url.endswith("_"):
+        return url
+
+    parts = urlsplit(urljoin(base_url, url.strip()))
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+
+    if not _WIKIMEDIA_HOST_RE.match(host):
+        netloc = _with_port(host, scheme, parts.port)
+        path = parts.path or ("/" if netloc else "")
+        return urlunsplit((scheme, netloc, path, "", ""))
+
+    mobile = _MOBILE_HOST_RE.match(host)
+    if mobile:
+        host = f"{mobile.group(1)}.{mobile.group(2)}"
+
+    path = parts.path or "/"
+
+    if path in INDEX_PHP_PATHS:
+        title = _article_title_from_query(parts.query)
+        if title is not None:
+            path = ARTICLE_PREFIX + title
+
+    if path.startswith(ARTICLE_PREFIX):
+        capitalize = not _CASE_SENSITIVE_HOST_RE.match(host)
+        path = ARTICLE_PREFIX + canonicalize_title(path[len(ARTICLE_PREFIX):], capitalize=capitalize)
+
+    return urlunsplit(("https", host, path, "", ""))
+
+
+def canonicalize_title(raw_title: str, capitalize: bool = True) -> str:
+    """
+    Returns the canonical, percent-encoded form of a MediaWiki page title
+
+    e.g. `python%20(programming language)` -> `Python_(programming_language)`
+         `category:living people`          -> `Category:Living_people`
+
+    With `capitalize=False` (wikis with case-sensitive titles, like Wiktionary) the
+    first letter of the title is left as is; namespace names are still canonicalised.
+    """
+    upper_first = _upper_first if capitalize else str
+    title = _UNDERSCORE_RUN_RE.sub("_", unquote(raw_title).replace(" ", "_")).strip("_")
+    if not title:
+        return ""
+
+    namespace, sep, rest = title.partition(":")
+    canonical_namespace = _NAMESPACES.get(namespace.lower()) if sep else None
+
+    if canonical_namespace:
+        title = f"{canonical_namespace}:{upper_first(rest.lstrip('_'))}"
+    else:
+        title = upper_first(title)
+
+    return quote(title, safe=_TITLE_SAFE_CHARS)
+
+
+def _article_title_from_query(query: str):
+    """
+    Extracts the title from an `index.php` article *view*. Returns None for edits,
+    diffs, old revisions and anything else that isn't the article itself
+    """
+    params = parse_qs(query, keep_blank_values=True)
+    titles = params.get("title")
+
+    if not titles or not titles[0]:
+        return None
+    if set(params) - _VIEW_ONLY_PARAMS:
+        return None
+    if params.get("action", ["view"])[0] not in ("view", ""):
+        return None
+
+    return quote(titles[0], safe=_TITLE_SAFE_CHARS)
+
+
+def _upper_first(text: str) -> str:
+    if not text:
+        return text
+    first = text[0].upper()
+    # Characters like 'ß' upper-case to two letters; MediaWiki leaves those alone
+    return (first if len(first) == 1 else text[0]) + text[1:]
+
+
+def _with_port(host: str, scheme: str, port) -> str:
+    if port and port != _DEFAULT_PORTS.get(scheme):
+        return f"{host}:{port}"
+    return host
@@ -0,0 +1,208 @@
+import logging
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from components.db_reader.core.db_reader import (
+    _FIRST_DUE_PAGES_SQL,
+    _NEXT_DUE_PAGES_SQL,
+    _POP_SCHEDULED_LINKS_SQL,
+    TableStatsCache,
+    are_tables_empty,
+    get_table_stats,
+    iter_due_pages,
+    pop_links_from_schedule,
+    search_pages,
+)
+from database.content_store import COMPRESSION_ZSTD, compress_text
+
+SCHEDULED_AT = datetime(2025, 7, 24, 12, tzinfo=UTC)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def mock_db(mocker):
+    db = mocker.Mock()
+    db.execute = AsyncMock(return_value=Mock())
+    context = mocker.MagicMock()
+    context.__aenter__.return_value = db
+    mocker.patch("components.db_reader.core.db_reader.get_db", return_value=context)
+    return db
+
+
+@pytest.fixture
+def mock_logger():
+    return Mock(spec=logging.Logger)
+
+
+def _row(id, url, priority, depth=1):
+    return SimpleNamespace(id=id, url=url, scheduled_at=SCHEDULED_AT, depth=depth, priority=priority)
+
+
+@pytest.mark.anyio
+async def test_pop_links_pops_in_one_statement_and_orders_by_priority(mock_db, mock_logger):
+    mock_db.execute.return_value.all.return_value = [
+        _row(3, "https://example.com/c", 0.5),
+        _row(1, "https://example.com/a", 2.0),
+        _row(2, "https://example.com/b", 0.5),
+    ]
+
+    links = await pop_links_from_schedule(3, mock_logger)
+
+    mock_db.execute.assert_awaited_once_with(_POP_SCHEDULED_LINKS_SQL, {"count": 3})
+    assert [link["url"] for link in links] == [
+        "https://example.com/a", "https://example.com/b", "https://example.com/c"
+    ]
+    assert links[0] == {"url": "https://example.com/a", "scheduled_at": SCHEDULED_AT, "depth": 1, "priority": 2.0}
+
+
+@pytest.mark.anyio
+async def test_pop_links_returns_empty_list_when_schedule_is_empty(mock_db, mock_logger):
+    mock_db.execute.return_value.all.return_value = []
+
+    assert await pop_links_from_schedule(10, mock_logger) == []
+
+
+def _due_row(id, depth=0):
+    return SimpleNamespace(id=id, url=f"https://example.com/{id}", next_crawl_at=SCHEDULED_AT, depth=depth)
+
+
+@pytest.mark.anyio
+async def test_iter_due_pages_pages_through_the_backlog_with_a_keyset(mock_db, mock_logger):
+    mock_db.execute.return_value.all.side_effect = [
+        [_due_row(1, depth=2), _due_row(2)],
+        [_due_row(3)],
+    ]
+
+    pages = [page async for page in iter_due_pages(mock_logger, batch_size=2)]
+
+    assert pages == [
+        {"url": "https://example.com/1", "depth": 2},
+        {"url": "https://example.com/2", "depth": 0},
+        {"url": "https://example.com/3", "depth": 0},
+    ]
+    first, second = mock_db.execute.call_args_list
+    assert first[0][0] is _FIRST_DUE_PAGES_SQL
+    assert second[0][0] is _NEXT_DUE_PAGES_SQL
+    assert (second[0][1]["after_next_crawl_at"], second[0][1]["after_id"]) == (SCHEDULED_AT, 2)
+
+
+def test_due_pages_depth_falls_back_to_url_without_url_id():
+    # The query is plain SQL, so it runs as is on an in-memory SQLite database
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE pages (id INTEGER, url TEXT, url_id INTEGER, next_crawl_at TEXT)"))
+        conn.execute(text("CREATE TABLE links (url TEXT, target_url_id INTEGER, depth INTEGER)"))
+        conn.execute(text("""
+            INSERT INTO pages VALUES
+                (1, 'https://example.com/interned', 10, '2025-07-01'),
+                (2, 'https://example.com/not-backfilled', NULL, '2025-07-02'),
+                (3, 'https://example.com/seed', NULL, '2025-07-03')
+        """))
+        conn.execute(text("""
+            INSERT INTO links VALUES
+                ('https://example.com/interned', 10, 3),
+                ('https://example.com/not-backfilled', NULL, 4),
+                ('https://example.com/not-backfilled', NULL, 2)
+        """))
+
+        rows = conn.execute(_FIRST_DUE_PAGES_SQL, {"now": "2025-08-01", "batch_size": 10}).all()
+
+    assert [(row.url, row.depth) for row in rows] == [
+        ("https://example.com/interned", 3),
+        ("https://example.com/not-backfilled", 2),
+        ("https://example.com/seed", 0),
+    ]
+
+
+@pytest.mark.anyio
+async def test_iter_due_pages_stops_at_limit(mock_db, mock_logger):
+    mock_db.execute.return_value.all.return_value = [_due_row(1), _due_row(2)]
+
+    pages = [page async for page in iter_due_pages(mock_logger, limit=2, batch_size=10)]
+
+    assert len(pages) == 2
+    mock_db.execute.assert_awaited_once()
+    assert mock_db.execute.call_args[0][1]["batch_size"] == 2
+
+
+@pytest.mark.anyio
+async def test_are_tables_empty_uses_a_single_exists_query(mock_db, mock_logger):
+    mock_db.scalar = AsyncMock(return_value=True)
+
+    assert await are_tables_empty(mock_logger) is True
+    mock_db.scalar.assert_awaited_once()
+    assert "EXISTS" in str(mock_db.scalar.call_args[0][0])
+
+
+@pytest.mark.anyio
+async def test_get_table_stats_fills_missing_tables_and_reports_frontier(mock_db, mock_logger):
+    mock_db.execute.return_value.all.side_effect = [
+        [SimpleNamespace(name="pages", row_count=120), SimpleNamespace(name="scheduled_links", row_count=40)],
+        [SimpleNamespace(last_crawl_status="SUCCESS", page_count=100),
+         SimpleNamespace(last_crawl_status="FAILED", page_count=20)],
+    ]
+
+    stats = await get_table_stats(mock_logger)
+
+    assert stats["approximate_row_counts"]["pages"] == 120
+    assert stats["approximate_row_counts"]["links"] == 0
+    assert stats["crawl_status"] == {"SUCCESS": 100, "FAILED": 20}
+    assert stats["frontier_size"] == 40
+
+
+@pytest.mark.anyio
+async def test_table_stats_cache_refreshes_only_after_ttl(mocker, mock_logger):
+    get_stats = mocker.patch(
+        "components.db_reader.core.db_reader.get_table_stats", AsyncMock(side_effect=[{"n": 1}, {"n": 2}])
+    )
+    clock = mocker.patch("components.db_reader.core.db_reader.time.monotonic", return_value=100.0)
+    cache = TableStatsCache(ttl_seconds=60, logger=mock_logger)
+
+    assert await cache.get() == {"n": 1}
+    clock.return_value = 159.0
+    assert await cache.get() == {"n": 1}
+    clock.return_value = 161.0
+    assert await cache.get() == {"n": 2}
+    assert get_stats.await_count == 2
+
+
+@pytest.mark.anyio
+async def test_search_pages_builds_snippets_from_stored_and_inline_text(mock_db, mock_logger):
+    mock_db.execute.return_value.all.return_value = [
+        SimpleNamespace(id=1, url="https://example.com/a", title="A", rank=0.9, text_content=None,
+                        compressed_text=compress_text("all about crawling"), compression=COMPRESSION_ZSTD,
+                        truncated=False),
+        SimpleNamespace(id=2, url="https://example.com/b", title="B", rank=0.5, text_content="legacy crawl text",
+                        compressed_text=None, compression=None, truncated=False),
+    ]
+
+    found = await search_pages("crawl", mock_logger, limit=2, offset=4)
+
+    assert found["truncated"] is False
+    assert [(r["url"], r["snippet"]) for r in found["results"]] == [
+        ("https://example.com/a", "all about crawling"),
+        ("https://example.com/b", "legacy crawl text"),
+    ]
+    params = mock_db.execute.call_args[0][1]
+    assert (params["query"], params["limit"], params["offset"]) == ("crawl", 2, 4)
+
+
+@pytest.mark.anyio
+async def test_search_pages_reports_truncated_candidates(mock_db, mock_logger):
+    mock_db.execute.return_value.all.return_value = [
+        SimpleNamespace(id=1, url="https://example.com/a", title="A", rank=0.9, text_content="crawl",
+                        compressed_text=None, compression=None, truncated=True),
+    ]
+
+    found = await search_pages("crawl", mock_logger, max_candidates=1)
+
+    assert found["truncated"] is True
+    assert mock_db.execute.call_args[0][1]["max_candidates"] == 1
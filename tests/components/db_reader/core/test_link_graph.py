@@ -0,0 +1,128 @@
+from datetime import UTC, datetime
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from components.db_reader.core import link_graph
+from components.db_reader.core.link_graph import (
+    LinkGraph,
+    LinkGraphUnavailable,
+    build_csr,
+    find_in_csr,
+    merge_snapshot,
+    read_current_version,
+    refresh_link_graph,
+    snapshot_arrays,
+    write_snapshot,
+)
+
+STARTED_AT = datetime(2025, 7, 24, 12, tzinfo=UTC)
+
+# 1 -> 2, 1 -> 3, 2 -> 3, 3 -> 4
+SOURCES = np.array([1, 1, 2, 3], dtype=np.int64)
+TARGETS = np.array([2, 3, 3, 4], dtype=np.int64)
+
+
+def _write(directory, sources=SOURCES, targets=TARGETS):
+    return write_snapshot(directory, sources, targets, {"watermark": STARTED_AT.isoformat()})
+
+
+def test_build_csr_groups_values_by_key_in_order():
+    offsets, values = build_csr(np.array([2, 0, 2]), np.array([9, 5, 1]), num_nodes=3)
+
+    assert offsets.tolist() == [0, 1, 1, 3]
+    assert values.tolist() == [5, 1, 9]
+
+
+def test_find_in_csr_reports_presence_and_insert_positions():
+    offsets, values = build_csr(SOURCES, TARGETS, num_nodes=5)
+
+    found, positions = find_in_csr(offsets, values, np.array([1, 1, 2, 0]), np.array([3, 4, 1, 7]))
+
+    assert found.tolist() == [True, False, False, False]
+    assert positions.tolist() == [1, 2, 2, 0]
+
+
+def test_merge_snapshot_matches_a_full_rebuild():
+    rng = np.random.default_rng(0)
+    edges = np.unique(rng.integers(0, 50, size=(300, 2)), axis=0)
+    base = dict(zip(link_graph.ARRAY_NAMES, snapshot_arrays(edges[:200, 0], edges[:200, 1])))
+    # Overlaps the snapshot and reaches nodes it doesn't have yet
+    delta = np.unique(np.concatenate([edges[150:], [[60, 3], [3, 61]]]), axis=0)
+
+    merged = merge_snapshot(base, delta[:, 0], delta[:, 1])
+
+    expected = np.unique(np.concatenate([edges, delta]), axis=0)
+    for array, rebuilt in zip(merged, snapshot_arrays(expected[:, 0], expected[:, 1])):
+        assert array.tolist() == rebuilt.tolist()
+
+
+def test_link_graph_serves_in_and_out_links(tmp_path):
+    _write(tmp_path)
+    graph = LinkGraph(str(tmp_path))
+
+    assert graph.out_links(1) == [2, 3]
+    assert graph.out_links(1, limit=1) == [2]
+    assert graph.in_links(3) == [1, 2]
+    assert graph.out_links(99) == []
+
+
+def test_link_graph_neighbourhood_records_distances_and_caps_nodes(tmp_path):
+    _write(tmp_path)
+    graph = LinkGraph(str(tmp_path))
+
+    assert graph.neighbourhood(1, hops=2, max_nodes=100) == {1: 0, 2: 1, 3: 1, 4: 2}
+    assert graph.neighbourhood(4, hops=1, max_nodes=100, direction="in") == {4: 0, 3: 1}
+    assert len(graph.neighbourhood(1, hops=2, max_nodes=2)) == 2
+
+
+def test_link_graph_without_snapshot_is_unavailable(tmp_path):
+    with pytest.raises(LinkGraphUnavailable):
+        LinkGraph(str(tmp_path)).out_links(1)
+
+
+def test_link_graph_picks_up_new_snapshots_and_old_ones_are_pruned(tmp_path):
+    first = _write(tmp_path)
+    graph = LinkGraph(str(tmp_path), reload_seconds=0)
+    assert graph.out_links(4) == []
+
+    _write(tmp_path, np.append(SOURCES, 4), np.append(TARGETS, 1))
+    _write(tmp_path, np.append(SOURCES, 4), np.append(TARGETS, 1))
+
+    assert graph.out_links(4) == [1]
+    assert not (tmp_path / first).exists()
+
+
+def _engine(rows):
+    engine = MagicMock()
+    conn = engine.connect.return_value.__enter__.return_value
+    conn.execute.return_value.scalar.return_value = STARTED_AT
+    conn.execution_options.return_value.execute.return_value.partitions.return_value = [rows] if rows else []
+    return engine, conn
+
+
+def test_refresh_link_graph_merges_new_links_into_the_current_snapshot(tmp_path):
+    _write(tmp_path)
+    engine, conn = _engine([(4, 1), (1, 2)])
+
+    refresh_link_graph(engine, str(tmp_path))
+
+    params = conn.execution_options.return_value.execute.call_args[0][1]
+    assert params == {"since": STARTED_AT}
+    graph = LinkGraph(str(tmp_path))
+    assert graph.out_links(1) == [2, 3]
+    assert graph.out_links(4) == [1]
+    assert graph.meta["edges"] == 5
+    assert graph.meta["watermark"] == (STARTED_AT - link_graph.DELTA_OVERLAP).isoformat()
+
+
+def test_refresh_link_graph_full_rebuild_reads_every_link(tmp_path):
+    _write(tmp_path)
+    engine, conn = _engine([(7, 8)])
+
+    version = refresh_link_graph(engine, str(tmp_path), full=True)
+
+    assert conn.execution_options.return_value.execute.call_args[0][1] == {}
+    assert read_current_version(tmp_path) == version
+    assert LinkGraph(str(tmp_path)).out_links(1) == []
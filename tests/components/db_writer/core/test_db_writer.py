@@ -1,11 +1,41 @@
 import logging
+from datetime import UTC, datetime
 from unittest.mock import Mock
+
 import pytest
-from components.db_writer.core.db_writer import _get_or_create_categories, add_links_to_schedule, save_page_metadata, save_parsed_data, save_processed_links
-from shared.rabbitmq.schemas.save_to_db import CrawlTask, SaveLinksToSchedule, SavePageMetadataTask, SaveParsedContent, SaveProcessedLinks
+
+from components.db_writer.core import db_writer
+from components.db_writer.core.db_writer import (
+    PAGE_CONTENT_UPSERT,
+    PAGE_METADATA_BATCH_UPSERT,
+    TEXT_CONTENT_UPSERT,
+    _copy_text_row,
+    _fetch_url_ids,
+    _resolve_url_ids,
+    add_links_to_schedule,
+    add_links_to_schedule_batch,
+    save_page_metadata,
+    save_page_metadata_batch,
+    save_parsed_data,
+    save_parsed_data_batch,
+    save_processed_links,
+    save_processed_links_batch,
+    save_processed_links_copy,
+)
+from components.db_writer.core.id_cache import IdCache
+from database.content_store import COMPRESSION_ZSTD, compress_text, decompress_text
+from database.search import UPDATE_SEARCH_VECTORS_SQL
 from shared.rabbitmq.enums.crawl_status import CrawlStatus
+from shared.rabbitmq.schemas.save_to_db import (
+    CrawlTask,
+    PriorityUpdate,
+    SaveLinksToSchedule,
+    SavePageMetadataTask,
+    SaveParsedContent,
+    SaveProcessedLinks,
+)
 from shared.rabbitmq.schemas.scheduling import LinkData
-from database.db_models.models import Category
+from shared.utils import create_hash
 
 
 @pytest.fixture
@@ -41,6 +71,20 @@ def mock_logger():
     return Mock(spec=logging.Logger)
 
 
+@pytest.fixture(autouse=True)
+def url_id_cache(mocker):
+    """
+    Fresh URL ID cache per test, with URLs interned without touching the mocked session
+    """
+    cache = IdCache()
+    mocker.patch("components.db_writer.core.db_writer.URL_ID_CACHE", cache)
+    mocker.patch(
+        "components.db_writer.core.db_writer._fetch_url_ids",
+        side_effect=lambda db, urls: {url: 100 + i for i, url in enumerate(sorted(urls))}
+    )
+    return cache
+
+
 def test_save_page_metadata_success(valid_page_metadata, mock_logger, mock_db_context, mocker):
     # Setup
     mock_db = mocker.Mock()
@@ -102,72 +146,109 @@ def test_save_processed_links_empty_list_skips_insert(mock_db_context, mock_logg
     mock_db_context.execute.assert_not_called()
 
 
-def test_save_parsed_data_inserts_new_page(mock_db_context, mocker, mock_logger):
-    # Setup
-    mock_query = mocker.Mock()
-    mock_query.filter_by.return_value.first.return_value = None
-    mock_db_context.query.return_value = mock_query
+@pytest.fixture
+def category_cache(mocker):
+    cache = IdCache()
+    mocker.patch("components.db_writer.core.db_writer.CATEGORY_ID_CACHE", cache)
+    return cache
 
-    category_1 = Category(name="cat1")
-    category_2 = Category(name="cat2")
 
-    mocker.patch(
-        "components.db_writer.core.db_writer._get_or_create_categories",
-        return_value=[category_1, category_2]
-    )
+# previous-state SELECT result for a page whose stored text is unchanged
+UNCHANGED_TEXT = [("https://example.com/page", "abc123", False, "Title")]
 
-    page_data = SaveParsedContent(
-        source_page_url="https://example.com/page",
+
+def _parsed_content(url="https://example.com/page", categories=None):
+    return SaveParsedContent(
+        source_page_url=url,
         title="Title",
         parsed_at="2025-07-24T12:00:00",
         text_content="content",
         text_content_hash="abc123",
-        categories=["cat1", "cat2"]
+        categories=categories
     )
 
-    result = save_parsed_data(page_data, mock_logger)
 
-    mock_db_context.add.assert_called_once()
+def test_save_parsed_data_upserts_page_and_syncs_categories(mock_db_context, mock_logger, category_cache):
+    category_cache.put_many({"cat1": 1})
+    mock_db_context.execute.side_effect = [
+        UNCHANGED_TEXT,                         # previous text hashes
+        [(10, "https://example.com/page")],     # page_content upsert
+        [(2, "cat2")],                          # INSERT new categories
+        None,                                   # page_categories sync
+    ]
+
+    result = save_parsed_data(_parsed_content(categories=["cat1", "cat2"]), mock_logger)
+
     assert result is True
+    assert mock_db_context.execute.call_count == 4
 
+    stmt, rows = mock_db_context.execute.call_args_list[1][0]
+    assert stmt is PAGE_CONTENT_UPSERT
+    assert rows[0]["source_page_url"] == "https://example.com/page"
 
-def test_save_parsed_data_updates_existing_page(mock_db_context, mocker, mock_logger):
-    # Setup
-    existing_page = mocker.Mock()
+    # only the cache miss went to the database
+    assert mock_db_context.execute.call_args_list[2][0][1] == {"names": ["cat2"]}
 
-    mock_query = mocker.Mock()
-    mock_query.filter_by.return_value.first.return_value = existing_page
-    mock_db_context.query.return_value = mock_query
+    sync_params = mock_db_context.execute.call_args_list[3][0][1]
+    assert sorted(zip(sync_params["page_ids"], sync_params["category_ids"])) == [(10, 1), (10, 2)]
+    assert sync_params["all_page_ids"] == [10]
 
-    category_1 = Category(name="cat1")
-    category_2 = Category(name="cat2")
+    # committed IDs are cached for the next page
+    assert category_cache.get_many(["cat2"]) == ({"cat2": 2}, [])
 
-    mocker.patch(
-        "components.db_writer.core.db_writer._get_or_create_categories",
-        return_value=[category_1, category_2]
-    )
 
-    page_data = SaveParsedContent(
-        source_page_url="https://example.com/page",
-        title="Updated Title",
-        parsed_at="2025-07-24T12:00:00",
-        text_content="Updated Content",
-        text_content_hash="updatedhash123",
-        categories=["cat1", "cat2"]
-    )
+def test_save_parsed_data_looks_up_categories_created_elsewhere(mock_db_context, mock_logger, category_cache):
+    mock_db_context.execute.side_effect = [
+        UNCHANGED_TEXT,
+        [(10, "https://example.com/page")],
+        [],                                     # name already existed, nothing returned
+        [(7, "cat1")],                          # SELECT existing
+        None,
+    ]
 
-    result = save_parsed_data(page_data, mock_logger)
+    save_parsed_data(_parsed_content(categories=["cat1"]), mock_logger)
 
-    assert existing_page.title == page_data.title
-    assert existing_page.text_content == page_data.text_content
-    assert existing_page.text_content_hash == page_data.text_content_hash
-    assert existing_page.parsed_at == page_data.parsed_at
-    assert existing_page.categories == [category_1, category_2]
-    assert result is True
+    sync_params = mock_db_context.execute.call_args_list[4][0][1]
+    assert sync_params["category_ids"] == [7]
+
+
+def test_save_parsed_data_without_categories_clears_associations(mock_db_context, mock_logger, category_cache):
+    mock_db_context.execute.side_effect = [UNCHANGED_TEXT, [(10, "https://example.com/page")], None]
+
+    save_parsed_data(_parsed_content(categories=None), mock_logger)
+
+    assert mock_db_context.execute.call_count == 3
+    sync_params = mock_db_context.execute.call_args_list[2][0][1]
+    assert sync_params == {"page_ids": [], "category_ids": [], "all_page_ids": [10]}
+
+
+def test_save_parsed_data_batch_dedupes_pages(mock_db_context, mock_logger, category_cache):
+    mock_db_context.execute.side_effect = [UNCHANGED_TEXT, [(10, "https://example.com/page")], None, None]
+    first = _parsed_content()
+    second = first.model_copy(update={"title": "Newer Title"})
+
+    save_parsed_data_batch([first, second], mock_logger)
+
+    _, rows = mock_db_context.execute.call_args_list[1][0]
+    assert [row["title"] for row in rows] == ["Newer Title"]
+
+
+def test_save_parsed_data_failure_does_not_cache_ids(mock_db_context, mock_logger, category_cache):
+    mock_db_context.execute.side_effect = [
+        UNCHANGED_TEXT,
+        [(10, "https://example.com/page")],
+        [(2, "cat2")],
+        RuntimeError("sync failed"),
+    ]
+
+    result = save_parsed_data(_parsed_content(categories=["cat2"]), mock_logger)
+
+    assert result is False
+    assert len(category_cache) == 0
 
 
 def test_save_parsed_data_handles_exception(mock_db_context, mock_logger):
-    mock_db_context.query.side_effect = RuntimeError("Simulated failure")
+    mock_db_context.execute.side_effect = RuntimeError("Simulated failure")
 
     page_data = SaveParsedContent(
         source_page_url="https://example.com/page",
@@ -183,6 +264,85 @@ def test_save_parsed_data_handles_exception(mock_db_context, mock_logger):
     assert result is False
 
 
+def test_save_parsed_data_stores_changed_text_and_releases_old_one(mock_db_context, mock_logger, category_cache):
+    mock_db_context.execute.side_effect = [
+        [("https://example.com/page", "old-hash", False, "Title")],
+        [(10, "https://example.com/page")],
+        None,                                   # text_contents upsert
+        None,                                   # release old text
+        None,
+        None,                                   # search vectors
+    ]
+
+    assert save_parsed_data(_parsed_content(), mock_logger) is True
+
+    _, page_rows = mock_db_context.execute.call_args_list[1][0]
+    assert page_rows[0]["text_content"] is None
+    assert page_rows[0]["text_content_hash"] == "abc123"
+
+    stmt, stored = mock_db_context.execute.call_args_list[2][0]
+    assert stmt is TEXT_CONTENT_UPSERT
+    assert stored[0]["content_hash"] == "abc123"
+    assert stored[0]["ref_count"] == 1
+    assert decompress_text(stored[0]["compressed_text"], stored[0]["compression"]) == "content"
+
+    released = mock_db_context.execute.call_args_list[3][0][1]
+    assert released == {"content_hashes": ["old-hash"], "counts": [1]}
+
+    stmt, params = mock_db_context.execute.call_args_list[5][0]
+    assert stmt is UPDATE_SEARCH_VECTORS_SQL
+    assert (params["urls"], params["titles"], params["bodies"]) == (["https://example.com/page"], ["Title"], ["content"])
+
+
+def test_save_parsed_data_migrates_inline_text_without_releasing(mock_db_context, mock_logger, category_cache):
+    mock_db_context.execute.side_effect = [
+        [("https://example.com/page", "abc123", True, "Title")],    # legacy row with inline text
+        [(10, "https://example.com/page")],
+        None,
+        None,
+        None,
+    ]
+
+    save_parsed_data(_parsed_content(), mock_logger)
+
+    assert mock_db_context.execute.call_count == 5
+    stmt, stored = mock_db_context.execute.call_args_list[2][0]
+    assert stmt is TEXT_CONTENT_UPSERT
+    assert stored[0]["ref_count"] == 1
+
+
+def test_save_parsed_data_batch_nets_references_per_hash(mock_db_context, mock_logger, category_cache):
+    # page a moves to page b's old text, page b moves to a new one
+    page_a = _parsed_content(url="https://example.com/a").model_copy(update={"text_content_hash": "shared"})
+    page_b = _parsed_content(url="https://example.com/b").model_copy(update={"text_content_hash": "new"})
+    mock_db_context.execute.side_effect = [
+        [("https://example.com/a", "gone", False, "Title"), ("https://example.com/b", "shared", False, "Title")],
+        [(10, "https://example.com/a"), (11, "https://example.com/b")],
+        None,
+        None,
+        None,
+        None,
+    ]
+
+    save_parsed_data_batch([page_a, page_b], mock_logger)
+
+    _, stored = mock_db_context.execute.call_args_list[2][0]
+    assert [(row["content_hash"], row["ref_count"]) for row in stored] == [("new", 1)]
+    released = mock_db_context.execute.call_args_list[3][0][1]
+    assert released == {"content_hashes": ["gone"], "counts": [1]}
+
+
+def test_content_store_round_trip():
+    text = "Some article text " * 100
+
+    compressed = compress_text(text)
+
+    assert len(compressed) < len(text)
+    assert decompress_text(compressed, COMPRESSION_ZSTD) == text
+    with pytest.raises(ValueError):
+        decompress_text(compressed, "lz4")
+
+
 def test_add_links_to_schedule_success(mock_db_context, mock_logger):
     links = [
         CrawlTask(
@@ -228,56 +388,291 @@ def test_add_links_to_schedule_raises_on_failure(mock_db_context, mock_logger):
         add_links_to_schedule(data, mock_logger)
 
 
-def test_get_or_create_categories_all_exist(mocker):
-    db = mocker.Mock()
+def test_save_page_metadata_batch_issues_one_cached_statement(mock_db_context, mock_logger, valid_page_metadata):
+    second = valid_page_metadata.model_copy(update={"url": "https://example.org"})
 
-    existing = [Category(name="cat1"), Category(name="cat2")]
-    query_mock = mocker.Mock()
-    query_mock.filter.return_value.all.return_value = existing
-    db.query.return_value = query_mock
+    save_page_metadata_batch([valid_page_metadata, second], mock_logger)
 
-    result = _get_or_create_categories(db, ["cat1", "cat2"])
+    mock_db_context.execute.assert_called_once()
+    stmt, rows = mock_db_context.execute.call_args[0]
+    assert stmt is PAGE_METADATA_BATCH_UPSERT
+    assert [row["url"] for row in rows] == ["https://example.com", "https://example.org"]
 
-    db.add_all.assert_called_once_with([])
-    db.flush.assert_called_once()
-    assert result == existing
 
+def test_save_page_metadata_batch_dedupes_by_url_and_sums_attempts(mock_db_context, mock_logger, valid_page_metadata):
+    failed = valid_page_metadata.model_copy(update={
+        "status": CrawlStatus.FAILED, "http_status_code": None, "error_message": "timeout"
+    })
+    retried = valid_page_metadata.model_copy(update={"http_status_code": 201})
 
-def test_get_or_create_categories_some_new(mocker):
-    # Setup
-    db = mocker.Mock()
+    save_page_metadata_batch([failed, retried], mock_logger)
 
-    existing = [Category(name="cat1")]
-    query_mock = mocker.Mock()
-    query_mock.filter.return_value.all.return_value = existing
-    db.query.return_value = query_mock
+    _, rows = mock_db_context.execute.call_args[0]
+    assert len(rows) == 1
+    assert rows[0]["last_crawl_status"] == CrawlStatus.SUCCESS.value
+    assert rows[0]["http_status_code"] == 201
+    assert rows[0]["total_crawl_attempts"] == 2
+    assert rows[0]["failed_crawl_attempts"] == 1
 
-    # Act
-    result = _get_or_create_categories(db, ["cat1", "cat2"])
 
-    # Assert
-    db.add_all.assert_called_once()
-    db.flush.assert_called_once()
+def test_save_page_metadata_batch_raises_on_failure(mock_db_context, mock_logger, valid_page_metadata):
+    mock_db_context.execute.side_effect = RuntimeError("Simulated DB failure")
+
+    with pytest.raises(RuntimeError):
+        save_page_metadata_batch([valid_page_metadata], mock_logger)
+
+
+def test_save_page_metadata_batch_skips_already_applied_keys(mock_db_context, mock_logger, valid_page_metadata):
+    applied = valid_page_metadata.model_copy(update={"idempotency_key": "attempt-1"})
+    new = valid_page_metadata.model_copy(update={"url": "https://example.org", "idempotency_key": "attempt-2"})
+    redelivered = new.model_copy()
+    claim = Mock()
+    claim.scalars.return_value = ["attempt-2"]      # attempt-1 was applied before
+    mock_db_context.execute.side_effect = [claim, None]
 
-    created = db.add_all.call_args[0][0]
-    assert any(c.name == "cat2" for c in created)
-    assert len(result) == 2
+    save_page_metadata_batch([applied, new, redelivered], mock_logger)
 
+    assert mock_db_context.execute.call_args_list[0][0][1] == {"keys": ["attempt-1", "attempt-2"]}
+    stmt, rows = mock_db_context.execute.call_args_list[1][0]
+    assert stmt is PAGE_METADATA_BATCH_UPSERT
+    assert [(row["url"], row["total_crawl_attempts"]) for row in rows] == [("https://example.org", 1)]
 
-def test_get_or_create_categories_all_new(mocker):
-    db = mocker.Mock()
 
-    query_mock = mocker.Mock()
-    query_mock.filter.return_value.all.return_value = []
-    db.query.return_value = query_mock
+def test_save_page_metadata_skips_redelivered_message(mock_db_context, mock_logger, valid_page_metadata):
+    claim = Mock()
+    claim.scalars.return_value = []
+    mock_db_context.execute.return_value = claim
 
-    result = _get_or_create_categories(db, ["cat1", "cat2"])
+    save_page_metadata(valid_page_metadata.model_copy(update={"idempotency_key": "attempt-1"}), mock_logger)
 
-    db.add_all.assert_called_once()
-    db.flush.assert_called_once()
-    created = db.add_all.call_args[0][0]
+    # only the claim ran
+    mock_db_context.execute.assert_called_once()
+
+
+def test_save_processed_links_batch_dedupes_across_messages(mock_db_context, mock_logger, mocker):
+    upsert = mocker.patch("components.db_writer.core.db_writer._processed_links_upsert")
+
+    def make_link(url, anchor_text):
+        return LinkData(
+            source_page_url="https://example.com",
+            url=url,
+            depth=1,
+            discovered_at="2025-07-24T12:00:00",
+            anchor_text=anchor_text,
+        )
+
+    tasks = [
+        SaveProcessedLinks(links=[make_link("https://example.com/a", "old"), make_link("https://example.com/b", "b")]),
+        SaveProcessedLinks(links=[make_link("https://example.com/a", "new")]),
+    ]
+
+    save_processed_links_batch(tasks, mock_logger)
+
+    mock_db_context.execute.assert_called_once_with(upsert.return_value)
+    rows = upsert.call_args[0][0]
+    assert len(rows) == 2
+    assert {row["url"]: row["anchor_text"] for row in rows}["https://example.com/a"] == "new"
+
+
+def test_add_links_to_schedule_batch_keeps_highest_priority(mock_db_context, mock_logger, mocker):
+    upsert = mocker.patch("components.db_writer.core.db_writer._scheduled_links_upsert")
+
+    tasks = [
+        SaveLinksToSchedule(links=[
+            CrawlTask(url="https://example.com", depth=1, scheduled_at="2025-07-24T12:00:00", priority=2.0)
+        ]),
+        SaveLinksToSchedule(links=[
+            CrawlTask(url="https://example.com", depth=1, scheduled_at="2025-07-24T12:00:01", priority=1.0),
+            CrawlTask(url="https://example.org", depth=2, scheduled_at="2025-07-24T12:00:01", priority=0.5),
+        ]),
+    ]
+
+    add_links_to_schedule_batch(tasks, mock_logger)
+
+    mock_db_context.execute.assert_called_once()
+    rows = {row["url"]: row for row in upsert.call_args[0][0]}
+    assert rows["https://example.com"]["priority"] == 2.0
+    assert len(rows) == 2
+
+
+def test_add_links_to_schedule_batch_raises_queued_priorities(mock_db_context, mock_logger):
+    tasks = [
+        SaveLinksToSchedule(links=[], priority_updates=[
+            PriorityUpdate(url="https://example.org", priority=1.0),
+            PriorityUpdate(url="https://example.com", priority=3.0),
+        ]),
+        SaveLinksToSchedule(links=[], priority_updates=[PriorityUpdate(url="https://example.org", priority=2.0)]),
+    ]
+
+    add_links_to_schedule_batch(tasks, mock_logger)
+
+    statement, params = mock_db_context.execute.call_args[0]
+    assert statement is db_writer._RAISE_SCHEDULED_PRIORITIES_SQL
+    assert params == {"urls": ["https://example.com", "https://example.org"], "priorities": [3.0, 2.0]}
+
+
+def test_scheduled_links_upsert_only_raises_priority_on_conflict():
+    from sqlalchemy.dialects import postgresql
+
+    statement = db_writer._scheduled_links_upsert([
+        {"url": "https://example.com", "scheduled_at": "2025-07-24T12:00:00", "depth": 1, "priority": 2.0}
+    ])
+
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (url) DO UPDATE SET priority = greatest(scheduled_links.priority, excluded.priority)" in sql
+
+
+def test_add_links_to_schedule_batch_skips_on_empty(mock_db_context, mock_logger):
+    add_links_to_schedule_batch([SaveLinksToSchedule(links=[])], mock_logger)
+
+    mock_db_context.execute.assert_not_called()
+
+
+def test_copy_text_row_escapes_specials_and_nulls():
+    row = _copy_text_row(["a\tb\nc\\d", None, True, False, 3])
+
+    assert row == "a\\tb\\nc\\\\d\t\\N\tt\tf\t3\n"
+
+
+def test_save_processed_links_copy_streams_deduped_rows_then_merges(mock_db_context, mock_logger):
+    def make_link(url, anchor_text):
+        return LinkData(
+            source_page_url="https://example.com",
+            url=url,
+            depth=1,
+            discovered_at="2025-07-24T12:00:00",
+            anchor_text=anchor_text,
+        )
+
+    tasks = [
+        SaveProcessedLinks(links=[make_link("https://example.com/a", "old"), make_link("https://example.com/b", "b")]),
+        SaveProcessedLinks(links=[make_link("https://example.com/a", "new")]),
+    ]
+    connection = mock_db_context.connection.return_value
+    cursor = connection.connection.cursor.return_value
+    copied = []
+    cursor.copy_expert.side_effect = lambda sql, buffer: copied.append(buffer.read())
+
+    save_processed_links_copy(tasks, mock_logger)
+
+    assert "COPY links_staging" in cursor.copy_expert.call_args[0][0]
+    lines = copied[0].splitlines()
+    assert len(lines) == 2
+    assert "\tnew\t" in lines[0]
+
+    # CREATE staging table, then merge
+    assert connection.execute.call_count == 2
+    assert "INSERT INTO links" in str(connection.execute.call_args[0][0])
+    cursor.close.assert_called_once()
+
+
+def test_save_processed_links_copy_skips_on_empty(mock_db_context, mock_logger):
+    save_processed_links_copy([SaveProcessedLinks(links=[])], mock_logger)
+
+    mock_db_context.connection.assert_not_called()
+
+
+def test_save_processed_links_batch_attaches_url_ids(mock_db_context, mock_logger, mocker, url_id_cache):
+    upsert = mocker.patch("components.db_writer.core.db_writer._processed_links_upsert")
+    link = LinkData(
+        source_page_url="https://example.com",
+        url="https://example.com/about",
+        depth=1,
+        discovered_at="2025-07-24T12:00:00",
+    )
 
-    assert all(isinstance(c, Category) for c in created)
-    assert {c.name for c in created} == {"cat1", "cat2"}
-    assert len(result) == 2
+    save_processed_links_batch([SaveProcessedLinks(links=[link])], mock_logger)
 
+    row = upsert.call_args[0][0][0]
+    assert row["source_url_id"] == 100
+    assert row["target_url_id"] == 101
+
+    # interned IDs are cached after the commit
+    assert url_id_cache.get_many(["https://example.com"]) == ({"https://example.com": 100}, [])
+
+
+def test_save_page_metadata_batch_failure_does_not_cache_url_ids(mock_db_context, mock_logger, valid_page_metadata, url_id_cache):
+    mock_db_context.execute.side_effect = RuntimeError("Simulated DB failure")
+
+    with pytest.raises(RuntimeError):
+        save_page_metadata_batch([valid_page_metadata], mock_logger)
+
+    assert len(url_id_cache) == 0
+
+
+def test_resolve_url_ids_only_fetches_cache_misses(url_id_cache):
+    url_id_cache.put_many({"https://a.com": 1})
+    url_ids, fetched = _resolve_url_ids(Mock(), ["https://a.com", "https://b.com"])
+
+    assert url_ids == {"https://a.com": 1, "https://b.com": 100}
+    assert fetched == {"https://b.com": 100}
+    assert db_writer._fetch_url_ids.call_args[0][1] == ["https://b.com"]
+
+
+def test_fetch_url_ids_selects_urls_interned_concurrently():
+    db = Mock()
+    db.execute.side_effect = [
+        [(5, "https://new.com")],   # INSERT ... RETURNING only returns new rows
+        [(3, "https://old.com")],   # SELECT by hash for the conflicting ones
+    ]
+
+    ids = _fetch_url_ids(db, ["https://new.com", "https://old.com"])
+
+    assert ids == {"https://new.com": 5, "https://old.com": 3}
+    assert db.execute.call_args[0][1] == {"url_hashes": [create_hash("https://old.com")]}
+
+
+@pytest.fixture
+def recrawl_policy(mocker):
+    policy = db_writer.RecrawlPolicy(3600, 30 * 86400, history_decay=1.0)
+    mocker.patch("components.db_writer.core.db_writer.RECRAWL_POLICY", policy)
+    return policy
+
+
+def test_configure_recrawl_policy_only_when_enabled(mocker):
+    mocker.patch("components.db_writer.core.db_writer.RECRAWL_POLICY", None)
+    section = {"min_interval_seconds": 3600, "max_interval_seconds": 86400}
+
+    assert db_writer.configure_recrawl_policy({"recrawl_policy": section}) is None
+    policy = db_writer.configure_recrawl_policy({"recrawl_policy": {**section, "enabled": True}})
+    assert db_writer.RECRAWL_POLICY is policy
+
+
+def test_save_page_metadata_batch_backs_off_unchanged_pages(mock_db_context, mock_logger, valid_page_metadata, recrawl_policy):
+    task = valid_page_metadata.model_copy(update={
+        "fetched_at": "2025-07-24T12:00:00+00:00", "next_crawl": "2025-08-01T12:00:00+00:00"
+    })
+    # crawled 2 days earlier with the same content, scheduled 2 days out
+    previous = ("https://example.com", "hash2", datetime(2025, 7, 22, 12, tzinfo=UTC), 1.0, 0.0, 86400.0, 2 * 86400.0)
+    mock_db_context.execute.side_effect = [[previous], None]
+
+    save_page_metadata_batch([task], mock_logger)
+
+    stmt, rows = mock_db_context.execute.call_args[0]
+    assert stmt is PAGE_METADATA_BATCH_UPSERT
+    assert rows[0]["change_checks"] == 2
+    assert rows[0]["changes_detected"] == 0
+    assert rows[0]["change_observed_seconds"] == 3 * 86400
+    assert rows[0]["recrawl_interval_seconds"] == 4 * 86400
+    assert rows[0]["next_crawl_at"] == "2025-07-28T12:00:00+00:00"
+
+
+def test_save_page_metadata_batch_seeds_new_pages_and_skips_failures(mock_db_context, mock_logger, valid_page_metadata, recrawl_policy):
+    new = valid_page_metadata.model_copy(update={
+        "fetched_at": "2025-07-24T12:00:00+00:00", "next_crawl": "2025-08-01T12:00:00+00:00"
+    })
+    failed = new.model_copy(update={
+        "url": "https://example.org", "status": CrawlStatus.FAILED, "html_content_hash": None, "next_crawl": None
+    })
+    mock_db_context.execute.side_effect = [[], None]
+
+    save_page_metadata_batch([new, failed], mock_logger)
+
+    _, rows = mock_db_context.execute.call_args[0]
+    by_url = {row["url"]: row for row in rows}
+    # first crawl: the crawler's interval, no history yet
+    assert by_url["https://example.com"]["next_crawl_at"] == "2025-08-01T12:00:00+00:00"
+    assert by_url["https://example.com"]["recrawl_interval_seconds"] == 8 * 86400
+    assert by_url["https://example.com"]["change_checks"] is None
+    assert by_url["https://example.org"]["next_crawl_at"] is None
+    assert by_url["https://example.org"]["recrawl_interval_seconds"] is None
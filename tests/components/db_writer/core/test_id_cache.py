@@ -0,0 +1,25 @@
+from components.db_writer.core.id_cache import IdCache
+
+
+def test_get_many_splits_hits_and_misses():
+    cache = IdCache()
+    cache.put_many({"cat1": 1, "cat2": 2})
+
+    found, missing = cache.get_many(["cat1", "cat3"])
+
+    assert found == {"cat1": 1}
+    assert missing == ["cat3"]
+
+
+def test_put_many_evicts_least_recently_used():
+    cache = IdCache(maxsize=2)
+    cache.put_many({"cat1": 1, "cat2": 2})
+
+    # touching cat1 makes cat2 the eviction candidate
+    cache.get_many(["cat1"])
+    cache.put_many({"cat3": 3})
+
+    found, missing = cache.get_many(["cat1", "cat2", "cat3"])
+    assert found == {"cat1": 1, "cat3": 3}
+    assert missing == ["cat2"]
+    assert len(cache) == 2
@@ -0,0 +1,68 @@
+import math
+
+import pytest
+
+from components.db_writer.core.recrawl_policy import ChangeHistory, RecrawlPolicy
+
+DAY = 86400
+
+
+def _policy(**overrides):
+    configs = {
+        "min_interval_seconds": 3600,
+        "max_interval_seconds": 30 * DAY,
+        "target_change_probability": 0.5,
+        "max_growth_factor": 2.0,
+        "history_decay": 1.0,
+        **overrides,
+    }
+    return RecrawlPolicy.from_configs(configs)
+
+
+def test_record_decays_past_observations():
+    policy = _policy(history_decay=0.5)
+
+    history = policy.record(ChangeHistory(checks=4, changes=2, observed_seconds=4 * DAY), True, DAY)
+
+    assert history == ChangeHistory(checks=3, changes=2, observed_seconds=3 * DAY)
+
+
+def test_change_rate_is_none_without_observations():
+    assert _policy().change_rate(ChangeHistory()) is None
+
+
+def test_page_changing_every_crawl_is_recrawled_sooner():
+    policy = _policy()
+    history = ChangeHistory(checks=10, changes=10, observed_seconds=10 * DAY)
+
+    interval = policy.next_interval(history, previous_interval=DAY)
+
+    # rate = ln(21) per day, revisit after ln(2) / rate days
+    assert interval == pytest.approx(DAY * math.log(2) / math.log(21))
+
+
+def test_unchanged_page_backs_off_exponentially_up_to_the_bound():
+    policy = _policy()
+    history = ChangeHistory(checks=3, changes=0, observed_seconds=3 * DAY)
+
+    assert policy.next_interval(history, previous_interval=DAY) == 2 * DAY
+    assert policy.next_interval(history, previous_interval=20 * DAY) == 30 * DAY
+
+
+def test_interval_without_history_is_the_previous_one_within_bounds():
+    policy = _policy()
+
+    assert policy.next_interval(None, previous_interval=8 * DAY) == 8 * DAY
+    assert policy.next_interval(None, previous_interval=60) == 3600
+
+
+@pytest.mark.parametrize("overrides", [
+    {"min_interval_seconds": 0},
+    {"min_interval_seconds": 2 * DAY, "max_interval_seconds": DAY},
+    {"target_change_probability": 1},
+    {"max_growth_factor": 0.5},
+    {"history_decay": 0},
+])
+def test_rejects_invalid_settings(overrides):
+    with pytest.raises(ValueError):
+        _policy(**overrides)
@@ -1,11 +1,26 @@
-import logging
-import pytest
 import json
+import logging
 from unittest.mock import Mock
-from components.db_writer.services.message_handler import consume_add_links_to_schedule, consume_save_page_metadata, consume_save_parsed_content, consume_save_processed_links, start_db_service_listener
+
+import pytest
+
+from components.db_writer.core.db_writer import (
+    save_processed_links_batch,
+    save_processed_links_copy,
+)
+from components.db_writer.services.message_handler import (
+    BatchWriteConsumer,
+    consume_add_links_to_schedule,
+    consume_save_page_metadata,
+    consume_save_parsed_content,
+    consume_save_processed_links,
+    get_batch_writer,
+    get_queue_batching,
+    start_db_service_listener,
+)
 from shared.rabbitmq.enums.crawl_status import CrawlStatus
-from shared.rabbitmq.schemas.save_to_db import SavePageMetadataTask, SaveParsedContent
 from shared.rabbitmq.enums.queue_names import DbWriterQueueChannels
+from shared.rabbitmq.schemas.save_to_db import SavePageMetadataTask, SaveParsedContent
 
 
 @pytest.fixture
@@ -368,3 +383,106 @@ def test_start_db_service_listener_registers_consumers_correctly(mocker, mock_lo
     )
 
     mock_channel.start_consuming.assert_called_once()
+
+
+def _metadata_body(url):
+    return SavePageMetadataTask(
+        status=CrawlStatus.SUCCESS,
+        fetched_at="2025-07-24T12:00:00",
+        url=url,
+        http_status_code=200,
+        url_hash="hash",
+        html_content_hash="hash",
+        compressed_filepath="/path",
+        next_crawl="2025-07-30T12:00:00",
+    ).model_dump_json().encode()
+
+
+def _make_batch_consumer(write_batch, mock_logger, max_messages=2):
+    return BatchWriteConsumer(
+        DbWriterQueueChannels.PAGE_METADATA_TO_SAVE.value,
+        SavePageMetadataTask,
+        write_batch,
+        Mock(),
+        {"max_messages": max_messages, "max_wait_ms": 100},
+        mock_logger,
+    )
+
+
+def test_batch_consumer_flushes_on_size_with_one_multi_ack(mock_ch, mock_logger):
+    write_batch = Mock()
+    consumer = _make_batch_consumer(write_batch, mock_logger)
+
+    consumer.on_message(mock_ch, Mock(delivery_tag=1), None, _metadata_body("https://a.com"))
+    write_batch.assert_not_called()
+
+    consumer.on_message(mock_ch, Mock(delivery_tag=2), None, _metadata_body("https://b.com"))
+
+    tasks = write_batch.call_args[0][0]
+    assert [task.url for task in tasks] == ["https://a.com", "https://b.com"]
+    mock_ch.basic_ack.assert_called_once_with(delivery_tag=2, multiple=True)
+
+
+def test_batch_consumer_starts_timer_on_first_message(mock_ch, mock_logger):
+    consumer = _make_batch_consumer(Mock(), mock_logger)
+
+    consumer.on_message(mock_ch, Mock(delivery_tag=1), None, _metadata_body("https://a.com"))
+
+    consumer._queue_service.call_later.assert_called_once()
+    assert consumer._queue_service.call_later.call_args[0][0] == 0.1
+
+
+def test_batch_consumer_nacks_invalid_message_without_buffering(mock_ch, mock_logger):
+    write_batch = Mock()
+    consumer = _make_batch_consumer(write_batch, mock_logger, max_messages=1)
+
+    consumer.on_message(mock_ch, Mock(delivery_tag=7), None, b"{not json}")
+
+    mock_ch.basic_nack.assert_called_once_with(delivery_tag=7, requeue=False)
+    write_batch.assert_not_called()
+
+
+def test_batch_consumer_falls_back_to_single_writes_on_failure(mock_ch, mock_logger):
+    def write_batch(tasks, logger):
+        if len(tasks) > 1 or tasks[0].url == "https://bad.com":
+            raise RuntimeError("DB write failed")
+
+    consumer = _make_batch_consumer(write_batch, mock_logger)
+
+    consumer.on_message(mock_ch, Mock(delivery_tag=1), None, _metadata_body("https://good.com"))
+    consumer.on_message(mock_ch, Mock(delivery_tag=2), None, _metadata_body("https://bad.com"))
+
+    mock_ch.basic_ack.assert_called_once_with(delivery_tag=1)
+    mock_ch.basic_nack.assert_called_once_with(delivery_tag=2, requeue=False)
+
+
+def test_get_queue_batching_merges_queue_overrides():
+    configs = {
+        "batching": {
+            "defaults": {"max_messages": 100, "max_wait_ms": 250},
+            "queues": {"parsed_content_to_save": {"max_messages": 10}},
+        }
+    }
+
+    assert get_queue_batching(configs, "parsed_content_to_save") == {"max_messages": 10, "max_wait_ms": 250}
+    assert get_queue_batching(configs, "add_links_to_schedule") == {"max_messages": 100, "max_wait_ms": 250}
+
+
+def test_start_db_service_listener_opens_a_channel_per_queue_when_batching(mocker, mock_logger):
+    mock_queue_service = mocker.Mock()
+    configs = {"batching": {"enabled": True, "defaults": {"max_messages": 50}}}
+
+    start_db_service_listener(mock_queue_service, mock_logger, configs)
+
+    assert mock_queue_service.open_channel.call_count == 4
+    mock_queue_service.open_channel.assert_any_call(prefetch_count=50)
+    mock_queue_service._channel.basic_consume.assert_not_called()
+    mock_queue_service.run_io_loop.assert_called_once()
+
+
+def test_get_batch_writer_selects_loader_per_queue():
+    assert get_batch_writer(DbWriterQueueChannels.SCHEDULED_LINKS_TO_SAVE, "copy") is save_processed_links_copy
+    assert get_batch_writer(DbWriterQueueChannels.SCHEDULED_LINKS_TO_SAVE, "upsert") is save_processed_links_batch
+
+    with pytest.raises(ValueError):
+        get_batch_writer(DbWriterQueueChannels.PAGE_METADATA_TO_SAVE, "copy")
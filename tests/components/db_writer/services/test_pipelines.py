@@ -0,0 +1,88 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from components.db_writer.services import pipelines
+from components.db_writer.services.pipelines import (
+    QueuePipeline,
+    get_queue_pipeline,
+    start_queue_pipelines,
+)
+from shared.rabbitmq.enums.queue_names import DbWriterQueueChannels
+
+
+@pytest.fixture
+def mock_logger():
+    return MagicMock()
+
+
+@pytest.fixture
+def build_engine(mocker):
+    return mocker.patch.object(pipelines, "build_engine")
+
+
+@pytest.fixture
+def queue_service_cls(mocker):
+    return mocker.patch.object(pipelines, "QueueService")
+
+
+def test_get_queue_pipeline_merges_overrides_and_defaults_connections_to_concurrency():
+    configs = {
+        "pipelines": {
+            "defaults": {"concurrency": 1},
+            "queues": {"scheduled_links_to_save": {"concurrency": 3}},
+        }
+    }
+
+    assert get_queue_pipeline(configs, "scheduled_links_to_save") == {"concurrency": 3, "db_connections": 3}
+    assert get_queue_pipeline(configs, "add_links_to_schedule") == {"concurrency": 1, "db_connections": 1}
+
+
+def test_get_queue_pipeline_rejects_empty_budget():
+    with pytest.raises(ValueError):
+        get_queue_pipeline({"pipelines": {"defaults": {"concurrency": 0}}}, "add_links_to_schedule")
+
+
+def test_queue_pipeline_gets_its_own_capped_engine(build_engine, mock_logger):
+    configs = {"pipelines": {"defaults": {"concurrency": 2, "db_connections": 1}}}
+
+    QueuePipeline(DbWriterQueueChannels.PAGE_METADATA_TO_SAVE, configs, threading.Event(), mock_logger)
+
+    profile = build_engine.call_args[0][0]
+    assert (profile["pool_size"], profile["max_overflow"]) == (1, 0)
+
+
+def test_queue_pipeline_consumers_use_their_own_connection(build_engine, queue_service_cls, mock_logger):
+    configs = {
+        "batching": {"enabled": True, "defaults": {"max_messages": 25}},
+        "pipelines": {"defaults": {"concurrency": 2}},
+    }
+    stopped = threading.Event()
+    pipeline = QueuePipeline(DbWriterQueueChannels.PAGE_METADATA_TO_SAVE, configs, stopped, mock_logger)
+
+    pipeline.start()
+    assert stopped.wait(timeout=5)
+    for thread in pipeline._threads:
+        thread.join(timeout=5)
+
+    assert queue_service_cls.call_count == 2
+    queue_service_cls.assert_any_call(mock_logger, ["page_metadata_to_save"])
+    queue_service_cls.return_value.open_channel.assert_called_with(prefetch_count=25)
+    queue_service_cls.return_value.run_io_loop.assert_called()
+
+
+def test_queue_pipeline_without_batching_writes_one_message_at_a_time(build_engine, queue_service_cls, mock_logger):
+    pipeline = QueuePipeline(
+        DbWriterQueueChannels.ADD_LINKS_TO_SCHEDULE, {"batching": {"enabled": False}}, threading.Event(), mock_logger
+    )
+
+    assert pipeline._batching["max_messages"] == 1
+
+
+def test_start_queue_pipelines_returns_once_a_consumer_stops(build_engine, queue_service_cls, mock_logger):
+    queue_service_cls.return_value.run_io_loop.side_effect = RuntimeError("connection lost")
+
+    start_queue_pipelines(mock_logger, {"pipelines": {"enabled": True}})
+
+    mock_logger.exception.assert_called()
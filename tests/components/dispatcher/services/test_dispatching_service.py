@@ -170,3 +170,141 @@ def test_dispatch_logs_exception(
     service._publisher.publish_crawl_tasks.assert_not_called()
 
 
+
+
+@patch("components.dispatcher.services.dispatching_service.DBReaderClient")
+@patch("components.dispatcher.services.dispatching_service.PublishingService")
+def test_dispatch_pops_from_redis_frontier_when_configured(
+    mock_publisher_cls, mock_db_cls, mock_queue_service,
+    mock_logger, configs
+):
+    mock_db = MagicMock()
+    mock_db.tables_are_empty.return_value = False
+    mock_db_cls.return_value = mock_db
+
+    frontier = MagicMock()
+    frontier.pop_links.return_value = [
+        {'url': "https://a.com", 'scheduled_at': "2025-07-25T00:00:00Z", 'depth': 1, 'priority': 2.0}
+    ]
+    frontier.size.return_value = 0
+
+    service = Dispatcher(configs, mock_queue_service, mock_logger, frontier)
+    service._dispatch()
+
+    frontier.pop_links.assert_called_once_with(configs['dispatch_count'])
+    mock_db.pop_links_from_schedule.assert_not_called()
+    service._publisher.publish_crawl_tasks.assert_called_once_with([
+        CrawlTask(url="https://a.com", depth=1, scheduled_at="2025-07-25T00:00:00Z", priority=2.0)
+    ])
+
+
+@patch("components.dispatcher.services.dispatching_service.DBReaderClient")
+@patch("components.dispatcher.services.dispatching_service.PublishingService")
+def test_adaptive_dispatch_sizes_batches_from_queue_depth(
+    mock_publisher_cls, mock_db_cls, mock_queue_service,
+    mock_logger, configs
+):
+    mock_db = MagicMock()
+    mock_db.tables_are_empty.return_value = False
+    mock_db.pop_links_from_schedule.return_value = []
+    mock_db_cls.return_value = mock_db
+    mock_queue_service.queue_depth.return_value = (0, 4)
+
+    adaptive = {"enabled": True, "target_queue_depth": 20, "max_dispatch_count": 50, "kp": 0.5, "ki": 0.0}
+    service = Dispatcher({**configs, "adaptive": adaptive}, mock_queue_service, mock_logger)
+    service._dispatch()
+
+    mock_queue_service.queue_depth.assert_called_once_with("urls_to_crawl")
+    mock_db.pop_links_from_schedule.assert_called_once_with(10)
+
+
+@patch("components.dispatcher.services.dispatching_service.DBReaderClient")
+@patch("components.dispatcher.services.dispatching_service.PublishingService")
+def test_adaptive_dispatch_falls_back_to_fixed_count_without_queue_depth(
+    mock_publisher_cls, mock_db_cls, mock_queue_service,
+    mock_logger, configs
+):
+    mock_db = MagicMock()
+    mock_db.tables_are_empty.return_value = False
+    mock_db.pop_links_from_schedule.return_value = []
+    mock_db_cls.return_value = mock_db
+    mock_queue_service.queue_depth.side_effect = RuntimeError("channel closed")
+
+    adaptive = {"enabled": True, "target_queue_depth": 20, "max_dispatch_count": 50}
+    service = Dispatcher({**configs, "adaptive": adaptive}, mock_queue_service, mock_logger)
+    service._dispatch()
+
+    mock_db.pop_links_from_schedule.assert_called_once_with(configs['dispatch_count'])
+
+
+@patch("components.dispatcher.services.dispatching_service.DBReaderClient")
+@patch("components.dispatcher.services.dispatching_service.PublishingService")
+def test_host_fair_dispatch_looks_ahead_and_interleaves_hosts(
+    mock_publisher_cls, mock_db_cls, mock_queue_service,
+    mock_logger, configs
+):
+    mock_db = MagicMock()
+    mock_db.tables_are_empty.return_value = False
+    mock_db.pop_links_from_schedule.return_value = [
+        {'url': url, 'scheduled_at': "2025-07-25T00:00:00Z", 'depth': 1}
+        for url in ["https://a.org/1", "https://a.org/2", "https://a.org/3", "https://b.org/1"]
+    ]
+    mock_db_cls.return_value = mock_db
+
+    fairness = {"enabled": True, "max_buffered_links": 4}
+    service = Dispatcher({**configs, "dispatch_count": 2, "host_fairness": fairness}, mock_queue_service, mock_logger)
+    service._dispatch()
+
+    mock_db.pop_links_from_schedule.assert_called_once_with(4)
+    tasks = service._publisher.publish_crawl_tasks.call_args[0][0]
+    assert [task.url for task in tasks] == ["https://a.org/1", "https://b.org/1"]
+    assert len(service._host_queue) == 2
+
+
+@patch("components.dispatcher.services.dispatching_service.DBReaderClient")
+@patch("components.dispatcher.services.dispatching_service.PublishingService")
+def test_close_hands_buffered_links_back_to_the_frontier(
+    mock_publisher_cls, mock_db_cls, mock_queue_service,
+    mock_logger, configs
+):
+    mock_db_cls.return_value.tables_are_empty.return_value = False
+    frontier = MagicMock()
+    frontier.pop_links.return_value = [
+        {'url': url, 'scheduled_at': "2025-07-25T00:00:00Z", 'depth': 1, 'priority': 1.5}
+        for url in ["https://a.org/1", "https://a.org/2", "https://b.org/1"]
+    ]
+    frontier.size.return_value = 0
+
+    fairness = {"enabled": True, "max_buffered_links": 3}
+    service = Dispatcher(
+        {**configs, "dispatch_count": 2, "host_fairness": fairness}, mock_queue_service, mock_logger, frontier
+    )
+    service._dispatch()
+    service.close()
+
+    frontier.push_links.assert_called_once_with([
+        CrawlTask(url="https://a.org/2", depth=1, scheduled_at="2025-07-25T00:00:00Z", priority=1.5)
+    ])
+    assert len(service._host_queue) == 0
+
+
+@patch("components.dispatcher.services.dispatching_service.DBReaderClient")
+@patch("components.dispatcher.services.dispatching_service.PublishingService")
+def test_close_republishes_buffered_links_to_the_postgres_frontier(
+    mock_publisher_cls, mock_db_cls, mock_queue_service,
+    mock_logger, configs
+):
+    mock_db = mock_db_cls.return_value
+    mock_db.tables_are_empty.return_value = False
+    mock_db.pop_links_from_schedule.return_value = [
+        {'url': url, 'scheduled_at': "2025-07-25T00:00:00Z", 'depth': 1}
+        for url in ["https://a.org/1", "https://a.org/2"]
+    ]
+
+    fairness = {"enabled": True, "max_buffered_links": 2}
+    service = Dispatcher({**configs, "dispatch_count": 1, "host_fairness": fairness}, mock_queue_service, mock_logger)
+    service._dispatch()
+    service.close()
+
+    tasks = service._publisher.publish_links_to_schedule.call_args[0][0]
+    assert [task.url for task in tasks] == ["https://a.org/2"]
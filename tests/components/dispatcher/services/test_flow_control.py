@@ -0,0 +1,68 @@
+import pytest
+
+from components.dispatcher.services.flow_control import (
+    AdaptiveDispatchController,
+    PIDController,
+)
+
+
+def test_pid_controller_clamps_and_stops_integrating_while_saturated():
+    pid = PIDController(kp=1.0, ki=1.0, kd=0.0, output_min=0, output_max=10)
+
+    assert pid.update(100, dt=1) == 10
+    assert pid.update(100, dt=1) == 10
+    # no wind-up: a negative error brings the output down right away
+    assert pid.update(-5, dt=1) == 0
+
+
+def test_pid_controller_adds_bias_before_clamping():
+    pid = PIDController(kp=0.5, ki=0.0, kd=0.0, output_max=100)
+
+    assert pid.update(10, dt=1, bias=20) == pytest.approx(25)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _controller(clock, **overrides):
+    configs = {
+        "target_queue_depth": 100,
+        "max_dispatch_count": 1_000,
+        "kp": 0.5,
+        "ki": 0.0,
+        "rate_smoothing": 1.0,
+        **overrides,
+    }
+    return AdaptiveDispatchController(configs, tick_seconds=1, clock=clock)
+
+
+def test_controller_fills_an_empty_queue_and_backs_off_when_it_is_full():
+    controller = _controller(FakeClock())
+
+    assert controller.update(queue_depth=0, published=0) == 50
+    assert controller.update(queue_depth=300, published=50) == 0
+
+
+def test_controller_feeds_forward_the_measured_consume_rate():
+    clock = FakeClock()
+    controller = _controller(clock)
+    controller.update(queue_depth=100, published=0)
+
+    # 40 published and the depth is back at target: crawlers consumed 40 in 1s
+    clock.now = 1.0
+    count = controller.update(queue_depth=100, published=40)
+
+    assert controller.consume_rate == pytest.approx(40)
+    assert count == 40
+
+
+def test_controller_respects_the_dispatch_bounds():
+    controller = _controller(FakeClock(), min_dispatch_count=5, max_dispatch_count=20)
+
+    assert controller.update(queue_depth=0, published=0) == 20
+    assert controller.update(queue_depth=10_000, published=0) == 5
@@ -0,0 +1,65 @@
+import pytest
+
+from components.dispatcher.services.host_fairness import HostFairQueue, link_host
+
+
+def _links(host, count):
+    return [{"url": f"https://{host}/wiki/{i}"} for i in range(count)]
+
+
+def test_link_host_is_the_lowercased_hostname():
+    assert link_host({"url": "https://EN.Wikipedia.org/wiki/A"}) == "en.wikipedia.org"
+
+
+def test_pop_interleaves_hosts_in_round_robin():
+    queue = HostFairQueue()
+    queue.push_many(_links("a.org", 4) + _links("b.org", 2))
+
+    popped = [link_host(link) for link in queue.pop(5)]
+
+    assert popped == ["a.org", "b.org", "a.org", "b.org", "a.org"]
+    assert len(queue) == 1
+
+
+def test_pop_shares_output_by_weight():
+    queue = HostFairQueue(weights={"a.org": 3})
+    queue.push_many(_links("a.org", 10) + _links("b.org", 10))
+
+    popped = [link_host(link) for link in queue.pop(8)]
+
+    assert popped.count("a.org") == 6
+    assert popped.count("b.org") == 2
+
+
+def test_pop_gives_a_lone_host_the_whole_output_in_push_order():
+    queue = HostFairQueue()
+    queue.push_many(_links("a.org", 3))
+
+    assert queue.pop(10) == _links("a.org", 3)
+    assert queue.host_count == 0
+
+
+def test_pop_resumes_an_interrupted_turn_without_extra_credit():
+    queue = HostFairQueue(weights={"a.org": 2})
+    queue.push_many(_links("a.org", 4) + _links("b.org", 4))
+
+    first, second = queue.pop(1), queue.pop(2)
+
+    assert [link_host(link) for link in first + second] == ["a.org", "a.org", "b.org"]
+
+
+def test_weights_must_be_positive():
+    with pytest.raises(ValueError):
+        HostFairQueue(weights={"a.org": 0})
+
+
+def test_drain_empties_the_queue():
+    queue = HostFairQueue()
+    queue.push_many(_links("a.org", 2) + _links("b.org", 1))
+    queue.pop(1)
+
+    drained = queue.drain()
+
+    assert sorted(link["url"] for link in drained) == ["https://a.org/wiki/1", "https://b.org/wiki/0"]
+    assert len(queue) == 0
+    assert queue.pop(5) == []
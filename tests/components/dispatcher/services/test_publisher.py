@@ -1,8 +1,12 @@
+from unittest.mock import MagicMock
+
 import pytest
-from unittest.mock import MagicMock, call
+
 from components.dispatcher.services.publisher import PublishingService
 from shared.rabbitmq.enums.queue_names import SchedulerQueueChannels
 from shared.rabbitmq.schemas.crawling import CrawlTask
+from shared.rabbitmq.schemas.save_to_db import SaveLinksToSchedule
+from shared.rabbitmq.types import PublishBatchResult
 
 
 @pytest.fixture
@@ -20,38 +24,56 @@ def publisher(mock_queue_service, mock_logger):
     return PublishingService(mock_queue_service, mock_logger)
 
 
-def test_publish_all_success(publisher, mock_queue_service):
+def test_publish_sends_one_confirmed_batch(publisher, mock_queue_service):
     tasks = [
         CrawlTask(url="https://example.com", depth=0, scheduled_at="2025-07-25T00:00:00Z"),
         CrawlTask(url="https://another.com", depth=1, scheduled_at="2025-07-25T00:01:00Z"),
     ]
+    mock_queue_service.publish_batch.return_value = PublishBatchResult(confirmed=2)
 
     publisher.publish_crawl_tasks(tasks)
 
-    # Verify .publish called once per task
-    assert mock_queue_service.publish.call_count == 2
-
-    expected_calls = [
-        call(SchedulerQueueChannels.URLS_TO_CRAWL.value, tasks[0].model_dump_json()),
-        call(SchedulerQueueChannels.URLS_TO_CRAWL.value, tasks[1].model_dump_json())
-    ]
-    mock_queue_service.publish.assert_has_calls(expected_calls, any_order=False)
+    mock_queue_service.publish_batch.assert_called_once()
+    queue_name, messages = mock_queue_service.publish_batch.call_args[0]
+    assert queue_name == SchedulerQueueChannels.URLS_TO_CRAWL.value
+    assert messages == [task.model_dump_json() for task in tasks]
+    mock_queue_service.publish.assert_not_called()
 
 
-def test_publish_partial_failure(publisher, mock_queue_service):
+def test_publish_reports_unconfirmed_tasks(publisher, mock_queue_service, mock_logger):
     tasks = [
         CrawlTask(url="https://example.com", depth=0, scheduled_at="2025-07-25T00:00:00Z"),
         CrawlTask(url="https://fail.com", depth=1, scheduled_at="2025-07-25T00:01:00Z"),
     ]
+    mock_queue_service.publish_batch.return_value = PublishBatchResult(
+        confirmed=1, retried=2, failed=[tasks[1].model_dump_json()]
+    )
 
-    # Simulate exception
-    def publish_side_effect(queue, msg):
-        if "fail.com" in msg:
-            raise Exception("Queue error")
+    publisher.publish_crawl_tasks(tasks)
 
-    mock_queue_service.publish.side_effect = publish_side_effect
+    mock_logger.info.assert_called_with("Successfully published %d out of %d crawl tasks", 1, 2)
 
-    publisher.publish_crawl_tasks(tasks)
 
-    # First publish should succeed, second should raise
-    assert mock_queue_service.publish.call_count == 2
+def test_publish_survives_a_broken_connection(publisher, mock_queue_service, mock_logger):
+    mock_queue_service.publish_batch.side_effect = Exception("Queue error")
+
+    publisher.publish_crawl_tasks([CrawlTask(url="https://example.com", depth=0, scheduled_at="2025-07-25T00:00:00Z")])
+
+    mock_logger.exception.assert_called_once()
+
+
+def test_publish_without_tasks_skips_the_broker(publisher, mock_queue_service):
+    publisher.publish_crawl_tasks([])
+
+    mock_queue_service.publish_batch.assert_not_called()
+
+
+def test_publish_links_to_schedule_sends_one_confirmed_message(publisher, mock_queue_service):
+    tasks = [CrawlTask(url="https://example.com", depth=0, scheduled_at="2025-07-25T00:00:00Z")]
+    mock_queue_service.publish_batch.return_value = PublishBatchResult(confirmed=1)
+
+    assert publisher.publish_links_to_schedule(tasks) is True
+
+    queue_name, messages = mock_queue_service.publish_batch.call_args[0]
+    assert queue_name == SchedulerQueueChannels.ADD_LINKS_TO_SCHEDULE.value
+    assert messages == [SaveLinksToSchedule(links=tasks).model_dump_json()]
@@ -0,0 +1,83 @@
+from unittest.mock import Mock
+
+import pytest
+
+from components.scheduler.core.prioritizer import LinkPrioritizer
+from shared.rabbitmq.schemas.scheduling import LinkData
+
+
+def make_link(url, source, depth=1, link_type="wikilink"):
+    return LinkData(
+        source_page_url=source,
+        url=url,
+        depth=depth,
+        discovered_at="2025-07-25T00:00:00Z",
+        link_type=link_type
+    )
+
+
+@pytest.fixture
+def cache():
+    cache = Mock()
+    # Echo the batch contributions back as running totals
+    cache.batch_record_inlinks.side_effect = lambda contributions: dict(contributions)
+    return cache
+
+
+@pytest.fixture
+def prioritizer(cache):
+    configs = {
+        "priority": {
+            "weights": {"depth": 1.0, "inlinks": 1.0, "cash": 1.0},
+            "link_type_weights": {"wikilink": 0.5}
+        }
+    }
+    return LinkPrioritizer(configs, cache, Mock())
+
+
+def test_inlink_contributions_split_cash_by_out_degree(prioritizer):
+    links = [
+        make_link("https://en.wikipedia.org/wiki/A", "https://en.wikipedia.org/wiki/Hub"),
+        make_link("https://en.wikipedia.org/wiki/B", "https://en.wikipedia.org/wiki/Hub"),
+        make_link("https://en.wikipedia.org/wiki/A", "https://en.wikipedia.org/wiki/Leaf"),
+    ]
+
+    contributions = prioritizer._inlink_contributions(links)
+
+    assert contributions["https://en.wikipedia.org/wiki/A"] == (2, pytest.approx(1.5))
+    assert contributions["https://en.wikipedia.org/wiki/B"] == (1, pytest.approx(0.5))
+
+
+def test_more_linked_pages_score_higher(prioritizer):
+    popular = make_link("https://en.wikipedia.org/wiki/Popular", "https://en.wikipedia.org/wiki/X")
+    niche = make_link("https://en.wikipedia.org/wiki/Niche", "https://en.wikipedia.org/wiki/X")
+    also_popular = make_link("https://en.wikipedia.org/wiki/Popular", "https://en.wikipedia.org/wiki/Y")
+
+    scores = prioritizer.score_links([popular, niche, also_popular], [popular, niche])
+
+    assert scores[popular.url] > scores[niche.url]
+
+
+def test_shallower_pages_score_higher(prioritizer):
+    shallow = make_link("https://en.wikipedia.org/wiki/Shallow", "https://en.wikipedia.org/wiki/X", depth=1)
+    deep = make_link("https://en.wikipedia.org/wiki/Deep", "https://en.wikipedia.org/wiki/X", depth=4)
+
+    scores = prioritizer.score_links([shallow, deep], [shallow, deep])
+
+    assert scores[shallow.url] > scores[deep.url]
+
+
+def test_inlinks_are_recorded_when_every_link_was_seen(prioritizer, cache):
+    link = make_link("https://en.wikipedia.org/wiki/A", "https://en.wikipedia.org/wiki/X")
+
+    assert prioritizer.score_links([link], []) == {}
+    cache.batch_record_inlinks.assert_called_once_with({link.url: (1, 1.0)})
+
+
+def test_seen_links_are_scored_again(prioritizer):
+    new = make_link("https://en.wikipedia.org/wiki/New", "https://en.wikipedia.org/wiki/X")
+    seen = make_link("https://en.wikipedia.org/wiki/Seen", "https://en.wikipedia.org/wiki/X")
+
+    scores = prioritizer.score_links([new, seen], [new], [seen])
+
+    assert set(scores) == {new.url, seen.url}
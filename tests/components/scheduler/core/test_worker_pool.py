@@ -0,0 +1,68 @@
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from components.scheduler.core.worker_pool import WorkerPool
+
+
+@pytest.fixture
+def worker_pool():
+    pool = WorkerPool(max_workers=2, max_pending=1, logger=Mock())
+    yield pool
+    pool.shutdown()
+
+
+def test_map_unordered_drops_none_results(worker_pool):
+    def keep_even(item, idx):
+        return item if item % 2 == 0 else None
+
+    results = worker_pool.map_unordered(keep_even, range(10))
+
+    assert sorted(results) == [0, 2, 4, 6, 8]
+
+
+def test_map_unordered_passes_one_based_index(worker_pool):
+    results = worker_pool.map_unordered(lambda item, idx: (item, idx), ["a", "b"])
+
+    assert sorted(results) == [("a", 1), ("b", 2)]
+
+
+def test_submit_blocks_when_saturated(worker_pool):
+    release = threading.Event()
+
+    # 2 running + 1 pending fills the pool
+    futures = [worker_pool.submit(release.wait) for _ in range(3)]
+
+    submitted = threading.Event()
+
+    def submit_one_more():
+        futures.append(worker_pool.submit(lambda: None))
+        submitted.set()
+
+    submitter = threading.Thread(target=submit_one_more)
+    submitter.start()
+
+    assert not submitted.wait(timeout=0.2)
+
+    release.set()
+    submitter.join(timeout=2)
+
+    assert submitted.is_set()
+    for future in futures:
+        future.result(timeout=2)
+
+
+def test_pool_is_reused_across_calls(worker_pool):
+    first = set(worker_pool.map_unordered(lambda item, idx: threading.get_ident(), range(20)))
+    second = set(worker_pool.map_unordered(lambda item, idx: threading.get_ident(), range(20)))
+
+    assert len(first | second) <= 2
+
+
+def test_invalid_sizes_raise():
+    with pytest.raises(ValueError):
+        WorkerPool(max_workers=0, max_pending=1, logger=Mock())
+
+    with pytest.raises(ValueError):
+        WorkerPool(max_workers=1, max_pending=-1, logger=Mock())
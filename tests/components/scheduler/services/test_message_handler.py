@@ -0,0 +1,168 @@
+from unittest.mock import MagicMock, call, patch
+
+import pytest
+import redis.exceptions
+
+from components.scheduler.services.message_handler import (
+    LinksToScheduleBatchConsumer,
+    links_to_schedule,
+)
+from components.scheduler.services.schedule_service import ScheduleService
+from shared.rabbitmq.schemas.scheduling import LinkData, ProcessDiscoveredLinks
+
+
+def make_body(url):
+    task = ProcessDiscoveredLinks(links=[
+        LinkData(
+            source_page_url="https://en.wikipedia.org/wiki/Source",
+            url=url,
+            depth=1,
+            discovered_at="2025-07-25T00:00:00Z"
+        )
+    ])
+    return task.model_dump_json().encode("utf-8")
+
+
+def make_method(delivery_tag):
+    method = MagicMock()
+    method.delivery_tag = delivery_tag
+    return method
+
+
+@pytest.fixture
+def scheduler():
+    return MagicMock()
+
+
+@pytest.fixture
+def queue_service():
+    return MagicMock()
+
+
+@pytest.fixture
+def consumer(scheduler, queue_service):
+    configs = {"batching": {"max_messages": 3, "max_wait_ms": 100}}
+    return LinksToScheduleBatchConsumer(scheduler, queue_service, configs, MagicMock())
+
+
+def test_flushes_and_multi_acks_when_batch_is_full(consumer, scheduler):
+    ch = MagicMock()
+
+    for tag in (1, 2, 3):
+        consumer.on_message(ch, make_method(tag), None, make_body(f"https://en.wikipedia.org/wiki/{tag}"))
+
+    scheduler.process_batch.assert_called_once()
+    assert len(scheduler.process_batch.call_args.args[0]) == 3
+    ch.basic_ack.assert_called_once_with(delivery_tag=3, multiple=True)
+
+
+def test_first_message_arms_flush_timer(consumer, scheduler, queue_service):
+    ch = MagicMock()
+
+    consumer.on_message(ch, make_method(1), None, make_body("https://en.wikipedia.org/wiki/A"))
+    consumer.on_message(ch, make_method(2), None, make_body("https://en.wikipedia.org/wiki/B"))
+
+    queue_service.call_later.assert_called_once()
+    delay, callback = queue_service.call_later.call_args.args
+    assert delay == pytest.approx(0.1)
+    scheduler.process_batch.assert_not_called()
+
+    # Timer fires before the batch fills up
+    callback()
+
+    scheduler.process_batch.assert_called_once()
+    ch.basic_ack.assert_called_once_with(delivery_tag=2, multiple=True)
+
+
+def test_invalid_message_is_nacked_and_not_buffered(consumer, scheduler):
+    ch = MagicMock()
+
+    consumer.on_message(ch, make_method(1), None, b"not json")
+    consumer.flush()
+
+    ch.basic_nack.assert_called_once_with(delivery_tag=1, requeue=False)
+    scheduler.process_batch.assert_not_called()
+
+
+def test_failed_batch_is_retried_one_by_one(consumer, scheduler):
+    ch = MagicMock()
+
+    def process_batch(tasks):
+        if len(tasks) > 1 or tasks[0].links[0].url.endswith("/B"):
+            raise RuntimeError("bad message")
+
+    scheduler.process_batch.side_effect = process_batch
+
+    for tag, title in ((1, "A"), (2, "B"), (3, "C")):
+        consumer.on_message(ch, make_method(tag), None, make_body(f"https://en.wikipedia.org/wiki/{title}"))
+
+    assert scheduler.process_batch.call_count == 4
+    assert ch.basic_ack.call_args_list == [call(delivery_tag=1), call(delivery_tag=3)]
+    ch.basic_nack.assert_called_once_with(delivery_tag=2, requeue=False)
+
+
+def test_batch_failing_on_redis_connection_is_requeued(consumer, scheduler):
+    ch = MagicMock()
+    scheduler.process_batch.side_effect = redis.exceptions.ConnectionError("Redis down")
+
+    consumer.on_message(ch, make_method(1), None, make_body("https://en.wikipedia.org/wiki/A"))
+    consumer.on_message(ch, make_method(2), None, make_body("https://en.wikipedia.org/wiki/B"))
+    consumer.flush()
+
+    scheduler.process_batch.assert_called_once()
+    ch.basic_nack.assert_called_once_with(delivery_tag=2, multiple=True, requeue=True)
+    ch.basic_ack.assert_not_called()
+
+
+def test_message_failing_on_redis_timeout_is_requeued(scheduler):
+    ch = MagicMock()
+    scheduler.process_links.side_effect = redis.exceptions.TimeoutError("timed out")
+
+    links_to_schedule(ch, make_method(1), None, make_body("https://en.wikipedia.org/wiki/A"),
+                      scheduler=scheduler, logger=MagicMock())
+
+    ch.basic_nack.assert_called_once_with(delivery_tag=1, requeue=True)
+
+
+def test_redis_outage_in_the_seen_set_requeues_the_batch(queue_service):
+    ch = MagicMock()
+    with patch("shared.redis.cache_service.redis.Redis") as redis_class, \
+         patch("components.scheduler.services.schedule_service.FilteringService") as filtering, \
+         patch("components.scheduler.services.schedule_service.PublishingService") as publishing:
+        pipeline = redis_class.return_value.pipeline.return_value.__enter__.return_value
+        pipeline.execute.side_effect = redis.exceptions.ConnectionError("Redis down")
+        filtering.return_value.is_filtered.return_value = False
+        scheduler = ScheduleService(
+            {"max_workers": 1}, {"host": "redis", "port": 6379}, queue_service, MagicMock()
+        )
+        consumer = LinksToScheduleBatchConsumer(
+            scheduler, queue_service, {"batching": {"max_messages": 2}}, MagicMock()
+        )
+
+        consumer.on_message(ch, make_method(1), None, make_body("https://en.wikipedia.org/wiki/A"))
+        consumer.on_message(ch, make_method(2), None, make_body("https://en.wikipedia.org/wiki/B"))
+        scheduler.close()
+
+    ch.basic_nack.assert_called_once_with(delivery_tag=2, multiple=True, requeue=True)
+    ch.basic_ack.assert_not_called()
+    publishing.return_value.publish_links_to_schedule.assert_not_called()
+
+
+def test_full_frontier_requeues_the_batch_and_releases_its_links(queue_service):
+    ch = MagicMock()
+    frontier = MagicMock()
+    frontier.push_links.side_effect = redis.exceptions.OutOfMemoryError("OOM command not allowed")
+    with patch("components.scheduler.services.schedule_service.CacheService") as cache, \
+         patch("components.scheduler.services.schedule_service.FilteringService") as filtering:
+        cache.return_value.batch_add_to_seen_set.side_effect = lambda urls: [True] * len(urls)
+        filtering.return_value.is_filtered.return_value = False
+        scheduler = ScheduleService({"max_workers": 1}, {}, queue_service, MagicMock(), frontier=frontier)
+        consumer = LinksToScheduleBatchConsumer(
+            scheduler, queue_service, {"batching": {"max_messages": 1}}, MagicMock()
+        )
+
+        consumer.on_message(ch, make_method(1), None, make_body("https://en.wikipedia.org/wiki/A"))
+        scheduler.close()
+
+    ch.basic_nack.assert_called_once_with(delivery_tag=1, multiple=True, requeue=True)
+    cache.return_value.batch_remove_from_seen_set.assert_called_once_with(["https://en.wikipedia.org/wiki/A"])
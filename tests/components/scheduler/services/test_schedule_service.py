@@ -0,0 +1,139 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from components.scheduler.services.schedule_service import ScheduleService
+from shared.rabbitmq.schemas.scheduling import LinkData, ProcessDiscoveredLinks
+
+TEST_DISCOVERED_AT = "2025-07-25T00:00:00Z"
+
+
+def make_link(url, depth=1, source="https://en.wikipedia.org/wiki/Source"):
+    return LinkData(
+        source_page_url=source,
+        url=url,
+        depth=depth,
+        discovered_at=TEST_DISCOVERED_AT
+    )
+
+
+@pytest.fixture
+def configs():
+    return {"max_workers": 2, "worker_pool": {"max_pending_tasks": 10}}
+
+
+@pytest.fixture
+def schedule_service(configs):
+    with patch("components.scheduler.services.schedule_service.CacheService"), \
+         patch("components.scheduler.services.schedule_service.FilteringService"), \
+         patch("components.scheduler.services.schedule_service.PublishingService"):
+        service = ScheduleService(configs, {}, MagicMock(), MagicMock())
+
+    service.filter.is_filtered.return_value = False
+    service.cache.batch_add_to_seen_set.side_effect = lambda urls: [True] * len(urls)
+    yield service
+    service.close()
+
+
+def test_process_batch_collapses_duplicates_across_pages(schedule_service):
+    page_a = ProcessDiscoveredLinks(links=[
+        make_link("https://en.wikipedia.org/wiki/Hub", depth=3),
+        make_link("https://en.wikipedia.org/wiki/A"),
+    ])
+    page_b = ProcessDiscoveredLinks(links=[
+        make_link("https://en.wikipedia.org/wiki/Hub", depth=1),
+        make_link("https://en.wikipedia.org/wiki/B"),
+    ])
+
+    schedule_service.process_batch([page_a, page_b])
+
+    # One Redis round trip for the whole batch, with the hub URL only once
+    schedule_service.cache.batch_add_to_seen_set.assert_called_once()
+    urls = schedule_service.cache.batch_add_to_seen_set.call_args.args[0]
+    assert sorted(urls) == [
+        "https://en.wikipedia.org/wiki/A",
+        "https://en.wikipedia.org/wiki/B",
+        "https://en.wikipedia.org/wiki/Hub",
+    ]
+
+    # One publish per queue for the whole batch
+    published = schedule_service._publisher.publish_links_to_schedule.call_args.args[0]
+    schedule_service._publisher.publish_save_processed_links.assert_called_once()
+    hub = next(link for link in published if link.url.endswith("/Hub"))
+    assert hub.depth == 1
+
+
+def test_process_batch_drops_seen_and_filtered_links(schedule_service):
+    schedule_service.filter.is_filtered.side_effect = lambda link: link.url.endswith("/Filtered")
+    schedule_service.cache.batch_add_to_seen_set.side_effect = lambda urls: [
+        not url.endswith("/Seen") for url in urls
+    ]
+    page = ProcessDiscoveredLinks(links=[
+        make_link("https://en.wikipedia.org/wiki/Filtered"),
+        make_link("https://en.wikipedia.org/wiki/Seen"),
+        make_link("https://en.wikipedia.org/wiki/New"),
+    ])
+
+    schedule_service.process_links(page)
+
+    published = schedule_service._publisher.publish_links_to_schedule.call_args.args[0]
+    assert [link.url for link in published] == ["https://en.wikipedia.org/wiki/New"]
+
+
+def test_process_batch_skips_publish_when_nothing_valid(schedule_service):
+    schedule_service.cache.batch_add_to_seen_set.side_effect = lambda urls: [False] * len(urls)
+    page = ProcessDiscoveredLinks(links=[make_link("https://en.wikipedia.org/wiki/Seen")])
+
+    schedule_service.process_links(page)
+
+    schedule_service._publisher.publish_links_to_schedule.assert_not_called()
+    schedule_service._publisher.publish_save_processed_links.assert_not_called()
+
+
+def test_process_batch_canonicalizes_url_variants(schedule_service):
+    page = ProcessDiscoveredLinks(links=[
+        make_link("https://en.wikipedia.org/wiki/Python"),
+        make_link("https://en.m.wikipedia.org/wiki/python"),
+        make_link("https://en.wikipedia.org/w/index.php?title=Python"),
+    ])
+
+    schedule_service.process_links(page)
+
+    urls = schedule_service.cache.batch_add_to_seen_set.call_args.args[0]
+    assert urls == ["https://en.wikipedia.org/wiki/Python"]
+
+
+def test_process_batch_releases_claimed_links_when_publishing_fails(schedule_service):
+    schedule_service.cache.batch_add_to_seen_set.side_effect = lambda urls: [
+        not url.endswith("/Seen") for url in urls
+    ]
+    schedule_service._publisher.publish_links_to_schedule.side_effect = RuntimeError("publish failed")
+    page = ProcessDiscoveredLinks(links=[
+        make_link("https://en.wikipedia.org/wiki/Seen"),
+        make_link("https://en.wikipedia.org/wiki/New"),
+    ])
+
+    with pytest.raises(RuntimeError):
+        schedule_service.process_links(page)
+
+    schedule_service.cache.batch_remove_from_seen_set.assert_called_once_with(
+        ["https://en.wikipedia.org/wiki/New"]
+    )
+
+
+def test_process_batch_raises_priority_of_seen_links(schedule_service):
+    schedule_service.cache.batch_add_to_seen_set.side_effect = lambda urls: [
+        not url.endswith("/Seen") for url in urls
+    ]
+    schedule_service.cache.batch_record_inlinks.side_effect = lambda contributions: dict(contributions)
+    page = ProcessDiscoveredLinks(links=[
+        make_link("https://en.wikipedia.org/wiki/Seen"),
+        make_link("https://en.wikipedia.org/wiki/New"),
+    ])
+
+    schedule_service.process_links(page)
+
+    links, priorities, updates = schedule_service._publisher.publish_links_to_schedule.call_args.args
+    assert [link.url for link in links] == ["https://en.wikipedia.org/wiki/New"]
+    assert list(updates) == ["https://en.wikipedia.org/wiki/Seen"]
+    assert updates["https://en.wikipedia.org/wiki/Seen"] == priorities["https://en.wikipedia.org/wiki/Seen"]
@@ -0,0 +1,29 @@
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+
+from database.async_engine import build_async_engine
+
+URL = "postgresql+psycopg2://u:p@localhost/db"
+
+
+def test_build_async_engine_swaps_driver_and_applies_profile(mocker):
+    create_async_engine = mocker.patch("database.async_engine.create_async_engine")
+
+    build_async_engine({"pool_size": 3, "max_overflow": 1, "statement_timeout_ms": 5000}, url=URL)
+
+    url, kwargs = create_async_engine.call_args.args[0], create_async_engine.call_args.kwargs
+    assert url.drivername == "postgresql+asyncpg"
+    assert kwargs["poolclass"] is AsyncAdaptedQueuePool
+    assert (kwargs["pool_size"], kwargs["max_overflow"]) == (3, 1)
+    assert kwargs["connect_args"] == {"server_settings": {"statement_timeout": "5000"}}
+
+
+def test_build_async_engine_pgbouncer_mode_disables_prepared_statement_caches(mocker):
+    create_async_engine = mocker.patch("database.async_engine.create_async_engine")
+
+    build_async_engine({"pgbouncer": True}, url=URL)
+
+    url, kwargs = create_async_engine.call_args.args[0], create_async_engine.call_args.kwargs
+    assert kwargs["poolclass"] is NullPool
+    assert "pool_size" not in kwargs
+    assert kwargs["connect_args"] == {"statement_cache_size": 0}
+    assert url.query["prepared_statement_cache_size"] == "0"
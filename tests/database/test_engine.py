@@ -0,0 +1,67 @@
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.pool import NullPool, QueuePool
+
+from database.engine import _timed_pool_class, build_engine, load_engine_profile
+
+URL = "postgresql+psycopg2://u:p@localhost/db"
+
+
+def test_load_engine_profile_overrides_defaults():
+    profile = load_engine_profile({"database": {"engine": {"pool_size": 2}}})
+
+    assert profile["pool_size"] == 2
+    assert profile["max_overflow"] == 10
+
+
+def test_load_engine_profile_without_section_uses_defaults():
+    assert load_engine_profile({"logging": {}})["pool_size"] == 5
+
+
+def test_load_engine_profile_rejects_unknown_keys():
+    with pytest.raises(ValueError):
+        load_engine_profile({"database": {"engine": {"pool_sise": 2}}})
+
+
+def test_build_engine_applies_pool_and_statement_timeout(mocker):
+    create_engine = mocker.patch("database.engine.create_engine")
+
+    build_engine({"pool_size": 3, "max_overflow": 1, "statement_timeout_ms": 5000, "stream_results": True}, url=URL)
+
+    kwargs = create_engine.call_args.kwargs
+    assert kwargs["poolclass"] is QueuePool
+    assert (kwargs["pool_size"], kwargs["max_overflow"]) == (3, 1)
+    assert kwargs["connect_args"] == {"options": "-c statement_timeout=5000"}
+    assert kwargs["execution_options"]["stream_results"] is True
+
+
+def test_build_engine_pgbouncer_mode_skips_client_pool_and_startup_options(mocker):
+    create_engine = mocker.patch("database.engine.create_engine")
+    listens_for = mocker.patch("database.engine.event.listens_for")
+
+    build_engine({"pgbouncer": True, "statement_timeout_ms": 5000}, url=URL)
+
+    kwargs = create_engine.call_args.kwargs
+    assert kwargs["poolclass"] is NullPool
+    assert "pool_size" not in kwargs
+    assert "connect_args" not in kwargs
+    # the timeout is set per transaction instead
+    listens_for.assert_called_once_with(create_engine.return_value, "begin")
+
+
+def test_build_engine_builds_a_real_engine():
+    engine = build_engine({"pool_size": 3}, url=URL)
+
+    assert isinstance(engine.pool, QueuePool)
+    assert engine.pool.size() == 3
+
+
+def test_timed_pool_observes_checkout_wait():
+    observe = MagicMock()
+    pool = _timed_pool_class(QueuePool, observe)(MagicMock, pool_size=1)
+
+    pool.connect().close()
+
+    observe.assert_called_once()
+    assert observe.call_args[0][0] >= 0
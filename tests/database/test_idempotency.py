@@ -0,0 +1,32 @@
+from datetime import UTC, datetime
+from unittest.mock import MagicMock
+
+from database import idempotency
+from database.idempotency import claim_keys, prune_applied_writes
+
+NOW = datetime(2025, 7, 24, 15, 30, tzinfo=UTC)
+
+
+def test_claim_keys_sends_sorted_unique_keys_and_returns_new_ones():
+    db = MagicMock()
+    db.execute.return_value.scalars.return_value = ["a"]
+
+    assert claim_keys(db, ["b", "a", "b"]) == {"a"}
+    assert db.execute.call_args[0][1] == {"keys": ["a", "b"]}
+
+
+def test_claim_keys_without_keys_skips_the_database():
+    db = MagicMock()
+
+    assert claim_keys(db, []) == set()
+    db.execute.assert_not_called()
+
+
+def test_prune_applied_writes_deletes_keys_past_retention(mocker):
+    mocker.patch.dict(idempotency.IDEMPOTENCY, {"retention_hours": 24})
+    engine = MagicMock()
+    conn = engine.begin.return_value.__enter__.return_value
+    conn.execute.return_value.rowcount = 3
+
+    assert prune_applied_writes(engine, NOW) == 3
+    assert conn.execute.call_args[0][1] == {"cutoff": datetime(2025, 7, 23, 15, 30, tzinfo=UTC)}
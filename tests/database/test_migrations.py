@@ -0,0 +1,57 @@
+from unittest.mock import MagicMock
+
+from database import migrations
+from database.migrations import backfill_url_ids, create_indexes
+
+
+def test_backfill_url_ids_walks_id_ranges_interning_before_updating(mocker):
+    mocker.patch.object(migrations, "URL_ID_BACKFILLS", [("links", "target_url_id", "url")])
+    engine = MagicMock()
+    conn = engine.begin.return_value.__enter__.return_value
+    engine.connect.return_value.__enter__.return_value.execute.return_value.one.return_value = (11, 35)
+    # a batch that fills nothing doesn't end the walk
+    conn.execute.return_value.rowcount = 0
+
+    backfill_url_ids(engine, batch_size=10)
+
+    calls = conn.execute.call_args_list
+    assert [call.args[1] for call in calls[::2]] == [
+        {"after_id": 10, "until_id": 20},
+        {"after_id": 20, "until_id": 30},
+        {"after_id": 30, "until_id": 40},
+    ]
+    assert all(str(call.args[0]).lstrip().startswith("INSERT INTO urls") for call in calls[::2])
+    assert all(str(call.args[0]).lstrip().startswith("UPDATE links") for call in calls[1::2])
+
+
+def test_backfill_url_ids_skips_empty_tables(mocker):
+    mocker.patch.object(migrations, "URL_ID_BACKFILLS", [("pages", "url_id", "url")])
+    engine = MagicMock()
+    engine.connect.return_value.__enter__.return_value.execute.return_value.one.return_value = (None, None)
+
+    backfill_url_ids(engine)
+
+    engine.begin.assert_not_called()
+
+
+def test_create_indexes_builds_missing_and_invalid_indexes_concurrently(mocker):
+    mocker.patch.object(migrations, "INDEX_UPGRADES", [
+        ("idx_valid", "ON links (a)"),
+        ("idx_missing", "ON links (b)"),
+        ("idx_invalid", "ON links (c)"),
+    ])
+    mocker.patch.object(migrations, "UNIQUE_INDEX_UPGRADES", [("idx_unique", "ON pages (d)")])
+    engine = MagicMock()
+    conn = engine.connect.return_value.__enter__.return_value
+    conn.execute.return_value.scalar.side_effect = [True, None, False, None]
+
+    create_indexes(engine)
+
+    conn.execution_options.assert_called_once_with(isolation_level="AUTOCOMMIT")
+    statements = [str(call.args[0]) for call in conn.execute.call_args_list if "pg_index" not in str(call.args[0])]
+    assert statements == [
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_missing ON links (b)",
+        "DROP INDEX CONCURRENTLY IF EXISTS idx_invalid",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_invalid ON links (c)",
+        "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS idx_unique ON pages (d)",
+    ]
@@ -0,0 +1,118 @@
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from database import partitioning
+from database.partitioning import (
+    ensure_partitions,
+    parse_scheduled_links_partition_name,
+    retire_partitions,
+    scheduled_links_partition_name,
+    window_start,
+)
+
+NOW = datetime(2025, 7, 24, 15, 30, tzinfo=UTC)
+
+
+@pytest.fixture
+def enabled(mocker):
+    mocker.patch.object(partitioning, "PARTITIONING_ENABLED", True)
+    mocker.patch.object(partitioning, "PARTITIONING", {
+        "enabled": True,
+        "links_hash_partitions": 4,
+        "scheduled_links_interval_hours": 24,
+        "scheduled_links_precreate": 2,
+    })
+
+
+@pytest.fixture
+def engine():
+    engine = MagicMock()
+    conn = engine.begin.return_value.__enter__.return_value
+    engine.connect.return_value.__enter__.return_value = conn
+    return engine
+
+
+def _executed_sql(engine):
+    conn = engine.begin.return_value.__enter__.return_value
+    return [str(call.args[0]) for call in conn.execute.call_args_list]
+
+
+def test_window_start_is_epoch_aligned():
+    assert window_start(NOW, timedelta(hours=24)) == datetime(2025, 7, 24, tzinfo=UTC)
+    assert window_start(NOW, timedelta(hours=6)) == datetime(2025, 7, 24, 12, tzinfo=UTC)
+
+
+def test_partition_name_round_trips():
+    start = datetime(2025, 7, 24, 12, tzinfo=UTC)
+
+    assert scheduled_links_partition_name(start) == "scheduled_links_p2025072412"
+    assert parse_scheduled_links_partition_name("scheduled_links_p2025072412") == start
+    assert parse_scheduled_links_partition_name("scheduled_links_default") is None
+
+
+def test_ensure_partitions_is_noop_when_disabled(engine, mocker):
+    mocker.patch.object(partitioning, "PARTITIONING_ENABLED", False)
+
+    ensure_partitions(engine, NOW)
+
+    engine.begin.assert_not_called()
+
+
+def test_ensure_partitions_creates_hash_and_range_partitions(engine, enabled):
+    conn = engine.begin.return_value.__enter__.return_value
+    conn.execute.return_value.scalar.return_value = True
+
+    ensure_partitions(engine, NOW)
+
+    sql = _executed_sql(engine)
+    assert sum("PARTITION OF links FOR VALUES WITH (MODULUS 4" in s for s in sql) == 4
+    assert any("scheduled_links_default PARTITION OF scheduled_links DEFAULT" in s for s in sql)
+    # previous + current + 2 upcoming windows
+    windows = [s for s in sql if "scheduled_links_p20" in s]
+    assert len(windows) == 4
+    assert "scheduled_links_p2025072300" in windows[0]
+    assert "scheduled_links_p2025072600" in windows[-1]
+
+
+def test_ensure_partitions_skips_tables_created_unpartitioned(engine, enabled):
+    conn = engine.begin.return_value.__enter__.return_value
+    conn.execute.return_value.scalar.return_value = False
+
+    ensure_partitions(engine, NOW)
+
+    assert not any("PARTITION OF" in s for s in _executed_sql(engine))
+
+
+def test_retire_partitions_drops_only_ended_empty_windows(engine, enabled):
+    conn = engine.begin.return_value.__enter__.return_value
+    conn.execute.return_value.scalars.return_value.all.return_value = [
+        "scheduled_links_p2025072200",  # ended, empty
+        "scheduled_links_p2025072300",  # ended, still has links
+        "scheduled_links_p2025072400",  # current window
+        "scheduled_links_default",
+    ]
+    # pg_partitioned_table check, then one EXISTS check per ended window, repeated
+    # once the empty one is locked
+    conn.execute.return_value.scalar.side_effect = [True, False, False, True]
+
+    dropped = retire_partitions(engine, NOW)
+
+    assert dropped == ["scheduled_links_p2025072200"]
+    sql = _executed_sql(engine)
+    # parent locked before the partition, like the db_reader's pop
+    assert sql.index("LOCK TABLE ONLY scheduled_links IN ACCESS EXCLUSIVE MODE") < sql.index(
+        "LOCK TABLE scheduled_links_p2025072200 IN ACCESS EXCLUSIVE MODE"
+    ) < sql.index("DROP TABLE scheduled_links_p2025072200")
+
+
+def test_retire_partitions_skips_window_when_locks_time_out(engine, enabled):
+    conn = engine.begin.return_value.__enter__.return_value
+    conn.execute.return_value.scalars.return_value.all.return_value = ["scheduled_links_p2025072200"]
+    conn.execute.return_value.scalar.side_effect = [True, False]
+    engine.begin.return_value.__enter__.side_effect = OperationalError("LOCK TABLE", {}, Exception("lock timeout"))
+
+    assert retire_partitions(engine, NOW) == []
+    assert not any(s.startswith("DROP TABLE") for s in _executed_sql(engine))
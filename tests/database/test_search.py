@@ -0,0 +1,33 @@
+from database.search import (
+    MAX_INDEXED_CHARS,
+    make_snippet,
+    query_terms,
+    search_vector_params,
+)
+
+
+def test_query_terms_drops_negated_words_and_operators():
+    assert query_terms('"Web Crawler" or spider -python') == ["web", "crawler", "spider"]
+
+
+def test_make_snippet_centres_on_first_match_without_cutting_words():
+    body = "filler " * 50 + "the crawler visits pages " + "more " * 50
+
+    snippet = make_snippet(body, ["crawl"], max_chars=60)
+
+    assert "crawler" in snippet
+    assert snippet.startswith("…") and snippet.endswith("…")
+    assert all(word in {"filler", "the", "crawler", "visits", "pages", "more"} for word in snippet.strip("…").split())
+
+
+def test_make_snippet_without_match_starts_at_the_beginning():
+    assert make_snippet("Short article text", ["missing"]) == "Short article text"
+    assert make_snippet(None, ["missing"]) == ""
+
+
+def test_search_vector_params_truncates_long_texts():
+    params = search_vector_params([("https://example.com", "Title", "x" * (MAX_INDEXED_CHARS + 10)), ("https://example.com/b", None, None)])
+
+    assert params["urls"] == ["https://example.com", "https://example.com/b"]
+    assert len(params["bodies"][0]) == MAX_INDEXED_CHARS
+    assert params["bodies"][1] is None
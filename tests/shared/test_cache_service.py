@@ -67,3 +67,15 @@ def cache_service(mock_logger, mock_redis):
 # def test_cache_service_init_no_logger_raises_error(mock_redis):
 #     with pytest.raises(ValueError, match="logger is required"):
 #         CacheService(logger=None)
+
+
+def test_batch_record_inlinks_refreshes_ttl():
+    with patch("shared.redis.cache_service.redis.Redis") as mock_redis_class:
+        service = CacheService({"host": "redis", "port": 6379, "inlinks_ttl_seconds": 60}, MagicMock())
+    pipe = mock_redis_class.return_value.pipeline.return_value.__enter__.return_value
+    pipe.execute.return_value = [3, "1.5", True]
+
+    totals = service.batch_record_inlinks({"https://en.wikipedia.org/wiki/A": (1, 0.5)})
+
+    assert totals == {"https://en.wikipedia.org/wiki/A": (3, 1.5)}
+    pipe.expire.assert_called_once_with("inlinks:https://en.wikipedia.org/wiki/A", 60)
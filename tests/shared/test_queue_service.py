@@ -1,6 +1,11 @@
-import pytest
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
-# from shared.rabbitmq.queue_service import QueueService
+
+import pika
+import pytest
+from pika.exceptions import ChannelClosed
+
+from shared.rabbitmq.queue_service import QueueService
 
 
 @pytest.fixture
@@ -64,3 +69,71 @@ def mock_queue_setup():
 
 #     # Assertions
 #     mock_queue_setup["mock_channel"].basic_publish.assert_called_once()
+
+
+
+@pytest.fixture
+def confirm_service():
+    with patch.object(QueueService, "_wait_for_rabbit"), patch(
+        "shared.rabbitmq.queue_service.global_config_loader",
+        return_value={"rabbitmq": {"host": "localhost", "port": 5672}},
+    ):
+        service = QueueService(MagicMock(), [])
+
+    service._connection = MagicMock()
+    service._channel = MagicMock(is_closed=False)
+    impl = service._connection.channel.return_value._impl
+    impl.is_closed = False
+    return service, impl
+
+
+def _confirm(service, method):
+    service._on_publish_confirm(SimpleNamespace(method=method))
+
+
+def test_publish_batch_pipelines_publishes_and_counts_multiple_acks(confirm_service):
+    service, impl = confirm_service
+    service._connection.process_data_events.side_effect = lambda time_limit: _confirm(
+        service, pika.spec.Basic.Ack(delivery_tag=impl.basic_publish.call_count, multiple=True)
+    )
+    latencies = []
+
+    result = service.publish_batch("urls_to_crawl", ["a", "b", "c"], window=2, observe_confirm_latency=latencies.append)
+
+    assert (result.confirmed, result.retried, result.failed) == (3, 0, [])
+    assert impl.confirm_delivery.call_count == 1
+    assert [c.kwargs["body"] for c in impl.basic_publish.call_args_list] == ["a", "b", "c"]
+    # the window of 2 was filled before the first confirm was awaited
+    assert service._connection.process_data_events.call_count == 2
+    assert len(latencies) == 3
+
+
+def test_publish_batch_retries_nacked_messages_then_gives_up(confirm_service):
+    service, impl = confirm_service
+    service._connection.process_data_events.side_effect = lambda time_limit: _confirm(
+        service, pika.spec.Basic.Nack(delivery_tag=impl.basic_publish.call_count)
+    )
+
+    result = service.publish_batch("urls_to_crawl", ["a"], max_attempts=2)
+
+    assert impl.basic_publish.call_count == 2
+    assert (result.confirmed, result.retried, result.failed) == (0, 1, ["a"])
+
+
+def test_publish_batch_republishes_on_a_new_channel_after_losing_one(confirm_service):
+    service, _impl = confirm_service
+    calls = iter([ChannelClosed(406, "PRECONDITION_FAILED"), None])
+
+    def process(time_limit):
+        error = next(calls)
+        if error:
+            raise error
+        _confirm(service, pika.spec.Basic.Ack(delivery_tag=service._confirm_delivery_tag, multiple=True))
+
+    service._connection.process_data_events.side_effect = process
+
+    with patch("shared.rabbitmq.queue_service.time.sleep"):
+        result = service.publish_batch("urls_to_crawl", ["a", "b"])
+
+    assert service._connection.channel.call_count == 2
+    assert (result.confirmed, result.retried, result.failed) == (2, 2, [])
@@ -0,0 +1,101 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from shared.rabbitmq.schemas.crawling import CrawlTask
+from shared.redis.frontier import RedisFrontier, create_frontier
+
+
+@pytest.fixture
+def mock_redis():
+    with patch("shared.redis.frontier.redis.Redis") as mock_redis_class:
+        mock_redis_instance = MagicMock()
+        mock_redis_class.return_value = mock_redis_instance
+        yield mock_redis_instance
+
+
+@pytest.fixture
+def frontier(mock_redis):
+    return RedisFrontier({"host": "localhost", "port": 6379}, MagicMock())
+
+
+def test_push_links_adds_with_priority_in_one_pipeline(frontier, mock_redis):
+    pipe = mock_redis.pipeline.return_value.__enter__.return_value
+    pipe.execute.return_value = [2, 1, 1]
+    tasks = [
+        CrawlTask(url="https://en.wikipedia.org/wiki/A", scheduled_at="2025-07-25T00:00:00", depth=1, priority=2.5),
+        CrawlTask(url="https://en.wikipedia.org/wiki/B", scheduled_at="2025-07-25T00:00:00", depth=2),
+    ]
+
+    added = frontier.push_links(tasks)
+
+    assert added == 2
+    pipe.zadd.assert_called_once_with(
+        "frontier:queue",
+        {"https://en.wikipedia.org/wiki/A": 2.5, "https://en.wikipedia.org/wiki/B": 0.0},
+        gt=True
+    )
+    assert pipe.hsetnx.call_count == 2
+
+
+def test_raise_priorities_only_touches_queued_urls(frontier, mock_redis):
+    mock_redis.zadd.return_value = 1
+
+    raised = frontier.raise_priorities({"https://en.wikipedia.org/wiki/A": 3.0})
+
+    assert raised == 1
+    mock_redis.zadd.assert_called_once_with(
+        "frontier:queue", {"https://en.wikipedia.org/wiki/A": 3.0}, xx=True, gt=True, ch=True
+    )
+
+
+def test_pop_links_returns_db_reader_shaped_dicts(frontier):
+    meta = json.dumps({"depth": 3, "scheduled_at": "2025-07-25T00:00:00"})
+    frontier._pop_script = MagicMock(return_value=[
+        "https://en.wikipedia.org/wiki/A", "4.5", meta,
+        "https://en.wikipedia.org/wiki/B", "1", "",
+    ])
+
+    links = frontier.pop_links(2)
+
+    assert links == [
+        {"url": "https://en.wikipedia.org/wiki/A", "scheduled_at": "2025-07-25T00:00:00", "depth": 3, "priority": 4.5},
+        {"url": "https://en.wikipedia.org/wiki/B", "scheduled_at": None, "depth": 0, "priority": 1.0},
+    ]
+
+
+def test_pop_links_with_zero_count_skips_redis(frontier):
+    frontier._pop_script = MagicMock()
+
+    assert frontier.pop_links(0) == []
+    frontier._pop_script.assert_not_called()
+
+
+def test_create_frontier_defaults_to_postgres(mock_redis):
+    assert create_frontier({"redis": {"host": "redis", "port": 6379}}, MagicMock()) is None
+
+
+def test_create_frontier_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        create_frontier({"frontier": {"backend": "kafka"}}, MagicMock())
+
+
+def test_create_frontier_checks_eviction_policy(mock_redis):
+    mock_redis.config_get.return_value = {"maxmemory-policy": "noeviction"}
+
+    configs = {"redis": {}, "frontier": {"backend": "redis", "redis": {"host": "redis-frontier", "port": 6379}}}
+
+    frontier = create_frontier(configs, MagicMock())
+
+    assert isinstance(frontier, RedisFrontier)
+    mock_redis.config_get.assert_called_once_with("maxmemory-policy")
+
+
+def test_create_frontier_refuses_evicting_instance(mock_redis):
+    mock_redis.config_get.return_value = {"maxmemory-policy": "allkeys-lru"}
+
+    configs = {"redis": {}, "frontier": {"backend": "redis", "redis": {"host": "redis", "port": 6379}}}
+
+    with pytest.raises(RuntimeError, match="allkeys-lru"):
+        create_frontier(configs, MagicMock())
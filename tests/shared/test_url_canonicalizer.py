@@ -0,0 +1,53 @@
+import pytest
+
+from shared.url_canonicalizer import canonicalize_title, canonicalize_url
+
+
+@pytest.mark.parametrize("url, expected", [
+    # relative hrefs and fragments
+    ("/wiki/Python", "https://en.wikipedia.org/wiki/Python"),
+    ("/wiki/Python#History", "https://en.wikipedia.org/wiki/Python"),
+    # first-letter case
+    ("/wiki/python", "https://en.wikipedia.org/wiki/Python"),
+    # percent-encoding and spaces
+    ("/wiki/Python%20(programming_language)", "https://en.wikipedia.org/wiki/Python_(programming_language)"),
+    ("/wiki/Caf%c3%a9", "https://en.wikipedia.org/wiki/Caf%C3%A9"),
+    ("/wiki/Café", "https://en.wikipedia.org/wiki/Caf%C3%A9"),
+    ("/wiki/Foo__Bar_", "https://en.wikipedia.org/wiki/Foo_Bar"),
+    # mobile host, scheme and default port
+    ("https://en.m.wikipedia.org/wiki/Python", "https://en.wikipedia.org/wiki/Python"),
+    ("http://EN.wikipedia.org:443/wiki/Python?x=1", "https://en.wikipedia.org/wiki/Python"),
+    # index.php article views
+    ("/w/index.php?title=Python", "https://en.wikipedia.org/wiki/Python"),
+    ("/w/index.php?title=python+language&redirect=no", "https://en.wikipedia.org/wiki/Python_language"),
+    # namespaces
+    ("/wiki/category:living people", "https://en.wikipedia.org/wiki/Category:Living_people"),
+    # Wiktionary titles are case-sensitive on the first letter
+    ("https://en.wiktionary.org/wiki/apple", "https://en.wiktionary.org/wiki/apple"),
+    ("https://en.m.wiktionary.org/wiki/Apple_pie", "https://en.wiktionary.org/wiki/Apple_pie"),
+    ("https://en.wiktionary.org/w/index.php?title=apple", "https://en.wiktionary.org/wiki/apple"),
+    ("https://en.wiktionary.org/wiki/category:english nouns", "https://en.wiktionary.org/wiki/Category:english_nouns"),
+    # external hosts only get generic rules
+    ("https://Example.com:443/Some/Path?q=1#top", "https://example.com/Some/Path"),
+])
+def test_canonicalize_url(url, expected):
+    assert canonicalize_url(url) == expected
+
+
+def test_canonicalize_url_keeps_non_view_index_php_out_of_articles():
+    url = canonicalize_url("/w/index.php?title=Python&action=edit")
+    assert url == "https://en.wikipedia.org/w/index.php"
+
+
+def test_canonicalize_url_is_idempotent():
+    once = canonicalize_url("https://en.m.wikipedia.org/wiki/caf%C3%A9 au lait")
+    assert canonicalize_url(once) == once
+
+
+def test_canonicalize_url_uses_base_url():
+    assert canonicalize_url("/wiki/Python", "https://de.wikipedia.org") == "https://de.wikipedia.org/wiki/Python"
+
+
+def test_canonicalize_title_keeps_mediawiki_safe_chars():
+    assert canonicalize_title("AC/DC") == "AC/DC"
+    assert canonicalize_title("Don't_Stop") == "Don%27t_Stop"